@@ -35,7 +35,9 @@ Output structure:
 import argparse
 import hashlib
 import json
+import math
 import os
+import re
 import sys
 import time
 from pathlib import Path
@@ -43,10 +45,14 @@ from pathlib import Path
 
 # ── Paths ──
 
-SCRIPT_DIR = Path(__file__).parent
+SCRIPT_DIR = Path(__file__).resolve().parent
 DEFAULT_SOURCE = SCRIPT_DIR.parent / "sounder_scripts"
 DEFAULT_OUTPUT = SCRIPT_DIR / "output"
 
+# KRF reading and writing is shared with Charlotte OS (charlotte-os/krf_codec.py)
+sys.path.insert(0, str(SCRIPT_DIR.parents[2] / "charlotte-os"))
+from krf_codec import KRFWriter, quote  # noqa: E402
+
 
 # ── Normalization maps ──
 
@@ -125,12 +131,22 @@ REGISTRY_MAP = {
 
 # ── KRF helpers ──
 
+NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
 def krf_string(s):
-    """Escape a string for KRF S-expression. Double-quote it."""
-    if s is None:
-        return '"unknown"'
-    s = str(s).replace("\\", "\\\\").replace('"', '\\"')
-    return f'"{s}"'
+    """KRF string literal for a value, escaped by the shared codec."""
+    return quote("unknown" if s is None else s)
+
+
+def krf_number(raw):
+    """A numeric field as a KRF number, or None if it is not one. "$1,250" -> "1250"."""
+    if raw is None or isinstance(raw, bool):
+        return None
+    if isinstance(raw, (int, float)):
+        return raw if math.isfinite(raw) else None
+    s = str(raw).strip().lstrip("$").replace(",", "")
+    return s if NUMBER_RE.fullmatch(s) else None
 
 
 def make_id(*parts):
@@ -230,39 +246,6 @@ def read_json_array(path):
     return []
 
 
-# ── KRF file writer ──
-
-class KRFWriter:
-    """Accumulates KRF facts and writes them to a .krf file."""
-
-    def __init__(self, path, microtheory, header_comment=""):
-        self.path = Path(path)
-        self.microtheory = microtheory
-        self.header_comment = header_comment
-        self.facts = []
-
-    def add(self, fact):
-        """Add a single S-expression fact string."""
-        self.facts.append(fact)
-
-    def add_many(self, facts):
-        """Add multiple facts."""
-        self.facts.extend(facts)
-
-    def write(self):
-        """Write all accumulated facts to the .krf file."""
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.path, "w", encoding="utf-8") as f:
-            if self.header_comment:
-                for line in self.header_comment.strip().split("\n"):
-                    f.write(f";;; {line}\n")
-                f.write("\n")
-            f.write(f"(in-microtheory {self.microtheory})\n\n")
-            for fact in self.facts:
-                f.write(fact + "\n")
-        return len(self.facts)
-
-
 # ================================================================
 # CONVERTERS — one function per data source
 # ================================================================
@@ -289,16 +272,16 @@ def convert_cps_breeders(source, output, stats):
         city = rec.get("CITY", "")
         state = rec.get("STATE", "")
 
-        w.add(f"(isa {bid} Breeder)")
-        w.add(f"(hasHerdmark {bid} {krf_string(mark)})")
+        w.add("isa", bid, "Breeder")
+        w.add("hasHerdmark", bid, krf_string(mark))
         if cps_num:
-            w.add(f"(hasCPSNumber {bid} {krf_string(cps_num)})")
+            w.add("hasCPSNumber", bid, krf_string(cps_num))
         if city:
-            w.add(f"(hasCity {bid} {krf_string(city)})")
+            w.add("hasCity", bid, krf_string(city))
         if state:
-            w.add(f"(hasState {bid} {krf_string(state)})")
-        w.add(f"(memberOf {bid} CPS)")
-        w.add("")
+            w.add("hasState", bid, krf_string(state))
+        w.add("memberOf", bid, "CPS")
+        w.blank()
 
     count = w.write()
     stats.inc("breeders_cps", count)
@@ -325,20 +308,20 @@ def convert_cps_with_breed(source, output, stats):
         bid = make_id("BREEDER", mark)
         # This creates a breeder-breeds-breed edge (not a hasBreed — that's for animals)
         # We use a comment to note their breed specialization
-        w.add(f";; {mark} breeds {breed}")
-        w.add(f"(isa {bid} Breeder)")
-        w.add(f"(hasHerdmark {bid} {krf_string(mark)})")
+        w.comment(f"{mark} breeds {breed}")
+        w.add("isa", bid, "Breeder")
+        w.add("hasHerdmark", bid, krf_string(mark))
         cps = rec.get("CPS", "")
         if cps:
-            w.add(f"(hasCPSNumber {bid} {krf_string(cps)})")
+            w.add("hasCPSNumber", bid, krf_string(cps))
         city = rec.get("city", "")
         state = rec.get("state", "")
         if city:
-            w.add(f"(hasCity {bid} {krf_string(city)})")
+            w.add("hasCity", bid, krf_string(city))
         if state:
-            w.add(f"(hasState {bid} {krf_string(state)})")
-        w.add(f"(memberOf {bid} CPS)")
-        w.add("")
+            w.add("hasState", bid, krf_string(state))
+        w.add("memberOf", bid, "CPS")
+        w.blank()
 
     count = w.write()
     stats.inc("breeders_cps_breeds", count)
@@ -366,14 +349,14 @@ def convert_nsr_breeders(source, output, stats):
         city = rec.get("city", "")
         state = rec.get("state", "")
 
-        w.add(f"(isa {bid} Breeder)")
-        w.add(f"(hasHerdmark {bid} {krf_string(mark)})")
+        w.add("isa", bid, "Breeder")
+        w.add("hasHerdmark", bid, krf_string(mark))
         if city:
-            w.add(f"(hasCity {bid} {krf_string(city)})")
+            w.add("hasCity", bid, krf_string(city))
         if state:
-            w.add(f"(hasState {bid} {krf_string(state)})")
-        w.add(f"(memberOf {bid} NSR)")
-        w.add("")
+            w.add("hasState", bid, krf_string(state))
+        w.add("memberOf", bid, "NSR")
+        w.blank()
 
     count = w.write()
     stats.inc("breeders_nsr", count)
@@ -401,14 +384,14 @@ def convert_aba_breeders(source, output, stats):
         city = rec.get("city", "")
         state = rec.get("state", "")
 
-        w.add(f"(isa {bid} Breeder)")
-        w.add(f"(hasHerdmark {bid} {krf_string(mark)})")
+        w.add("isa", bid, "Breeder")
+        w.add("hasHerdmark", bid, krf_string(mark))
         if city:
-            w.add(f"(hasCity {bid} {krf_string(city)})")
+            w.add("hasCity", bid, krf_string(city))
         if state:
-            w.add(f"(hasState {bid} {krf_string(state)})")
-        w.add(f"(memberOf {bid} ABA)")
-        w.add("")
+            w.add("hasState", bid, krf_string(state))
+        w.add("memberOf", bid, "ABA")
+        w.blank()
 
     count = w.write()
     stats.inc("breeders_aba", count)
@@ -448,42 +431,42 @@ def convert_pedigrees(source, output, stats):
         herdmark = rec.get("dmrk", "")  # breeder herdmark
 
         # Animal NODE
-        w_animals.add(f"(isa {aid} SwineAnimal)")
-        w_animals.add(f"(hasRegistrationNumber {aid} {krf_string(rno)})")
+        w_animals.add("isa", aid, "SwineAnimal")
+        w_animals.add("hasRegistrationNumber", aid, krf_string(rno))
         if ear:
-            w_animals.add(f"(hasEarNotch {aid} {krf_string(ear)})")
+            w_animals.add("hasEarNotch", aid, krf_string(ear))
         if breed:
-            w_animals.add(f"(hasBreed {aid} {breed})")
+            w_animals.add("hasBreed", aid, breed)
         if name:
-            w_animals.add(f"(hasShortName {aid} {krf_string(name)})")
+            w_animals.add("hasShortName", aid, krf_string(name))
         if role and role in ROLE_MAP:
-            w_animals.add(f"(hasRole {aid} {ROLE_MAP[role]})")
+            w_animals.add("hasRole", aid, ROLE_MAP[role])
         if role and role in PEDIGREE_CATEGORY_MAP:
-            w_animals.add(f"(hasPedigreeCategory {aid} {PEDIGREE_CATEGORY_MAP[role]})")
+            w_animals.add("hasPedigreeCategory", aid, PEDIGREE_CATEGORY_MAP[role])
         if dob:
-            w_animals.add(f"(bornOn {aid} {krf_string(dob)})")
+            w_animals.add("bornOn", aid, krf_string(dob))
 
         # Breeder edge
         if herdmark:
             bid = make_id("BREEDER", herdmark)
-            w_edges.add(f"(bredBy {aid} {bid})")
+            w_edges.add("bredBy", aid, bid)
 
         # Sire edge
         srno = rec.get("srno", "").strip()
         if srno:
             sire_id = make_id("ANIMAL", srno)
-            w_edges.add(f"(hasSire {aid} {sire_id})")
-            w_edges.add(f"(isSireOf {sire_id} {aid})")
+            w_edges.add("hasSire", aid, sire_id)
+            w_edges.add("isSireOf", sire_id, aid)
 
         # Dam edge
         drno = rec.get("drno", "").strip()
         if drno:
             dam_id = make_id("ANIMAL", drno)
-            w_edges.add(f"(hasDam {aid} {dam_id})")
-            w_edges.add(f"(isDamOf {dam_id} {aid})")
+            w_edges.add("hasDam", aid, dam_id)
+            w_edges.add("isDamOf", dam_id, aid)
 
-        w_animals.add("")
-        w_edges.add("")
+        w_animals.blank()
+        w_edges.blank()
 
     ac = w_animals.write()
     ec = w_edges.write()
@@ -513,11 +496,11 @@ def convert_sires(source, output, stats):
         sid = make_id("SIRE", name)
         stress = normalize_stress(rec.get("stress", ""))
 
-        w.add(f"(isa {sid} Sire)")
-        w.add(f"(hasShortName {sid} {krf_string(name)})")
-        w.add(f"(hasStressStatus {sid} {stress})")
-        w.add(f"(hasGender {sid} MALE)")
-        w.add("")
+        w.add("isa", sid, "Sire")
+        w.add("hasShortName", sid, krf_string(name))
+        w.add("hasStressStatus", sid, stress)
+        w.add("hasGender", sid, "MALE")
+        w.blank()
 
     count = w.write()
     stats.inc("sires", count)
@@ -556,22 +539,22 @@ def convert_sows_artifacts(source, output, stats):
         dob = normalize_date(rec.get("dob"))
         reason = rec.get("reason", "").strip().upper()
 
-        w.add(f"(isa {did} Dam)")
-        w.add(f"(hasShortName {did} {krf_string(name)})")
+        w.add("isa", did, "Dam")
+        w.add("hasShortName", did, krf_string(name))
         if ear:
-            w.add(f"(hasEarNotch {did} {krf_string(ear)})")
+            w.add("hasEarNotch", did, krf_string(ear))
         if breed:
-            w.add(f"(hasBreed {did} {breed})")
-        w.add(f"(hasStressStatus {did} {stress})")
-        w.add(f"(hasGender {did} FEMALE)")
-        w.add(f"(hasRole {did} SOW)")
+            w.add("hasBreed", did, breed)
+        w.add("hasStressStatus", did, stress)
+        w.add("hasGender", did, "FEMALE")
+        w.add("hasRole", did, "SOW")
         if dob:
-            w.add(f"(bornOn {did} {krf_string(dob)})")
+            w.add("bornOn", did, krf_string(dob))
         if rno:
-            w.add(f"(hasRegistrationNumber {did} {krf_string(rno)})")
+            w.add("hasRegistrationNumber", did, krf_string(rno))
         if reason and reason in RETIREMENT_MAP:
-            w.add(f"(hasRetirementReason {did} {RETIREMENT_MAP[reason]})")
-        w.add("")
+            w.add("hasRetirementReason", did, RETIREMENT_MAP[reason])
+        w.blank()
 
     count = w.write()
     stats.inc("dams_artifacts", count)
@@ -607,27 +590,27 @@ def convert_sows_trogdon(source, output, stats):
         sire_name = rec.get("sire", "").strip()
         dam_name = rec.get("dam", "").strip()
 
-        w.add(f"(isa {did} Dam)")
+        w.add("isa", did, "Dam")
         if name:
-            w.add(f"(hasShortName {did} {krf_string(name)})")
+            w.add("hasShortName", did, krf_string(name))
         if ear:
-            w.add(f"(hasEarNotch {did} {krf_string(ear)})")
+            w.add("hasEarNotch", did, krf_string(ear))
         if breed:
-            w.add(f"(hasBreed {did} {breed})")
-        w.add(f"(hasStressStatus {did} {stress})")
-        w.add(f"(hasGender {did} FEMALE)")
-        w.add(f"(hasRole {did} SOW)")
+            w.add("hasBreed", did, breed)
+        w.add("hasStressStatus", did, stress)
+        w.add("hasGender", did, "FEMALE")
+        w.add("hasRole", did, "SOW")
         if dob:
-            w.add(f"(bornOn {did} {krf_string(dob)})")
+            w.add("bornOn", did, krf_string(dob))
 
         # Parentage edges (by name — no RNO available)
         if sire_name:
             sire_id = make_id("SIRE", sire_name)
-            w.add(f"(hasSire {did} {sire_id})")
+            w.add("hasSire", did, sire_id)
         if dam_name:
             parent_dam_id = make_id("DAM", dam_name)
-            w.add(f"(hasDam {did} {parent_dam_id})")
-        w.add("")
+            w.add("hasDam", did, parent_dam_id)
+        w.blank()
 
     count = w.write()
     stats.inc("dams_trogdon", count)
@@ -653,13 +636,13 @@ def convert_buyers(source, output, stats):
         seen.add(name)
         bid = make_id("BUYER", name)
 
-        w.add(f"(isa {bid} Buyer)")
-        w.add(f"(hasShortName {bid} {krf_string(name)})")
+        w.add("isa", bid, "Buyer")
+        w.add("hasShortName", bid, krf_string(name))
         first = rec.get("first", "").strip()
         last = rec.get("last", "").strip()
         if first and last:
-            w.add(f"(hasFullName {bid} {krf_string(first + ' ' + last)})")
-        w.add("")
+            w.add("hasFullName", bid, krf_string(first + ' ' + last))
+        w.blank()
 
     count = w.write()
     stats.inc("buyers", count)
@@ -685,14 +668,14 @@ def convert_shows(source, output, stats):
         end = rec.get("end", "")
         sid = make_id("SHOW", location, start) if location else make_id("SHOW", str(i))
 
-        w.add(f"(isa {sid} Show)")
+        w.add("isa", sid, "Show")
         if location:
-            w.add(f"(hasShowName {sid} {krf_string(location)})")
+            w.add("hasShowName", sid, krf_string(location))
         if start:
-            w.add(f"(hasShowDate {sid} {krf_string(start)})")
+            w.add("hasShowDate", sid, krf_string(start))
         if city and state:
-            w.add(f"(hasShowLocation {sid} {krf_string(city + ' ' + state)})")
-        w.add("")
+            w.add("hasShowLocation", sid, krf_string(city + ' ' + state))
+        w.blank()
 
     count = w.write()
     stats.inc("shows", count)
@@ -715,25 +698,25 @@ def convert_breedings_artifacts(source, output, stats):
         dam_name = rec.get("dam", "").strip()
         start = rec.get("start", "")
         due = rec.get("due", "")
-        parity = rec.get("parity")
+        parity = krf_number(rec.get("parity"))
         sire_stress = normalize_stress(rec.get("sire_stress", ""))
 
         eid = make_id("BREEDING", start, sire_name, dam_name)
         sire_id = make_id("SIRE", sire_name) if sire_name else None
         dam_id = make_id("DAM", dam_name) if dam_name else None
 
-        w.add(f"(isa {eid} BreedingEvent)")
+        w.add("isa", eid, "BreedingEvent")
         if start:
-            w.add(f"(bredOn {eid} {krf_string(start)})")
+            w.add("bredOn", eid, krf_string(start))
         if due:
-            w.add(f"(dueOn {eid} {krf_string(due)})")
+            w.add("dueOn", eid, krf_string(due))
         if sire_id:
-            w.add(f"(breedingEventSire {eid} {sire_id})")
+            w.add("breedingEventSire", eid, sire_id)
         if dam_id:
-            w.add(f"(breedingEventDam {eid} {dam_id})")
+            w.add("breedingEventDam", eid, dam_id)
         if parity is not None:
-            w.add(f"(farrowEventParity {eid} {parity})")
-        w.add("")
+            w.add("farrowEventParity", eid, parity)
+        w.blank()
 
     count = w.write()
     stats.inc("breedings_artifacts", count)
@@ -765,7 +748,7 @@ def convert_litters(source, output, stats):
         date_farrow = normalize_date(rec.get("DATE_OF_FARROW"))
         date_wean = normalize_date(rec.get("DATE_OF_WEAN"))
         expected = normalize_date(rec.get("EXPECTED_DATE_OF_FARROW"))
-        litter_size = rec.get("LITTER_SIZE")
+        litter_size = krf_number(rec.get("LITTER_SIZE"))
 
         fid = make_id("FARROW", str(litter_num) if litter_num else "", dam_name)
         lid = make_id("LITTER", str(litter_num) if litter_num else "", dam_name)
@@ -773,27 +756,27 @@ def convert_litters(source, output, stats):
         sire_id = make_id("SIRE", sire_name) if sire_name else None
 
         # Farrow event
-        w_farrow.add(f"(isa {fid} FarrowEvent)")
+        w_farrow.add("isa", fid, "FarrowEvent")
         if date_farrow:
-            w_farrow.add(f"(farrowedOn {fid} {krf_string(date_farrow)})")
+            w_farrow.add("farrowedOn", fid, krf_string(date_farrow))
         if dam_id:
-            w_farrow.add(f"(farrowEventDam {fid} {dam_id})")
-        w_farrow.add(f"(farrowEventLitter {fid} {lid})")
+            w_farrow.add("farrowEventDam", fid, dam_id)
+        w_farrow.add("farrowEventLitter", fid, lid)
 
         # Associated breeding event
         if date_insem:
             bid = make_id("BREEDING", date_insem, sire_name or "", dam_name)
-            w_farrow.add(f"(breedingEventResult {bid} {fid})")
+            w_farrow.add("breedingEventResult", bid, fid)
             if sire_id:
-                w_farrow.add(f"(breedingEventSire {bid} {sire_id})")
+                w_farrow.add("breedingEventSire", bid, sire_id)
 
         # Litter NODE + metrics
-        w_metrics.add(f"(isa {lid} Litter)")
+        w_metrics.add("isa", lid, "Litter")
         if litter_size is not None:
-            w_metrics.add(f"(hasLitterSize {lid} {litter_size})")
-            w_metrics.add(f"(hasBornAlive {lid} {litter_size})")
-        w_farrow.add("")
-        w_metrics.add("")
+            w_metrics.add("hasLitterSize", lid, litter_size)
+            w_metrics.add("hasBornAlive", lid, litter_size)
+        w_farrow.blank()
+        w_metrics.blank()
 
     fc = w_farrow.write()
     mc = w_metrics.write()
@@ -844,7 +827,7 @@ def convert_cycles_trogdon(source, output, stats):
         male_count = rec.get("maleCount")
         female_count = rec.get("femaleCount")
         litter_num = rec.get("litterNumber")
-        parity = rec.get("parityNumber")
+        parity = krf_number(rec.get("parityNumber"))
         sire_stress = normalize_stress(rec.get("serviceSireStressStatus", ""))
 
         bid = make_id("BREEDING", uid[:12])
@@ -852,44 +835,44 @@ def convert_cycles_trogdon(source, output, stats):
         dam_id = make_id("DAM", sow_name) if sow_name else None
 
         # Breeding event
-        w_breed.add(f"(isa {bid} BreedingEvent)")
+        w_breed.add("isa", bid, "BreedingEvent")
         if date_bred:
-            w_breed.add(f"(bredOn {bid} {krf_string(date_bred)})")
+            w_breed.add("bredOn", bid, krf_string(date_bred))
         if date_due:
-            w_breed.add(f"(dueOn {bid} {krf_string(date_due)})")
+            w_breed.add("dueOn", bid, krf_string(date_due))
         if sire_id:
-            w_breed.add(f"(breedingEventSire {bid} {sire_id})")
+            w_breed.add("breedingEventSire", bid, sire_id)
         if dam_id:
-            w_breed.add(f"(breedingEventDam {bid} {dam_id})")
-        w_breed.add("")
+            w_breed.add("breedingEventDam", bid, dam_id)
+        w_breed.blank()
 
         # Farrow event (if farrowed)
         if has_farrowed and date_farrow:
             fid = make_id("FARROW", uid[:12])
             lid = make_id("LITTER", uid[:12])
 
-            w_farrow.add(f"(isa {fid} FarrowEvent)")
-            w_farrow.add(f"(farrowedOn {fid} {krf_string(date_farrow)})")
+            w_farrow.add("isa", fid, "FarrowEvent")
+            w_farrow.add("farrowedOn", fid, krf_string(date_farrow))
             if dam_id:
-                w_farrow.add(f"(farrowEventDam {fid} {dam_id})")
+                w_farrow.add("farrowEventDam", fid, dam_id)
             if parity is not None:
-                w_farrow.add(f"(farrowEventParity {fid} {parity})")
-            w_farrow.add(f"(farrowEventLitter {fid} {lid})")
-            w_farrow.add(f"(breedingEventResult {bid} {fid})")
-            w_farrow.add("")
+                w_farrow.add("farrowEventParity", fid, parity)
+            w_farrow.add("farrowEventLitter", fid, lid)
+            w_farrow.add("breedingEventResult", bid, fid)
+            w_farrow.blank()
 
             # Litter metrics
-            w_metrics.add(f"(isa {lid} Litter)")
+            w_metrics.add("isa", lid, "Litter")
             total = 0
             if alive is not None:
-                w_metrics.add(f"(hasBornAlive {lid} {alive})")
+                w_metrics.add("hasBornAlive", lid, alive)
                 total += alive
             if stillborn is not None:
-                w_metrics.add(f"(hasStillborn {lid} {stillborn})")
+                w_metrics.add("hasStillborn", lid, stillborn)
                 total += stillborn
             if total > 0:
-                w_metrics.add(f"(hasLitterSize {lid} {total})")
-            w_metrics.add("")
+                w_metrics.add("hasLitterSize", lid, total)
+            w_metrics.blank()
 
     bc = w_breed.write()
     fc = w_farrow.write()
@@ -918,34 +901,34 @@ def convert_sales_trogdon(source, output, stats):
         ear = rec.get("ear", "").strip()
         role = rec.get("type", "").strip().upper()
         customer = rec.get("customer", "").strip()
-        price = rec.get("price")
+        price = krf_number(rec.get("price"))
         date = normalize_date(rec.get("date"))
 
         sid = make_id("SALE", "TSP", str(i), ear)
         aid = make_id("ANIMAL", "TSP", ear, dam) if ear else make_id("ANIMAL", "TSP", str(i))
 
-        w.add(f"(isa {sid} SaleTransaction)")
-        w.add(f"(saleAnimal {sid} {aid})")
+        w.add("isa", sid, "SaleTransaction")
+        w.add("saleAnimal", sid, aid)
         if price is not None:
-            w.add(f"(hasSalePrice {sid} {price})")
+            w.add("hasSalePrice", sid, price)
         if date:
-            w.add(f"(soldOn {sid} {krf_string(date)})")
+            w.add("soldOn", sid, krf_string(date))
         if customer:
             buyer_id = make_id("BUYER", customer)
-            w.add(f"(soldTo {sid} {buyer_id})")
-        w.add(f"(hasAuctionType {sid} PrivateTreaty)")
-        w.add(f"(soldBy {sid} BREEDER_TSP5)")
+            w.add("soldTo", sid, buyer_id)
+        w.add("hasAuctionType", sid, "PrivateTreaty")
+        w.add("soldBy", sid, "BREEDER_TSP5")
 
         # Animal stub
-        w.add(f"(isa {aid} SwineAnimal)")
+        w.add("isa", aid, "SwineAnimal")
         if ear:
-            w.add(f"(hasEarNotch {aid} {krf_string(ear)})")
+            w.add("hasEarNotch", aid, krf_string(ear))
         if role and role in ROLE_MAP:
-            w.add(f"(hasRole {aid} {ROLE_MAP[role]})")
+            w.add("hasRole", aid, ROLE_MAP[role])
         if dam:
             dam_id = make_id("DAM", dam)
-            w.add(f"(hasDam {aid} {dam_id})")
-        w.add("")
+            w.add("hasDam", aid, dam_id)
+        w.blank()
 
     count = w.write()
     stats.inc("sales_trogdon", count)
@@ -968,8 +951,8 @@ def convert_lots_trogdon(source, output, stats):
         lot_id = rec.get(":ID", "").strip()
         lot_num = rec.get("::LOT", "")
         ear = rec.get("::EAR_NOTCH", "").strip()
-        price = rec.get("::PRICE")
-        bids = rec.get("::BIDS")
+        price = krf_number(rec.get("::PRICE"))
+        bids = krf_number(rec.get("::BIDS"))
         opcode = rec.get("::OPCODE", "")
 
         if not lot_id:
@@ -978,17 +961,17 @@ def convert_lots_trogdon(source, output, stats):
         sid = make_id("SALE", "SCO", opcode, lot_num)
         aid = make_id("ANIMAL", "SCO", opcode, lot_num)
 
-        w.add(f"(isa {sid} SaleTransaction)")
-        w.add(f"(saleAnimal {sid} {aid})")
+        w.add("isa", sid, "SaleTransaction")
+        w.add("saleAnimal", sid, aid)
         if lot_num:
-            w.add(f"(hasLotNumber {sid} {krf_string(lot_num)})")
+            w.add("hasLotNumber", sid, krf_string(lot_num))
         if price is not None:
-            w.add(f"(hasSalePrice {sid} {price})")
+            w.add("hasSalePrice", sid, price)
         if bids is not None:
-            w.add(f"(hasBidCount {sid} {bids})")
-        w.add(f"(hasAuctionType {sid} Online)")
-        w.add(f'(saleEvent {sid} {krf_string("SCONLINE-" + str(opcode))})')
-        w.add(f"(soldAt {sid} AUCTION_SCONLINE)")
+            w.add("hasBidCount", sid, bids)
+        w.add("hasAuctionType", sid, "Online")
+        w.add("saleEvent", sid, krf_string("SCONLINE-" + str(opcode)))
+        w.add("soldAt", sid, "AUCTION_SCONLINE")
 
         # Extract animal info from tokens
         tokens = rec.get(":TOKENS", [])
@@ -999,9 +982,9 @@ def convert_lots_trogdon(source, output, stats):
                 if len(parts) == 2:
                     token_map[parts[0]] = parts[1]
 
-        w.add(f"(isa {aid} SwineAnimal)")
+        w.add("isa", aid, "SwineAnimal")
         if ear:
-            w.add(f"(hasEarNotch {aid} {krf_string(ear)})")
+            w.add("hasEarNotch", aid, krf_string(ear))
 
         sire = token_map.get("SIRE", "")
         dam = token_map.get("DAM", "")
@@ -1010,16 +993,16 @@ def convert_lots_trogdon(source, output, stats):
 
         if sire:
             sire_id = make_id("SIRE", sire)
-            w.add(f"(hasSire {aid} {sire_id})")
+            w.add("hasSire", aid, sire_id)
         if dam:
             dam_id = make_id("DAM", dam)
-            w.add(f"(hasDam {aid} {dam_id})")
+            w.add("hasDam", aid, dam_id)
         if sex and sex in ROLE_MAP:
-            w.add(f"(hasRole {aid} {ROLE_MAP[sex]})")
+            w.add("hasRole", aid, ROLE_MAP[sex])
         breed = normalize_breed(breed_raw)
         if breed:
-            w.add(f"(hasBreed {aid} {breed})")
-        w.add("")
+            w.add("hasBreed", aid, breed)
+        w.blank()
 
     count = w.write()
     stats.inc("sales_sconline", count)
@@ -1050,7 +1033,7 @@ def convert_summer_spectacular(source, output, stats):
         buyer_name = normalize_name(rec.get("BUYER_NAME", ""))
         buyer_city = rec.get("BUYER_CITY", "")
         buyer_state = rec.get("BUYER_STATE", "")
-        price = rec.get("PRICE_POINT")
+        price = krf_number(rec.get("PRICE_POINT"))
 
         sid = make_id("SALE", "SS", str(year), lot)
         eid = make_id("ENTRY", "SS", str(year), lot)
@@ -1059,55 +1042,55 @@ def convert_summer_spectacular(source, output, stats):
         breed = normalize_breed(breed_raw)
 
         # Sale transaction
-        w.add(f"(isa {sid} SaleTransaction)")
-        w.add(f"(saleAnimal {sid} {aid})")
+        w.add("isa", sid, "SaleTransaction")
+        w.add("saleAnimal", sid, aid)
         if lot:
-            w.add(f"(hasLotNumber {sid} {krf_string(lot)})")
+            w.add("hasLotNumber", sid, krf_string(lot))
         if price is not None:
-            w.add(f"(hasSalePrice {sid} {price})")
-        w.add(f"(hasAuctionType {sid} Live)")
-        w.add(f'(saleEvent {sid} {krf_string("Summer Spectacular " + str(year))})')
+            w.add("hasSalePrice", sid, price)
+        w.add("hasAuctionType", sid, "Live")
+        w.add("saleEvent", sid, krf_string("Summer Spectacular " + str(year)))
         if buyer_name:
             buyer_id = make_id("BUYER", buyer_name)
-            w.add(f"(soldTo {sid} {buyer_id})")
-            w.add(f"(isa {buyer_id} Buyer)")
-            w.add(f"(hasShortName {buyer_id} {krf_string(buyer_name)})")
+            w.add("soldTo", sid, buyer_id)
+            w.add("isa", buyer_id, "Buyer")
+            w.add("hasShortName", buyer_id, krf_string(buyer_name))
             if buyer_city:
-                w.add(f"(hasCity {buyer_id} {krf_string(buyer_city)})")
+                w.add("hasCity", buyer_id, krf_string(buyer_city))
             if buyer_state:
-                w.add(f"(hasState {buyer_id} {krf_string(buyer_state)})")
+                w.add("hasState", buyer_id, krf_string(buyer_state))
 
         # Show entry
-        w.add(f"(isa {eid} ShowEntry)")
-        w.add(f"(entryAnimal {eid} {aid})")
-        w.add(f"(entryShow {eid} {show_nid})")
+        w.add("isa", eid, "ShowEntry")
+        w.add("entryAnimal", eid, aid)
+        w.add("entryShow", eid, show_nid)
         if placement:
             # Parse placement — could be numeric or like "OS1", "RES"
             try:
-                w.add(f"(placedAt {eid} {int(placement)})")
+                w.add("placedAt", eid, int(placement))
             except (ValueError, TypeError):
-                w.add(f"(placedAt {eid} {krf_string(str(placement))})")
+                w.add("placedAt", eid, krf_string(str(placement)))
         if category and category in PEDIGREE_CATEGORY_MAP:
-            w.add(f"(classifiedAs {eid} {PEDIGREE_CATEGORY_MAP[category]})")
+            w.add("classifiedAs", eid, PEDIGREE_CATEGORY_MAP[category])
 
         # Animal
-        w.add(f"(isa {aid} SwineAnimal)")
+        w.add("isa", aid, "SwineAnimal")
         if ear:
-            w.add(f"(hasEarNotch {aid} {krf_string(ear)})")
+            w.add("hasEarNotch", aid, krf_string(ear))
         if breed:
-            w.add(f"(hasBreed {aid} {breed})")
+            w.add("hasBreed", aid, breed)
         if category and category in ROLE_MAP:
-            w.add(f"(hasRole {aid} {ROLE_MAP[category]})")
+            w.add("hasRole", aid, ROLE_MAP[category])
         if breeder_id_raw:
             breeder_nid = make_id("BREEDER", breeder_id_raw)
-            w.add(f"(bredBy {aid} {breeder_nid})")
+            w.add("bredBy", aid, breeder_nid)
             if breeder_name:
-                w.add(f"(hasShortName {breeder_nid} {krf_string(breeder_name)})")
+                w.add("hasShortName", breeder_nid, krf_string(breeder_name))
 
         # Show node (emitted once — deduped by KRF loader)
-        w.add(f"(isa {show_nid} Show)")
-        w.add(f'(hasShowName {show_nid} {krf_string("Summer Spectacular " + str(year))})')
-        w.add("")
+        w.add("isa", show_nid, "Show")
+        w.add("hasShowName", show_nid, krf_string("Summer Spectacular " + str(year)))
+        w.blank()
 
     count = w.write()
     stats.inc("sales_summer_spectacular", count)
@@ -1140,7 +1123,7 @@ def convert_exposition(source, output, stats):
         sire_of_dam = normalize_name(rec.get("SIRE_OF_DAM_NAME", ""))
         buyer_name = normalize_name(rec.get("BUYER_NAME", ""))
         buyer_state = rec.get("BUYER_STATE", "")
-        price = rec.get("PRICE_POINT")
+        price = krf_number(rec.get("PRICE_POINT"))
 
         sid = make_id("SALE", "EXPO", str(year), lot)
         eid = make_id("ENTRY", "EXPO", str(year), lot)
@@ -1149,63 +1132,63 @@ def convert_exposition(source, output, stats):
         breed = normalize_breed(breed_raw)
 
         # Sale transaction
-        w.add(f"(isa {sid} SaleTransaction)")
-        w.add(f"(saleAnimal {sid} {aid})")
+        w.add("isa", sid, "SaleTransaction")
+        w.add("saleAnimal", sid, aid)
         if lot:
-            w.add(f"(hasLotNumber {sid} {krf_string(lot)})")
+            w.add("hasLotNumber", sid, krf_string(lot))
         if price is not None:
-            w.add(f"(hasSalePrice {sid} {price})")
-        w.add(f"(hasAuctionType {sid} Live)")
-        w.add(f'(saleEvent {sid} {krf_string("The Exposition " + str(year))})')
+            w.add("hasSalePrice", sid, price)
+        w.add("hasAuctionType", sid, "Live")
+        w.add("saleEvent", sid, krf_string("The Exposition " + str(year)))
         if buyer_name:
             buyer_id = make_id("BUYER", buyer_name)
-            w.add(f"(soldTo {sid} {buyer_id})")
-            w.add(f"(isa {buyer_id} Buyer)")
-            w.add(f"(hasShortName {buyer_id} {krf_string(buyer_name)})")
+            w.add("soldTo", sid, buyer_id)
+            w.add("isa", buyer_id, "Buyer")
+            w.add("hasShortName", buyer_id, krf_string(buyer_name))
             if buyer_state:
-                w.add(f"(hasState {buyer_id} {krf_string(buyer_state)})")
+                w.add("hasState", buyer_id, krf_string(buyer_state))
 
         # Show entry
-        w.add(f"(isa {eid} ShowEntry)")
-        w.add(f"(entryAnimal {eid} {aid})")
-        w.add(f"(entryShow {eid} {show_nid})")
+        w.add("isa", eid, "ShowEntry")
+        w.add("entryAnimal", eid, aid)
+        w.add("entryShow", eid, show_nid)
         if division:
             class_id = make_id("CLASS", "EXPO", str(year), division)
-            w.add(f"(enteredIn {eid} {class_id})")
+            w.add("enteredIn", eid, class_id)
         if placement:
             try:
-                w.add(f"(placedAt {eid} {int(placement)})")
+                w.add("placedAt", eid, int(placement))
             except (ValueError, TypeError):
-                w.add(f"(placedAt {eid} {krf_string(str(placement))})")
+                w.add("placedAt", eid, krf_string(str(placement)))
         if category and category in PEDIGREE_CATEGORY_MAP:
-            w.add(f"(classifiedAs {eid} {PEDIGREE_CATEGORY_MAP[category]})")
+            w.add("classifiedAs", eid, PEDIGREE_CATEGORY_MAP[category])
 
         # Animal
-        w.add(f"(isa {aid} SwineAnimal)")
+        w.add("isa", aid, "SwineAnimal")
         if ear:
-            w.add(f"(hasEarNotch {aid} {krf_string(ear)})")
+            w.add("hasEarNotch", aid, krf_string(ear))
         if breed:
-            w.add(f"(hasBreed {aid} {breed})")
+            w.add("hasBreed", aid, breed)
         if category and category in ROLE_MAP:
-            w.add(f"(hasRole {aid} {ROLE_MAP[category]})")
+            w.add("hasRole", aid, ROLE_MAP[category])
 
         # Sire
         if sire_name:
             sire_id = make_id("SIRE", sire_name)
-            w.add(f"(hasSire {aid} {sire_id})")
-            w.add(f"(isa {sire_id} Sire)")
-            w.add(f"(hasShortName {sire_id} {krf_string(sire_name)})")
+            w.add("hasSire", aid, sire_id)
+            w.add("isa", sire_id, "Sire")
+            w.add("hasShortName", sire_id, krf_string(sire_name))
 
         # Maternal grandsire (sire of dam)
         if sire_of_dam:
             gsire_id = make_id("SIRE", sire_of_dam)
-            w.add(f";; maternal grandsire: {sire_of_dam}")
-            w.add(f"(isGrandsireOf {gsire_id} {aid})")
+            w.comment(f"maternal grandsire: {sire_of_dam}")
+            w.add("isGrandsireOf", gsire_id, aid)
 
         # Show node
-        w.add(f"(isa {show_nid} Show)")
-        w.add(f'(hasShowName {show_nid} {krf_string("The Exposition " + str(year))})')
-        w.add("")
+        w.add("isa", show_nid, "Show")
+        w.add("hasShowName", show_nid, krf_string("The Exposition " + str(year)))
+        w.blank()
 
     count = w.write()
     stats.inc("sales_exposition", count)
@@ -1238,11 +1221,11 @@ def convert_temporal_spine(source, output, stats):
             val = rec.get("value", "")
             if val:
                 nid = make_id("TEMPORAL", val)
-                w.add(f"(isa {nid} {node_type})")
+                w.add("isa", nid, node_type)
 
-    w.add("")
-    w.add(";; === Temporal weaving edges ===")
-    w.add("")
+    w.blank()
+    w.comment("=== Temporal weaving edges ===")
+    w.blank()
 
     # Write edges
     edge_count = 0
@@ -1264,7 +1247,7 @@ def convert_temporal_spine(source, output, stats):
         src_id = make_id("TEMPORAL", src_val)
         tgt_id = make_id("TEMPORAL", tgt_val)
 
-        w.add(f"(partOf {src_id} {tgt_id})")
+        w.add("partOf", src_id, tgt_id)
         edge_count += 1
 
     count = w.write()
@@ -1285,24 +1268,24 @@ def convert_ownership_edges(source, output, stats):
     )
 
     # Trogdon Show Pigs
-    w.add("(isa BREEDER_TSP5 GeneticsCompany)")
-    w.add('(hasShortName BREEDER_TSP5 "Trogdon Show Pigs")')
-    w.add('(hasHerdmark BREEDER_TSP5 "TSP5")')
-    w.add('(hasCity BREEDER_TSP5 "PEKIN")')
-    w.add('(hasState BREEDER_TSP5 "IN")')
-    w.add("(memberOf BREEDER_TSP5 ABA)")
-    w.add("(memberOf BREEDER_TSP5 NSR)")
-    w.add("")
+    w.add("isa", "BREEDER_TSP5", "GeneticsCompany")
+    w.add("hasShortName", "BREEDER_TSP5", krf_string("Trogdon Show Pigs"))
+    w.add("hasHerdmark", "BREEDER_TSP5", krf_string("TSP5"))
+    w.add("hasCity", "BREEDER_TSP5", krf_string("PEKIN"))
+    w.add("hasState", "BREEDER_TSP5", krf_string("IN"))
+    w.add("memberOf", "BREEDER_TSP5", "ABA")
+    w.add("memberOf", "BREEDER_TSP5", "NSR")
+    w.blank()
 
     # SC Online auction house
-    w.add("(isa AUCTION_SCONLINE AuctionHouse)")
-    w.add('(hasShortName AUCTION_SCONLINE "ShowCircuit Online")')
-    w.add("")
+    w.add("isa", "AUCTION_SCONLINE", "AuctionHouse")
+    w.add("hasShortName", "AUCTION_SCONLINE", krf_string("ShowCircuit Online"))
+    w.blank()
 
     # Wendt Group auction house
-    w.add("(isa AUCTION_WENDT AuctionHouse)")
-    w.add('(hasShortName AUCTION_WENDT "The Wendt Group")')
-    w.add("")
+    w.add("isa", "AUCTION_WENDT", "AuctionHouse")
+    w.add("hasShortName", "AUCTION_WENDT", krf_string("The Wendt Group"))
+    w.blank()
 
     count = w.write()
     stats.inc("ownership_edges", count)
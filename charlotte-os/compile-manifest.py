@@ -7,22 +7,32 @@ Reads all KRF files, parses S-expressions, and generates:
   - substrate.json  — full structured index for machine parsing
   - CLAUDE.md       — (optional) dev-agent context = header + SUBSTRATE.md
 
+Parsed results are cached per file in .manifest-cache.json, keyed by the
+file's SHA-256, so a rebuild only re-parses the files that changed.
+
 Usage:
   python compile-manifest.py                     # Generate both outputs
   python compile-manifest.py --claude-md         # Also generate CLAUDE.md
   python compile-manifest.py --check             # Verify manifest is up to date
-  python compile-manifest.py --token-budget 4000 # Override token limit
+  python compile-manifest.py --no-cache          # Re-parse every file (ignore parse cache)
+  python compile-manifest.py --jobs 4            # Parse changed files in 4 processes
+  python compile-manifest.py --token-budget 4000 # Compact SUBSTRATE.md to this many tokens
   python compile-manifest.py --domain seeds/isg  # Append domain seed
 """
 
 import argparse
 import hashlib
 import json
+import math
 import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from krf_codec import read_forms, render, unquote
+
 # ── Paths ────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parent
@@ -30,6 +40,7 @@ BOOT_KRF = ROOT / "kernel" / "boot.krf"
 SUBSTRATE_MD = ROOT / "SUBSTRATE.md"
 SUBSTRATE_JSON = ROOT / "substrate.json"
 CLAUDE_MD = ROOT / "CLAUDE.md"
+PARSE_CACHE = ROOT / ".manifest-cache.json"
 
 VERSION = "1.0.0"
 
@@ -38,148 +49,26 @@ VERSION = "1.0.0"
 # S-EXPRESSION PARSER
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _count_parens_outside_strings(text, in_string=False):
-    """Count net parentheses (open - close) ignoring those inside quotes.
+# Reading is done by krf_codec.py (beside this script), the same codec the
+# voice agent's index uses, so both see identical forms and strings.
 
-    Tracks multi-line string state: pass in_string from prior line,
-    get back (net_parens, updated_in_string).
-    """
-    net = 0
-    for c in text:
-        if c == '"':
-            in_string = not in_string
-        elif not in_string:
-            if c == '(':
-                net += 1
-            elif c == ')':
-                net -= 1
-    return net, in_string
-
-
-def _read_sexps(path):
-    """Read a KRF file and yield complete S-expressions (may span lines).
-
-    Strips comments (;;) and accumulates lines until parentheses balance.
-    """
-    with open(path, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    buf = ""
-    depth = 0
-    in_string = False
-    for line in lines:
-        # Strip trailing whitespace, strip full-line comments
-        stripped = line.rstrip()
-        # Remove inline comments: everything after ;; outside strings
-        cleaned = _strip_comment(stripped)
-        if not cleaned.strip():
-            continue
-        buf += (" " if buf else "") + cleaned.strip()
-        net, in_string = _count_parens_outside_strings(cleaned, in_string)
-        depth += net
-        if depth <= 0 and not in_string and buf.strip():
-            yield buf.strip()
-            buf = ""
-            depth = 0
-            in_string = False
-    # Flush any remaining buffer (shouldn't happen in well-formed KRF)
-    if buf.strip():
-        yield buf.strip()
-
-
-def _strip_comment(line):
-    """Remove ;; comments from a line, respecting quoted strings."""
-    in_string = False
-    i = 0
-    while i < len(line):
-        if line[i] == '"':
-            in_string = not in_string
-        elif not in_string and i + 1 < len(line) and line[i:i+2] == ";;":
-            return line[:i]
-        i += 1
-    return line
-
-
-def _tokenize(sexp):
-    """Tokenize an S-expression into nested lists.
-
-    '(implies (and (isa ?X NODE)) (foo ?X))' ->
-    ['implies', ['and', ['isa', '?X', 'NODE']], ['foo', '?X']]
-    """
-    tokens = []
-    stack = [tokens]
-    i = 0
-    s = sexp.strip()
-    while i < len(s):
-        c = s[i]
-        if c == '(':
-            new = []
-            stack[-1].append(new)
-            stack.append(new)
-            i += 1
-        elif c == ')':
-            stack.pop()
-            i += 1
-        elif c == '"':
-            # Quoted string
-            j = s.index('"', i + 1)
-            stack[-1].append(s[i:j+1])
-            i = j + 1
-        elif c in (' ', '\t', '\n', '\r'):
-            i += 1
-        else:
-            j = i
-            while j < len(s) and s[j] not in (' ', '\t', '\n', '\r', '(', ')'):
-                j += 1
-            stack[-1].append(s[i:j])
-            i = j
-    # Unwrap single top-level list
-    if len(tokens) == 1 and isinstance(tokens[0], list):
-        return tokens[0]
-    return tokens
+def _value(x):
+    """Plain value of a form item: unescaped string text, atom, or nested form text."""
+    if isinstance(x, str):
+        return unquote(x)
+    return render(x, check=False)
 
 
-def _flat_tokens(sexp):
-    """Flat tokenization (no nesting) for simple assertions."""
-    inner = sexp.strip()
-    if inner.startswith("(") and inner.endswith(")"):
-        inner = inner[1:-1].strip()
-    tokens = []
-    i = 0
-    while i < len(inner):
-        if inner[i] == '"':
-            j = inner.index('"', i + 1)
-            tokens.append(inner[i+1:j])  # strip quotes
-            i = j + 1
-        elif inner[i] in (' ', '\t', '\n', '\r'):
-            i += 1
-        elif inner[i] == ')':
-            # Stray close-paren (from stripped outer); skip it
-            i += 1
-        elif inner[i] == '(':
-            # Grab nested sexp as a single string token
-            # Must respect quoted strings to avoid miscounting parens
-            depth = 1
-            j = i + 1
-            in_str = False
-            while j < len(inner) and depth > 0:
-                if inner[j] == '"':
-                    in_str = not in_str
-                elif not in_str:
-                    if inner[j] == '(':
-                        depth += 1
-                    elif inner[j] == ')':
-                        depth -= 1
-                j += 1
-            tokens.append(inner[i:j])
-            i = j
-        else:
-            j = i
-            while j < len(inner) and inner[j] not in (' ', '\t', '\n', '\r', '(', ')'):
-                j += 1
-            tokens.append(inner[i:j])
-            i = j
-    return tokens
+def _read_sexps(text):
+    """Yield (tokens, raw) per top-level form of KRF text.
+
+    tokens is the form's items as plain values (see _value), so a nested
+    form is one token; raw is the form's source text. Comments are skipped
+    and forms may span lines.
+    """
+    for form, _, start, end in read_forms(text):
+        if form:
+            yield [_value(x) for x in form], text[start:end]
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -189,6 +78,12 @@ def _flat_tokens(sexp):
 class KRFFile:
     """Parsed representation of a single KRF file."""
 
+    # Everything parse() extracts; the parse cache stores exactly these
+    CACHED_FIELDS = ("microtheory", "isa", "genls", "genlMt", "comments", "implies",
+                     "arity", "arg_types", "predicates", "collections", "directives",
+                     "line_count", "assertion_count", "rule_count", "_purpose")
+    TUPLE_FIELDS = ("isa", "genls", "genlMt", "directives")  # lists of tuples
+
     def __init__(self, path):
         self.path = Path(path)
         self.rel_path = str(self.path.relative_to(ROOT)).replace("\\", "/")
@@ -206,43 +101,49 @@ class KRFFile:
         self.line_count = 0
         self.assertion_count = 0
         self.rule_count = 0
-        self.raw_sexps = []
         self._purpose = None
 
+    def to_cache(self, sha256):
+        """Cache entry for this file: its extracted fields plus content hash."""
+        entry = {name: getattr(self, name) for name in self.CACHED_FIELDS}
+        entry["sha256"] = sha256
+        return entry
+
+    def load_cache(self, entry):
+        """Populate fields from a cache entry instead of parsing."""
+        for name in self.CACHED_FIELDS:
+            setattr(self, name, entry[name])
+        for name in self.TUPLE_FIELDS:
+            setattr(self, name, [tuple(x) for x in entry[name]])
+
     @property
     def purpose(self):
         """One-line purpose derived from file header comment or first comment."""
-        if self._purpose:
-            return self._purpose
-        # Try to extract from file header (;;; lines at top)
-        try:
-            with open(self.path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith(";;;") and "/" in line:
-                        continue  # Skip the ;;; LAYER / FILE header
-                    if line.startswith(";;;") and line.strip("; "):
-                        text = line.strip("; ").strip()
-                        if text and not text.startswith("="):
-                            self._purpose = text
-                            return self._purpose
-                    if not line.startswith(";;"):
-                        break
-        except Exception:
-            pass
-        return self.rel_path
+        return self._purpose or self.rel_path
+
+    @staticmethod
+    def _header_purpose(text):
+        """First ;;; header line that is not the LAYER / FILE path or a rule."""
+        for line in text.split("\n"):
+            line = line.strip()
+            if line.startswith(";;;") and "/" in line:
+                continue  # Skip the ;;; LAYER / FILE header
+            if line.startswith(";;;") and line.strip("; "):
+                purpose = line.strip("; ").strip()
+                if purpose and not purpose.startswith("="):
+                    return purpose
+            if not line.startswith(";;"):
+                break
+        return None
 
     def parse(self):
-        """Parse the KRF file and populate all fields."""
-        with open(self.path, encoding="utf-8") as f:
-            self.line_count = sum(1 for _ in f)
-
-        for sexp in _read_sexps(self.path):
-            self.raw_sexps.append(sexp)
-            tokens = _flat_tokens(sexp)
-            if not tokens:
-                continue
+        """Parse the KRF file and populate all fields. The file is read once."""
+        text = self.path.read_text(encoding="utf-8")
+        self.line_count = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+        self._purpose = self._header_purpose(text)
+        priorities = {}  # directive name -> directivePriority
 
+        for tokens, sexp in _read_sexps(text):
             pred = tokens[0]
             self.assertion_count += 1
 
@@ -283,22 +184,41 @@ class KRFFile:
                 self.implies.append(sexp)
 
             elif pred == "directivePriority" and len(tokens) >= 3:
-                # Will be matched with isa Directive and comment later
-                pass
+                # Matched with isa Directive and comment below
+                try:
+                    priorities[tokens[1]] = int(tokens[2])
+                except ValueError:
+                    pass
 
         # Extract directives (from agent/directives.krf pattern)
         directive_names = [s for s, c in self.isa if c == "Directive"]
         for dname in directive_names:
-            priority = None
-            for sexp in self.raw_sexps:
-                t = _flat_tokens(sexp)
-                if t and t[0] == "directivePriority" and len(t) >= 3 and t[1] == dname:
-                    try:
-                        priority = int(t[2])
-                    except ValueError:
-                        pass
             cmt = self.comments.get(dname, "")
-            self.directives.append((dname, priority, cmt))
+            self.directives.append((dname, priorities.get(dname), cmt))
+
+
+def _parse_fields(path):
+    """Pool worker: parse one file and return its fields (as in KRFFile.to_cache)."""
+    pf = KRFFile(path)
+    pf.parse()
+    return pf.to_cache(None)
+
+
+def parse_files(krf_files, jobs=1):
+    """Parse KRFFile objects in place, across `jobs` processes when jobs > 1.
+
+    The largest files are handed out first so workers finish together.
+    Each result goes back to its own KRFFile, so file order (and every
+    output rendered from it) is the same as a serial parse.
+    """
+    if jobs <= 1 or len(krf_files) < 2:
+        for pf in krf_files:
+            pf.parse()
+        return
+    by_size = sorted(krf_files, key=lambda pf: pf.path.stat().st_size, reverse=True)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(krf_files))) as pool:
+        for pf, fields in zip(by_size, pool.map(_parse_fields, [pf.path for pf in by_size])):
+            pf.load_cache(fields)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -314,10 +234,7 @@ def parse_boot_sequence(boot_file):
     """
     phases = {}  # phase_name -> {"order": int, "files": []}
 
-    for sexp in _read_sexps(boot_file):
-        tokens = _flat_tokens(sexp)
-        if not tokens:
-            continue
+    for tokens, _ in _read_sexps(Path(boot_file).read_text(encoding="utf-8")):
         if tokens[0] == "bootOrder" and len(tokens) >= 3:
             try:
                 phases.setdefault(tokens[1], {"order": int(tokens[2]), "files": []})
@@ -325,7 +242,7 @@ def parse_boot_sequence(boot_file):
                 pass
         elif tokens[0] == "bootLoads" and len(tokens) >= 3:
             phases.setdefault(tokens[1], {"order": 0, "files": []})
-            phases[tokens[1]]["files"].append(tokens[2].strip('"'))
+            phases[tokens[1]]["files"].append(tokens[2])
 
     # Sort phases by order
     sorted_phases = sorted(phases.items(), key=lambda x: x[1]["order"])
@@ -343,25 +260,252 @@ def parse_boot_sequence(boot_file):
 # CONTENT HASH (for --check)
 # ═══════════════════════════════════════════════════════════════════════════
 
-def compute_source_hash(krf_files):
-    """SHA-256 over sorted KRF file contents."""
+def compute_source_hash(krf_files, digests=None):
+    """SHA-256 over sorted KRF file contents.
+
+    If a dict is passed as `digests`, each file's own SHA-256 is stored in
+    it (path -> hex) from the same read.
+    """
     h = hashlib.sha256()
     for f in sorted(krf_files, key=lambda p: str(p)):
         try:
             with open(f, "rb") as fh:
-                h.update(fh.read())
+                data = fh.read()
         except FileNotFoundError:
-            pass
+            continue
+        h.update(data)
+        if digests is not None:
+            digests[f] = hashlib.sha256(data).hexdigest()
     return h.hexdigest()[:12]
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# PARSE CACHE (incremental builds)
+# ═══════════════════════════════════════════════════════════════════════════
+
+# .manifest-cache.json holds every KRFFile's extracted fields keyed by the
+# file's SHA-256, so a rebuild only parses files whose content changed and
+# renders from the merged result. Entries are tied to the parser: editing
+# this script or krf_codec.py invalidates the whole cache.
+
+def _parser_digest():
+    h = hashlib.sha256()
+    for path in (Path(__file__).resolve(), ROOT / "krf_codec.py"):
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def load_parse_cache(path):
+    """The cache ({"files": {rel_path: entry}, "json_hash": ...}), or {} if
+    it is missing, unreadable, or from another parser."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("parser") != _parser_digest():
+        return {}
+    return data
+
+
+def save_parse_cache(path, parsed_files, digests, json_hash):
+    """Atomically rewrite the cache with one entry per current file.
+
+    json_hash is the source hash substrate.json was last rendered from.
+    """
+    data = {
+        "parser": _parser_digest(),
+        "json_hash": json_hash,
+        "files": {pf.rel_path: pf.to_cache(digests[pf.path]) for pf in parsed_files},
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"WARNING: Could not write parse cache {path}: {e}", file=sys.stderr)
+
+
+def _rendered_hash(path):
+    """Source hash recorded in an existing substrate.json header, or None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            head = f.read(512)
+    except OSError:
+        return None
+    match = re.search(r'"hash":\s*"(\w+)"', head)
+    return match.group(1) if match else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TOKEN BUDGET
+# ═══════════════════════════════════════════════════════════════════════════
+
+# SUBSTRATE.md is prepended to every voice-agent system prompt, so its size
+# is paid on every call. There is no tokenizer in the stdlib, so tokens are
+# estimated by a BPE-style model: the text is split the way byte-pair
+# tokenizers pre-split it (words with their leading space, digit runs,
+# punctuation runs, whitespace) and each piece is costed by its shape.
+# Markdown tables, box drawing and KRF identifiers are far from 4 chars/token.
+
+_PIECE_RE = re.compile(r" ?[A-Za-z]+| ?[0-9]+| ?[^\sA-Za-z0-9]+|\s+")
+_WORD_PART_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])")
+_RUN_RE = re.compile(r"(.)\1*")
+
+
+def _piece_tokens(piece):
+    """Estimated tokens for one pre-tokenizer piece."""
+    body = piece.lstrip(" ") or piece
+    if body.isspace():
+        return 1                                    # newline / indent run
+    if body.isascii() and body.isalpha():
+        tokens = 0
+        for part in _WORD_PART_RE.findall(body):    # CamelCase → parts
+            if part.isupper() and len(part) > 1:
+                tokens += 1 + (len(part) - 1) // 4  # CAPS split finely
+            else:
+                tokens += 1 + (len(part) - 1) // 8  # common words are whole
+        return tokens
+    if body.isdigit():
+        return (len(body) + 2) // 3                 # digits group by three
+    tokens = 0
+    for m in _RUN_RE.finditer(body):               # runs of one character
+        run = m.group(0)
+        if run.isascii():
+            tokens += 1 + (len(run) - 1) // 8       # "|---|", "**", "..."
+        else:
+            tokens += len(run)                      # arrows, dashes, box drawing
+    return tokens
+
+
+def count_tokens(text):
+    """Estimated model tokens in text (see the model above)."""
+    return sum(_piece_tokens(p) for p in _PIECE_RE.findall(text))
+
+
+def _lines_tokens(lines):
+    """Tokens of lines as they are written, one per line.
+
+    Summing per line never undercounts the joined text: the only pieces that
+    merge across a line break are whitespace runs, which cost one either way.
+    """
+    return sum(count_tokens(line + "\n") for line in lines)
+
+
+class _Block:
+    """A run of manifest lines that is kept or dropped as a unit."""
+
+    def __init__(self, lines, importance, label, parent=None, key=None):
+        self.lines = lines
+        self.importance = importance    # 0..1 within its section
+        self.label = label
+        self.parent = parent            # block that must be kept for this one
+        self.key = key
+        self.tokens = _lines_tokens(lines)
+
+
+class _Section:
+    """A manifest section: fixed head/tail lines around rankable blocks.
+
+    weight ranks sections against each other (None = always kept); a block
+    scores weight * importance. A section with no blocks is one unit.
+    rebuild(kept_blocks), if given, re-renders the body from the survivors.
+    """
+
+    def __init__(self, name, weight, head, blocks=(), tail=("",), rebuild=None):
+        self.name = name
+        self.weight = weight
+        self.head = list(head)
+        self.blocks = list(blocks)
+        self.tail = list(tail)
+        self.rebuild = rebuild
+        self.tokens = _lines_tokens(self.head + self.tail)
+
+    def render(self, kept=None):
+        """Lines of the section, with only the kept blocks if given."""
+        blocks = self.blocks if kept is None else [b for b in self.blocks if b in kept]
+        if self.rebuild and kept is not None and len(blocks) < len(self.blocks):
+            body = self.rebuild(blocks)
+        else:
+            body = [line for b in blocks for line in b.lines]
+        return self.head + body + self.tail
+
+
+def pack_manifest(sections, budget):
+    """Keep the most important sections and blocks within budget tokens.
+
+    Returns (lines, dropped): dropped lists (section name, labels) for what
+    was left out, and is empty when everything fits as-is.
+    Blocks are taken greedily by score; a block that does not fit is skipped
+    so smaller, less important ones can still use the remaining room.
+    """
+    full = [line for s in sections for line in s.render()]
+    if _lines_tokens(full) <= budget:
+        return full, []
+
+    n_blocks = sum(max(1, len(s.blocks)) for s in sections)
+    room = budget - _lines_tokens([_compacted_note(budget, n_blocks, n_blocks)])
+    candidates = []                     # (score, order, section, block or None)
+    for order, s in enumerate(sections):
+        if s.weight is None:
+            room -= _lines_tokens(s.render())
+        elif not s.blocks:
+            candidates.append((s.weight, order, s, None))
+        else:
+            for b in s.blocks:
+                candidates.append((s.weight * b.importance, order, s, b))
+
+    opened = {s for s in sections if s.weight is None}
+    kept = set()
+    for score, _, s, b in sorted(candidates, key=lambda c: (-c[0], c[1])):
+        if b is not None and b.parent is not None and b.parent not in kept:
+            continue
+        cost = (b.tokens if b is not None else 0) + (s.tokens if s not in opened else 0)
+        if cost <= room:
+            room -= cost
+            opened.add(s)
+            if b is not None:
+                kept.add(b)
+
+    lines, dropped, omitted = [], [], 0
+    for s in sections:
+        if s not in opened:
+            dropped.append((s.name, []))
+            omitted += max(1, len(s.blocks))
+            continue
+        lost = [b.label for b in s.blocks if b not in kept]
+        if lost:
+            dropped.append((s.name, lost))
+            omitted += len(lost)
+        lines.extend(s.render(kept))
+    lines.insert(_required_prefix(sections), _compacted_note(budget, omitted, n_blocks))
+    return lines, dropped
+
+
+def _compacted_note(budget, omitted, total):
+    """The line that tells the reader the manifest was cut to fit."""
+    return (f"> Compacted to a {budget:,}-token budget: {omitted} of {total} entries "
+            f"omitted. Full index in substrate.json.")
+
+
+def _required_prefix(sections):
+    """Line count of the leading header, where the compaction note goes."""
+    head = sections[0]
+    return len(head.render()) - len(head.tail) if head.weight is None else 0
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # SUBSTRATE.md RENDERER
 # ═══════════════════════════════════════════════════════════════════════════
 
 def render_substrate_md(parsed_files, boot_phases, all_boot_files, source_hash,
-                        total_lines, total_files, domain_seed=None):
-    """Render the compact SUBSTRATE.md manifest."""
+                        total_lines, total_files, domain_seed=None, token_budget=None):
+    """Render the compact SUBSTRATE.md manifest.
+
+    Returns (text, dropped). With token_budget, the least important sections
+    and entries are left out until the manifest fits (see pack_manifest).
+    """
 
     # ── Collect data from parsed files ──
     # Microtheory hierarchy (from boot.krf genlMt)
@@ -406,9 +550,6 @@ def render_substrate_md(parsed_files, boot_phases, all_boot_files, source_hash,
                     desc = pf.comments.get(subj, "")
                     observer_caps.append((subj, desc))
 
-    # ── Build microtheory tree ──
-    mt_tree = _build_mt_tree(mt_edges)
-
     # ── Build file index ──
     # boot.krf + valuation-layer.krf + all boot-order files
     boot_set = set(all_boot_files)
@@ -428,59 +569,78 @@ def render_substrate_md(parsed_files, boot_phases, all_boot_files, source_hash,
     boot_order_map["kernel/valuation-layer.krf"] = -1
     indexed_files.sort(key=lambda pf: boot_order_map.get(pf.rel_path, 999))
 
+    # ── Rank entities: boot order, fan-in, microtheory depth ──
+    mt_depth = _mt_depths(mt_edges)
+    fan_in = _fan_in(parsed_files)
+    max_fan = max((fan_in.get(pf.rel_path, 0) for pf in indexed_files), default=0)
+    mt_files = {}  # microtheory -> files scoped to it
+    for pf in parsed_files:
+        if pf.microtheory:
+            mt_files[pf.microtheory] = mt_files.get(pf.microtheory, 0) + 1
+
+    def file_importance(i, pf):
+        boot = 1 - i / len(indexed_files)
+        fan = math.log1p(fan_in.get(pf.rel_path, 0)) / math.log1p(max_fan) if max_fan else 0
+        depth = mt_depth.get(pf.microtheory)
+        general = 1 / (1 + depth) if depth is not None else 0
+        return max((boot + fan + general) / 3, 0.01)
+
     # ── Render ──
-    lines = []
-    w = lines.append
-
-    w(f"# Charlotte OS Substrate Manifest v1")
-    w(f"> Auto-generated by compile-manifest.py. Do not edit.")
-    w(f"> Version: {VERSION} | Files: {total_files} | Lines: ~{total_lines:,} | Hash: {source_hash}")
-    w("")
-
-    # Identity
-    w("## Identity")
-    w("Charlotte is an operating system for operations, built on first-order logic.")
-    w("She boots as an unbound agent on the temporal spine, perceiving the knowledge graph")
-    w("and placing signals on metric lines. A domain seed binds her to a specific operation.")
-    w("")
-
-    # Architecture
-    w("## Architecture: Two Layers")
-    w("- **Ontological** (NODE + EDGE): What exists. Shared truth. Graph-traversable.")
-    w("- **Valuation** (METRIC → SIGNAL → PROTOCOL): What it means. Serial pipeline. Observer-dependent.")
-    w("- **Dive line**: every PROTOCOL traces back through SIGNALs → METRICs → NODEs. Deterministic. Never probabilistic.")
-    w("- The graph is the territory. The pipeline is the map. Charlotte keeps both, keeps them separate.")
-    w("")
-
-    # Five Primitives
-    w("## Five Primitives")
-    w("| Primitive | Layer | Definition |")
-    w("|-----------|-------|------------|")
-    for prim in ("NODE", "EDGE", "METRIC", "SIGNAL", "PROTOCOL"):
-        d = primitives_data[prim]
-        w(f"| {prim} | {d['layer']} | {d['def']} |")
-    w("")
-
-    # Type System
-    w("## Type System")
-    w("- **FACT** is the universal base collection. Every primitive is a FACT.")
-    w("- **Register grammar**: `:field` (framework, immutable), `::attr` (attribute, mutable), `:::rel` (relationship, resolved to EDGE)")
-    w("- **Payload registers**: P0–P3 (type-specific fields per primitive)")
-    w("- **Framework fields**: `:ID`, `:TYPE`, `:CREATED` (every FACT has these)")
-    w("")
-
-    # Microtheory Hierarchy
-    w("## Microtheory Hierarchy")
-    w("```")
-    for line in mt_tree:
-        w(line)
-    w("```")
-    w("")
+    sections = []
+    s = sections.append
+
+    s(_Section("Header", None, [
+        "# Charlotte OS Substrate Manifest v1",
+        "> Auto-generated by compile-manifest.py. Do not edit.",
+        f"> Version: {VERSION} | Files: {total_files} | Lines: ~{total_lines:,} | Hash: {source_hash}",
+    ]))
+
+    s(_Section("Identity", None, [
+        "## Identity",
+        "Charlotte is an operating system for operations, built on first-order logic.",
+        "She boots as an unbound agent on the temporal spine, perceiving the knowledge graph",
+        "and placing signals on metric lines. A domain seed binds her to a specific operation.",
+    ]))
+
+    s(_Section("Architecture", 95, [
+        "## Architecture: Two Layers",
+        "- **Ontological** (NODE + EDGE): What exists. Shared truth. Graph-traversable.",
+        "- **Valuation** (METRIC → SIGNAL → PROTOCOL): What it means. Serial pipeline. Observer-dependent.",
+        "- **Dive line**: every PROTOCOL traces back through SIGNALs → METRICs → NODEs. Deterministic. Never probabilistic.",
+        "- The graph is the territory. The pipeline is the map. Charlotte keeps both, keeps them separate.",
+    ]))
+
+    s(_Section("Five Primitives", 100, [
+        "## Five Primitives",
+        "| Primitive | Layer | Definition |",
+        "|-----------|-------|------------|",
+    ], [
+        _Block([f"| {prim} | {d['layer']} | {d['def']} |"], 1.0, prim)
+        for prim, d in ((p, primitives_data[p]) for p in ("NODE", "EDGE", "METRIC", "SIGNAL", "PROTOCOL"))
+    ]))
+
+    s(_Section("Type System", 80, [
+        "## Type System",
+        "- **FACT** is the universal base collection. Every primitive is a FACT.",
+        "- **Register grammar**: `:field` (framework, immutable), `::attr` (attribute, mutable), `:::rel` (relationship, resolved to EDGE)",
+        "- **Payload registers**: P0–P3 (type-specific fields per primitive)",
+        "- **Framework fields**: `:ID`, `:TYPE`, `:CREATED` (every FACT has these)",
+    ]))
+
+    # Microtheory Hierarchy: shallow (more foundational) nodes first
+    mt_nodes = []
+    mt_tree = _build_mt_tree(mt_edges, mt_nodes)
+    mt_blocks = []
+    for line, (node, parent, depth) in zip(mt_tree, mt_nodes):
+        files = math.log1p(mt_files.get(node, 0)) / math.log1p(total_files)
+        mt_blocks.append(_Block([line], (0.5 + 0.5 * files) / (1 + depth), node,
+                                parent=mt_blocks[parent] if parent is not None else None,
+                                key=node))
+    s(_Section("Microtheory Hierarchy", 65, ["## Microtheory Hierarchy", "```"], mt_blocks,
+               ["```", ""], rebuild=lambda kept: _build_mt_tree(
+                   [(c, p) for c, p in mt_edges if p in {b.key for b in kept}])))
 
     # Boot Sequence
-    w("## Boot Sequence (6 phases)")
-    w("| Phase | Order | Files |")
-    w("|-------|-------|-------|")
     phase_names = {
         "BootPhase-Kernel":    "Kernel",
         "BootPhase-Spine":     "Spine (temporal)",
@@ -489,24 +649,29 @@ def render_substrate_md(parsed_files, boot_phases, all_boot_files, source_hash,
         "BootPhase-Reference": "Reference + hull",
         "BootPhase-Agent":     "Agent identity",
     }
-    for phase_id, order, files in boot_phases:
+    phase_blocks = []
+    for i, (phase_id, order, files) in enumerate(boot_phases):
         name = phase_names.get(phase_id, phase_id)
         file_list = ", ".join(f.split("/")[-1] for f in files)
-        w(f"| {name} | {order} | {file_list} |")
-    w("")
-
-    # Standing Directives
-    w("## Standing Directives")
-    for dname, priority, cmt in directives:
+        phase_blocks.append(_Block([f"| {name} | {order} | {file_list} |"],
+                                   _rank(i, len(boot_phases)), name))
+    s(_Section("Boot Sequence", 75, [
+        "## Boot Sequence (6 phases)",
+        "| Phase | Order | Files |",
+        "|-------|-------|-------|",
+    ], phase_blocks))
+
+    # Standing Directives, already in priority order
+    directive_blocks = []
+    for i, (dname, priority, cmt) in enumerate(directives):
         short_name = dname.replace("Directive-", "")
         # First sentence of comment
         first_sent = cmt.split(".")[0].strip() + "." if cmt else ""
-        w(f"- **D{priority}: {short_name}** — {first_sent}")
-    w("")
+        directive_blocks.append(_Block([f"- **D{priority}: {short_name}** — {first_sent}"],
+                                       _rank(i, len(directives)), short_name))
+    s(_Section("Standing Directives", 90, ["## Standing Directives"], directive_blocks))
 
     # Observer Capabilities
-    w("## Observer Capabilities")
-    w("Charlotte is an Observer on the temporal spine. Capabilities:")
     cap_names = ["Perceive", "PlaceSignal", "Zoom", "Traverse", "Reflect"]
     cap_descs = {
         "Perceive": "Read graph state at current time",
@@ -515,59 +680,149 @@ def render_substrate_md(parsed_files, boot_phases, all_boot_files, source_hash,
         "Traverse": "Move along edges in the topological plane",
         "Reflect": "Access meta knowledge (know what you know)",
     }
-    for cap in cap_names:
-        desc = cap_descs.get(cap, "")
-        w(f"- **{cap}**: {desc}")
-    w("")
-    w("**Observation loop**: Perceive → evaluate protocols → execute actions → ingest signals → advance spine → repeat.")
-    w("")
-
-    # KRF Syntax Cheat Sheet
-    w("## KRF Syntax Cheat Sheet")
-    w("```lisp")
-    w('(in-microtheory CharlotteKernelMt)        ; scope to microtheory')
-    w('(isa NODE Primitive)                       ; X is a member of Y')
-    w('(genls METRIC ValuationLayer)              ; X is a subclass of Y')
-    w('(genlMt ChildMt ParentMt)                  ; child inherits from parent')
-    w('(comment NODE "Identity. Any uniquely...")  ; documentation string')
-    w('(implies (and (isa ?X NODE) ...)           ; if-then rule')
-    w('         (conclusion ?X))')
-    w("```")
-    w("")
+    s(_Section("Observer Capabilities", 60, [
+        "## Observer Capabilities",
+        "Charlotte is an Observer on the temporal spine. Capabilities:",
+    ], [
+        _Block([f"- **{cap}**: {cap_descs.get(cap, '')}"], _rank(i, len(cap_names)), cap)
+        for i, cap in enumerate(cap_names)
+    ], [
+        "",
+        "**Observation loop**: Perceive → evaluate protocols → execute actions → ingest signals → advance spine → repeat.",
+        "",
+    ]))
+
+    s(_Section("KRF Syntax Cheat Sheet", 50, [
+        "## KRF Syntax Cheat Sheet",
+        "```lisp",
+        '(in-microtheory CharlotteKernelMt)        ; scope to microtheory',
+        '(isa NODE Primitive)                       ; X is a member of Y',
+        '(genls METRIC ValuationLayer)              ; X is a subclass of Y',
+        '(genlMt ChildMt ParentMt)                  ; child inherits from parent',
+        '(comment NODE "Identity. Any uniquely...")  ; documentation string',
+        '(implies (and (isa ?X NODE) ...)           ; if-then rule',
+        '         (conclusion ?X))',
+        "```",
+    ]))
 
     # File Index
-    w("## File Index")
-    w("| Path | Lines | Microtheory | Purpose |")
-    w("|------|-------|-------------|---------|")
-    for pf in indexed_files:
+    file_blocks = []
+    for i, pf in enumerate(indexed_files):
         mt_short = (pf.microtheory or "—").replace("Charlotte", "").replace("Mt", "")
         purpose = pf.purpose
         if len(purpose) > 60:
             purpose = purpose[:57] + "..."
-        w(f"| {pf.rel_path} | {pf.line_count} | {mt_short} | {purpose} |")
-    w("")
+        file_blocks.append(_Block([f"| {pf.rel_path} | {pf.line_count} | {mt_short} | {purpose} |"],
+                                  file_importance(i, pf), pf.rel_path))
+    s(_Section("File Index", 40, [
+        "## File Index",
+        "| Path | Lines | Microtheory | Purpose |",
+        "|------|-------|-------------|---------|",
+    ], file_blocks))
 
     # Domain Binding
-    w("## Domain Binding")
-    w("Charlotte boots unbound. A **domain seed** binds her to a specific operation")
-    w("(e.g., ISG industrial services, Sounder agriculture). The seed declares")
-    w("domain-specific NODEs, METRICs, and PROTOCOLs that extend the base substrate.")
+    s(_Section("Domain Binding", 70, [
+        "## Domain Binding",
+        "Charlotte boots unbound. A **domain seed** binds her to a specific operation",
+        "(e.g., ISG industrial services, Sounder agriculture). The seed declares",
+        "domain-specific NODEs, METRICs, and PROTOCOLs that extend the base substrate.",
+    ], tail=()))
 
     # Append domain seed if provided
     if domain_seed:
-        w("")
-        w("---")
-        w("")
-        w(domain_seed)
+        s(_Section("Domain Seed", 85, ["", "---", ""], _seed_blocks(domain_seed), tail=()))
+
+    if token_budget:
+        lines, dropped = pack_manifest(sections, token_budget)
+    else:
+        lines, dropped = [line for sec in sections for line in sec.render()], []
+    return "\n".join(lines) + "\n", dropped
 
-    return "\n".join(lines) + "\n"
 
+def _rank(i, n):
+    """Importance of the i-th of n entries already listed most important first."""
+    return 1 - i / (2 * n)
 
-def _build_mt_tree(edges):
+
+def _mt_depths(edges, root="CharlotteBootMt"):
+    """Microtheory -> inheritance steps from the boot microtheory."""
+    inherits_from = {}
+    for child, parent in edges:
+        inherits_from.setdefault(child, []).append(parent)
+    depth = {root: 0}
+    frontier = [root]
+    while frontier:
+        nxt = []
+        for mt in frontier:
+            for parent in inherits_from.get(mt, []):
+                if parent not in depth:
+                    depth[parent] = depth[mt] + 1
+                    nxt.append(parent)
+        frontier = nxt
+    return depth
+
+
+def _fan_in(parsed_files):
+    """File -> references from other files to the entities it declares.
+
+    An entity is declared by the first file that makes it the subject of an
+    isa or genls; references are collections, supertypes, argument types and
+    in-microtheory scopes.
+    """
+    owner = {}
+    for pf in parsed_files:
+        for subj, _ in pf.isa:
+            owner.setdefault(subj, pf.rel_path)
+        for sub, _ in pf.genls:
+            owner.setdefault(sub, pf.rel_path)
+
+    fan = {}
+    for pf in parsed_files:
+        refs = [coll for _, coll in pf.isa] + [sup for _, sup in pf.genls]
+        refs += [t for types in pf.arg_types.values() for t in types.values()]
+        refs.append(pf.microtheory)
+        for ref in refs:
+            src = owner.get(ref)
+            if src and src != pf.rel_path:
+                fan[src] = fan.get(src, 0) + 1
+    return fan
+
+
+def _seed_blocks(seed):
+    """Split a domain seed into paragraph blocks, earlier ones ranked higher.
+
+    Code fences stay whole, and a paragraph is only kept with the heading
+    above it.
+    """
+    lines = seed.split("\n")
+    paras, para, fenced = [], [], False
+    for i, line in enumerate(lines):
+        para.append(line)
+        if line.lstrip().startswith("```"):
+            fenced = not fenced
+        nxt = lines[i + 1] if i + 1 < len(lines) else None
+        if nxt is None or (not fenced and not line.strip() and nxt.strip()):
+            paras.append(para)
+            para = []
+
+    blocks, heading = [], None
+    for i, para in enumerate(paras):
+        first = para[0].strip()
+        label = first if len(first) <= 50 else first[:47] + "..."
+        block = _Block(para, _rank(i, len(paras)), label,
+                       parent=None if first.startswith("#") else heading)
+        if first.startswith("#"):
+            heading = block
+        blocks.append(block)
+    return blocks
+
+
+def _build_mt_tree(edges, nodes=None):
     """Build a text tree from genlMt edges.
 
     genlMt(child, parent) means child inherits from parent.
     We want to show the tree from the root (CharlotteBootMt) down.
+    If nodes is given, (node, parent line index, depth) is appended per line.
     """
     # Build parent -> children mapping
     children = {}
@@ -602,14 +857,17 @@ def _build_mt_tree(edges):
 
     # Now build tree with BootMt at root
     lines = []
-    _render_tree(lines, "CharlotteBootMt", inherits_from, "", True)
+    _render_tree(lines, "CharlotteBootMt", inherits_from, "", True, nodes)
     return lines
 
 
-def _render_tree(lines, node, inherits_from, prefix, is_last):
+def _render_tree(lines, node, inherits_from, prefix, is_last, nodes=None, parent=None, depth=0):
     """Recursively render a tree node."""
     short = node.replace("Charlotte", "").replace("Mt", "")
     connector = "└── " if is_last else "├── "
+    if nodes is not None:
+        nodes.append((node, parent, depth))
+    here = len(lines)
     if not prefix:
         lines.append(node)
     else:
@@ -623,7 +881,8 @@ def _render_tree(lines, node, inherits_from, prefix, is_last):
             child_prefix = ""
         else:
             child_prefix = prefix + ("    " if is_last else "│   ")
-        _render_tree(lines, child, inherits_from, child_prefix if prefix else "  ", is_child_last)
+        _render_tree(lines, child, inherits_from, child_prefix if prefix else "  ", is_child_last,
+                     nodes, here, depth + 1)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -783,10 +1042,17 @@ def main():
     parser.add_argument("--check", action="store_true",
                         help="Verify manifest is up to date (exit 1 if stale)")
     parser.add_argument("--token-budget", type=int, default=4000,
-                        help="Approximate token budget for SUBSTRATE.md (default: 4000)")
+                        help="Token budget SUBSTRATE.md is compacted to fit (default: 4000)")
     parser.add_argument("--domain", type=str, default=None,
                         help="Path to domain seed file to append to SUBSTRATE.md")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-parse every KRF file instead of reusing unchanged ones")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Processes for parsing changed files (default: 1; 0 = one per CPU)")
     args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    timings = {}  # phase -> seconds
+    t0 = time.perf_counter()
 
     # ── Discover all KRF files ──
     krf_paths = sorted(ROOT.rglob("*.krf"))
@@ -794,15 +1060,17 @@ def main():
         print("ERROR: No KRF files found in", ROOT, file=sys.stderr)
         sys.exit(1)
 
-    # ── Parse boot sequence ──
+    # ── Boot sequence must exist ──
     if not BOOT_KRF.exists():
         print("ERROR: boot.krf not found at", BOOT_KRF, file=sys.stderr)
         sys.exit(1)
 
-    boot_phases, all_boot_files = parse_boot_sequence(BOOT_KRF)
-
-    # ── Compute source hash ──
-    source_hash = compute_source_hash(krf_paths)
+    # ── Compute source hash (and per-file hashes for the parse cache) ──
+    timings["discover"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    digests = None if args.check else {}
+    source_hash = compute_source_hash(krf_paths, digests)
+    timings["hash"] = time.perf_counter() - t0
 
     # ── Check mode ──
     if args.check:
@@ -821,13 +1089,27 @@ def main():
             print(f"STALE: manifest hash {old_hash} != source hash {source_hash}")
             sys.exit(1)
 
-    # ── Parse all KRF files ──
-    print(f"Parsing {len(krf_paths)} KRF files...")
-    parsed_files = []
-    for p in krf_paths:
-        krf = KRFFile(p)
-        krf.parse()
-        parsed_files.append(krf)
+    # ── Parse boot sequence ──
+    t0 = time.perf_counter()
+    boot_phases, all_boot_files = parse_boot_sequence(BOOT_KRF)
+
+    # ── Parse KRF files that changed since the cached build ──
+    cache = {} if args.no_cache else load_parse_cache(PARSE_CACHE)
+    entries = cache.get("files", {})
+    parsed_files = [KRFFile(p) for p in krf_paths]
+    stale = []
+    for pf in parsed_files:
+        entry = entries.get(pf.rel_path)
+        if entry and entry.get("sha256") == digests.get(pf.path):
+            pf.load_cache(entry)
+        else:
+            stale.append(pf)
+
+    workers = f", {min(jobs, len(stale))} processes" if jobs > 1 and len(stale) > 1 else ""
+    print(f"Parsing {len(stale)} of {len(krf_paths)} KRF files "
+          f"({len(krf_paths) - len(stale)} unchanged, from cache{workers})...")
+    parse_files(stale, jobs)
+    cache_dirty = bool(stale) or set(entries) != {pf.rel_path for pf in parsed_files}
 
     total_lines = sum(pf.line_count for pf in parsed_files)
     total_files = len(parsed_files)
@@ -836,6 +1118,9 @@ def main():
           f"{sum(pf.assertion_count for pf in parsed_files)} assertions, "
           f"{sum(pf.rule_count for pf in parsed_files)} rules")
 
+    timings["parse"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+
     # ── Load domain seed if specified ──
     domain_seed = None
     if args.domain:
@@ -850,31 +1135,44 @@ def main():
             print(f"WARNING: Domain seed not found: {seed_path}", file=sys.stderr)
 
     # ── Render SUBSTRATE.md ──
-    substrate_md = render_substrate_md(
+    substrate_md, dropped = render_substrate_md(
         parsed_files, boot_phases, all_boot_files, source_hash,
-        total_lines, total_files, domain_seed
+        total_lines, total_files, domain_seed, args.token_budget
     )
 
-    char_count = len(substrate_md)
-    approx_tokens = char_count // 4  # rough estimate: 4 chars per token
-    print(f"  SUBSTRATE.md: {char_count:,} chars (~{approx_tokens:,} tokens)")
+    tokens = count_tokens(substrate_md)
+    print(f"  SUBSTRATE.md: {len(substrate_md):,} chars, ~{tokens:,} tokens "
+          f"(budget {args.token_budget:,})")
+    for name, labels in dropped:
+        if labels:
+            print(f"    Dropped from {name}: {', '.join(labels)}")
+        else:
+            print(f"    Dropped section: {name}")
 
-    if approx_tokens > args.token_budget * 1.2:
-        print(f"  WARNING: Exceeds token budget ({args.token_budget})", file=sys.stderr)
+    if tokens > args.token_budget:
+        print(f"  WARNING: Exceeds token budget ({args.token_budget}) "
+              f"even with only the required sections", file=sys.stderr)
 
     with open(SUBSTRATE_MD, "w", encoding="utf-8") as f:
         f.write(substrate_md)
     print(f"  Written: {SUBSTRATE_MD}")
 
-    # ── Render substrate.json ──
-    substrate_json = render_substrate_json(
-        parsed_files, boot_phases, all_boot_files, source_hash,
-        total_lines, total_files
-    )
+    # ── Render substrate.json (it depends only on the sources) ──
+    if cache.get("json_hash") == source_hash and _rendered_hash(SUBSTRATE_JSON) == source_hash:
+        print(f"  Unchanged: {SUBSTRATE_JSON}")
+    else:
+        substrate_json = render_substrate_json(
+            parsed_files, boot_phases, all_boot_files, source_hash,
+            total_lines, total_files
+        )
+
+        with open(SUBSTRATE_JSON, "w", encoding="utf-8") as f:
+            f.write(substrate_json)
+        print(f"  Written: {SUBSTRATE_JSON}")
+        cache_dirty = True
 
-    with open(SUBSTRATE_JSON, "w", encoding="utf-8") as f:
-        f.write(substrate_json)
-    print(f"  Written: {SUBSTRATE_JSON}")
+    if cache_dirty:
+        save_parse_cache(PARSE_CACHE, parsed_files, digests, source_hash)
 
     # ── Render CLAUDE.md ──
     if args.claude_md:
@@ -883,6 +1181,8 @@ def main():
             f.write(claude_md)
         print(f"  Written: {CLAUDE_MD}")
 
+    timings["render"] = time.perf_counter() - t0
+    print("  Timing: " + ", ".join(f"{phase} {sec * 1000:.0f} ms" for phase, sec in timings.items()))
     print(f"\nDone. Source hash: {source_hash}")
 
 
@@ -0,0 +1,420 @@
+"""
+krf_codec.py — Charlotte OS KRF Reader & Writer
+=================================================
+The one S-expression codec for KRF, shared by compile-manifest.py, the
+voice agent's index (voice/tools/krf.py) and the converters that
+generate KRF (business/sounder/substrate/converter.py). Stdlib only.
+
+Components:
+  1. Reader — single regex pass over the text (escaped-quote-safe,
+     line-tracking), also fed block by block for files too large to
+     read whole
+  2. Fact — one parsed assertion, scoped by in-microtheory, with its
+     raw text read back from source offsets on demand
+  3. Writer — quoting/escaping of strings, form rendering that refuses
+     anything the reader would not read back, and a .krf file writer
+
+Usage from another directory:
+  sys.path.insert(0, str(<repo>/"charlotte-os"))
+  from krf_codec import read_forms, parse_krf, form, quote, KRFWriter
+"""
+
+import math
+import re
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
+from sys import intern
+
+# Fact.source_file paths are relative to charlotte-os/, where this module lives
+SOURCE_ROOT = Path(__file__).resolve().parent
+
+# Type alias for parsed S-expressions
+SExpr = str | tuple  # Atom or nested form
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 1. READER
+# ═══════════════════════════════════════════════════════════════════════════
+
+# One regex alternation covers every lexeme, so a file is scanned exactly
+# once: quoted string (escape-aware, may span lines), ;; comment, paren,
+# or atom (a lone ';' is part of an atom, ';;' starts a comment).
+TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"?|;;[^\n]*|[()]|(?:[^\s()";]|;(?!;))+')
+_STRING_BREAK_RE = re.compile(r'\s*\n\s*')
+
+
+def read_forms(text: str) -> Iterator[tuple[list, int, int, int]]:
+    """Stream top-level S-expressions out of KRF text in a single pass.
+
+    Yields (form, start_line, start_offset, end_offset) per top-level form,
+    already tokenized into nested lists. Line numbers are 1-based; offsets
+    index into `text` so the raw form is text[start:end]. Several forms on
+    one line are yielded separately. Line breaks inside a quoted string
+    collapse to a single space.
+    """
+    stack: list[list] = []
+    cur: list | None = None
+    line = 1
+    counted = 0
+    start = 0
+
+    for m in TOKEN_RE.finditer(text):
+        tok = m.group()
+        c = tok[0]
+        if c == '(':
+            new = []
+            if cur is None:
+                start = m.start()
+                line += text.count('\n', counted, start)
+                counted = start
+            else:
+                cur.append(new)
+                stack.append(cur)
+            cur = new
+        elif c == ')':
+            if cur is None:
+                continue  # stray close paren at top level
+            if stack:
+                cur = stack.pop()
+            else:
+                yield cur, line, start, m.end()
+                cur = None
+        elif c == ';' and tok[1:2] == ';':
+            continue
+        elif cur is not None:
+            if c == '"' and '\n' in tok:
+                tok = _STRING_BREAK_RE.sub(' ', tok)
+            cur.append(tok)
+        # Atoms outside any form are ignored
+
+    # Flush unterminated form (malformed — shouldn't happen in well-formed KRF)
+    if cur is not None:
+        if stack:
+            cur = stack[0]
+        yield cur, line, start, len(text)
+
+
+def read_forms_chunked(chunks: Iterable[str]) -> Iterator[tuple[list, int, int, int]]:
+    """read_forms over text that arrives in pieces, e.g. a file read in blocks.
+
+    Yields exactly what read_forms yields for the concatenated text, with
+    offsets into that whole text. Only the current piece is held, plus the
+    token that may continue past its end and the open form's parsed prefix.
+    """
+    stack: list[list] = []
+    cur: list | None = None
+    line = 1     # at buf[counted]
+    form_line = 1
+    base = 0     # offset of buf[0] in the whole text
+    counted = 0  # newlines before buf[counted] are already in `line`
+    start = 0
+    buf = ""
+
+    for chunk in chain(chunks, (None,)):
+        if chunk is not None:
+            buf += chunk
+            # A token ending this close to the edge may continue in the next piece
+            # (atom, comment, open string, or a ';' that becomes ';;')
+            safe = len(buf) - 2
+        else:
+            safe = len(buf)
+        resume = len(buf)
+
+        for m in TOKEN_RE.finditer(buf):
+            if m.end() > safe:
+                resume = m.start()
+                break
+            tok = m.group()
+            c = tok[0]
+            if c == '(':
+                new = []
+                if cur is None:
+                    pos = m.start()
+                    line += buf.count('\n', counted, pos)
+                    counted = pos
+                    form_line = line
+                    start = base + pos
+                else:
+                    cur.append(new)
+                    stack.append(cur)
+                cur = new
+            elif c == ')':
+                if cur is None:
+                    continue
+                if stack:
+                    cur = stack.pop()
+                else:
+                    yield cur, form_line, start, base + m.end()
+                    cur = None
+            elif c == ';' and tok[1:2] == ';':
+                continue
+            elif cur is not None:
+                if c == '"' and '\n' in tok:
+                    tok = _STRING_BREAK_RE.sub(' ', tok)
+                cur.append(tok)
+
+        line += buf.count('\n', counted, resume)
+        counted = 0
+        base += resume
+        buf = buf[resume:]
+
+    if cur is not None:
+        if stack:
+            cur = stack[0]
+        yield cur, form_line, start, base
+
+
+def tokenize(sexp: str) -> SExpr:
+    """Tokenize a single S-expression string into a nested tuple structure.
+
+    Handles escaped quotes inside strings.
+    '(isa X "a \\"thing\\"")' -> ('isa', 'X', '"a \\"thing\\""')
+    """
+    for form, _, _, _ in read_forms(sexp):
+        return freeze(form)
+    return ()
+
+
+def freeze(form: list) -> tuple:
+    """Convert a reader list into nested tuples of interned atoms.
+
+    Facts repeat the same few thousand symbols; interning shares one
+    string object per symbol, and tuples are smaller than lists.
+    """
+    return tuple([intern(a) if isinstance(a, str) else freeze(a) for a in form])
+
+
+def unquote(s: str) -> str:
+    """Strip surrounding quotes and unescape interior."""
+    if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
+        return s[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    return s
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 2. FACT
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass(slots=True)
+class Fact:
+    predicate: str          # "isa", "hasAttribute", "implies", etc.
+    args: tuple             # Remaining arguments (SExpr items)
+    microtheory: str        # Scoping context
+    source_file: str        # Relative path from charlotte-os/
+    line_hint: int          # Approximate line number
+    start: int = 0          # Character offsets of the form in the source file
+    end: int = 0
+
+    @property
+    def raw(self) -> str:
+        """Original S-expression text, re-read from the source file on demand."""
+        return source_slice(self.source_file, self.start, self.end)
+
+
+# Files of STREAM_MIN_MB and up are never read whole: they are parsed in
+# blocks of STREAM_CHUNK_CHARS characters and handed out STREAM_BATCH_FACTS
+# facts at a time. Callers with their own threshold pass it to streamed()
+# (the voice agent passes KRF_STREAM_MIN_MB).
+STREAM_MIN_MB = 32
+STREAM_CHUNK_CHARS = 1 << 20
+STREAM_BATCH_FACTS = 50_000
+
+
+def streamed(size: int, min_mb: int = STREAM_MIN_MB) -> bool:
+    return size >= min_mb << 20
+
+
+def decode_source(data: bytes) -> str:
+    """Text of KRF source bytes, with line endings translated as open() does.
+
+    Fact offsets index text made this way, whether the file was read whole,
+    streamed in text mode, or re-read for Fact.raw, so a CRLF checkout slices
+    the same as an LF one.
+    """
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+@lru_cache(maxsize=8)
+def _source_text(source_file: str, mtime_ns: int, size: int) -> str:
+    """Whole text of a source file as of the given stamp."""
+    try:
+        return decode_source((SOURCE_ROOT / source_file).read_bytes())
+    except OSError:
+        return ""
+
+
+@lru_cache(maxsize=8)
+def _source_marks(source_file: str, mtime_ns: int, size: int) -> tuple[list[int], list[int]]:
+    """(character offset, text-mode seek cookie) every block of a large file."""
+    chars, cookies = [0], [0]
+    with open(SOURCE_ROOT / source_file, encoding="utf-8") as f:
+        while block := f.read(STREAM_CHUNK_CHARS):
+            chars.append(chars[-1] + len(block))
+            cookies.append(f.tell())
+    return chars, cookies
+
+
+def source_slice(source_file: str, start: int, end: int) -> str:
+    """text[start:end] of a source file; large files are read from a nearby mark.
+
+    Cached text is keyed by mtime and size, so an edited file is re-read.
+    """
+    path = SOURCE_ROOT / source_file
+    try:
+        st = path.stat()
+        if not streamed(st.st_size):
+            return _source_text(source_file, st.st_mtime_ns, st.st_size)[start:end]
+        chars, cookies = _source_marks(source_file, st.st_mtime_ns, st.st_size)
+        i = bisect_right(chars, start) - 1
+        with open(path, encoding="utf-8") as f:
+            f.seek(cookies[i])
+            f.read(start - chars[i])
+            return f.read(end - start)
+    except OSError:
+        return ""
+
+
+def iter_facts(forms: Iterable[tuple[list, int, int, int]], source_file: str) -> Iterator[Fact]:
+    """Turn reader forms into Facts, scoped by in-microtheory declarations."""
+    current_mt = "UnknownMt"
+    source_file = intern(source_file)
+
+    for parsed, line_no, start, end in forms:
+        if not parsed:
+            continue
+
+        pred = parsed[0]
+        if not isinstance(pred, str):
+            continue
+
+        # Track microtheory
+        if pred == "in-microtheory" and len(parsed) >= 2:
+            current_mt = intern(parsed[1] if isinstance(parsed[1], str) else str(parsed[1]))
+            continue
+
+        yield Fact(
+            predicate=intern(pred),
+            args=freeze(parsed[1:]),
+            microtheory=current_mt,
+            source_file=source_file,
+            line_hint=line_no,
+            start=start,
+            end=end,
+        )
+
+
+def parse_krf(text: str, source_file: str) -> list[Fact]:
+    """Parse KRF text into Fact objects.
+
+    Tracks in-microtheory declarations to scope subsequent facts.
+    Skips forms whose head is not an atom.
+    """
+    return list(iter_facts(read_forms(text), source_file))
+
+
+def batched(items: Iterable, n: int) -> Iterator[list]:
+    it = iter(items)
+    while batch := list(islice(it, n)):
+        yield batch
+
+
+def stream_krf(path: Path, source_file: str, batch: int = STREAM_BATCH_FACTS) -> Iterator[list[Fact]]:
+    """Parse a KRF file in lists of up to `batch` Facts, reading it in blocks.
+
+    Same Facts as parse_krf on the whole text, but memory stays bounded by
+    the block and batch sizes however large the file is.
+    """
+    with open(path, encoding="utf-8") as f:
+        blocks = iter(lambda: f.read(STREAM_CHUNK_CHARS), "")
+        yield from batched(iter_facts(read_forms_chunked(blocks), source_file), batch)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 3. WRITER
+# ═══════════════════════════════════════════════════════════════════════════
+
+_ATOM_RE = re.compile(r'(?:[^\s()";]|;(?!;))+')
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+def quote(s) -> str:
+    """A string literal that reads back as `s`.
+
+    Backslashes and quotes are escaped. Line breaks become a space, which
+    is what the reader makes of a string that spans lines anyway.
+    """
+    s = str(s)
+    if '\n' in s or '\r' in s:
+        s = ' '.join(s.splitlines())
+    return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def render(x, check: bool = True) -> str:
+    """S-expression text for an atom, number, or nested tuple/list.
+
+    Strings are written as they are, so they must already be one atom or
+    one quoted literal (see quote); anything else raises ValueError
+    rather than producing text that reads back differently. check=False
+    skips that test, for echoing forms that came from the reader.
+    """
+    if isinstance(x, str):
+        if not check or _ATOM_RE.fullmatch(x) or _STRING_RE.fullmatch(x):
+            return x
+        raise ValueError(f"not a KRF atom or string literal: {x!r}")
+    if isinstance(x, (tuple, list)):
+        return "(" + " ".join([render(a, check) for a in x]) + ")"
+    if isinstance(x, bool) or x is None:
+        raise ValueError(f"no KRF form for {x!r}")
+    if isinstance(x, int):
+        return str(x)
+    if isinstance(x, float):
+        if not math.isfinite(x):
+            raise ValueError(f"no KRF form for {x!r}")
+        return repr(x)
+    raise ValueError(f"no KRF form for {type(x).__name__} {x!r}")
+
+
+def form(*items) -> str:
+    """One top-level form: form("isa", "Sow42", "Dam") -> '(isa Sow42 Dam)'."""
+    return render(items)
+
+
+class KRFWriter:
+    """Accumulates forms for one microtheory and writes them as a .krf file."""
+
+    def __init__(self, path, microtheory: str, header_comment: str = ""):
+        self.path = Path(path)
+        self.microtheory = render(microtheory)
+        self.header_comment = header_comment
+        self.lines: list[str] = []
+        self.count = 0
+
+    def add(self, *items):
+        """Add one form, given as its items: w.add("isa", sid, "Sire")."""
+        self.lines.append(render(items))
+        self.count += 1
+
+    def comment(self, text: str):
+        """Add a ;; comment line."""
+        self.lines.extend(f";; {line}" for line in str(text).splitlines() or [""])
+
+    def blank(self):
+        """Add an empty separator line."""
+        self.lines.append("")
+
+    def write(self) -> int:
+        """Write the file and return the number of forms in it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            if self.header_comment:
+                for line in self.header_comment.strip().split("\n"):
+                    f.write(f";;; {line}\n")
+                f.write("\n")
+            f.write(f"(in-microtheory {self.microtheory})\n\n")
+            for line in self.lines:
+                f.write(line + "\n")
+        return self.count
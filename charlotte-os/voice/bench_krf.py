@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Charlotte Voice Agent — KRF Benchmarks
+========================================
+Times the shared KRF reader and writer round trip against every .krf
+file in the repository, measures resident index memory with every tier
+loaded, and times entity search on synthetic indexes, combined-filter
+queries (first and follow-up pages) and cold tier loading on the real
+corpus, so parser and index changes can be measured. The stream benchmark generates a
+large sounder-shaped fixture and checks that block-wise parsing keeps
+memory flat and yields the same facts as a whole-file parse. The derived
+check merges and unloads tiers one at a time and asserts that the
+incrementally kept primitive resolution equals a full rebuild after each step.
+
+Usage:
+    python bench_krf.py parse [--repeat 5]
+    python bench_krf.py memory
+    python bench_krf.py search [--repeat 5] [--sizes 10000,100000,1000000]
+    python bench_krf.py query [--repeat 5]
+    python bench_krf.py load [--repeat 5] [--workers 1,4]
+    python bench_krf.py stream [--size-mb 1024] [--ingest-mb 16] [--fixture PATH]
+    python bench_krf.py derived [--orders 4]
+"""
+
+import argparse
+import asyncio
+import copy
+import gc
+import os
+import random
+import re
+import resource
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from config import Config
+from tools import krf
+from tools.krf import (_CHARLOTTE_OS, _TIERS, Fact, KRFIndex, _load_tier_sync, parse_krf, read_forms,
+                       stream_krf, tokenize)
+from krf_codec import render
+
+_REPO_ROOT = _CHARLOTTE_OS.parent
+
+
+def _corpus() -> list[tuple[str, str]]:
+    """Read every .krf file in the repository into memory."""
+    texts = []
+    for path in sorted(_REPO_ROOT.rglob("*.krf")):
+        rel = str(path.relative_to(_REPO_ROOT)).replace("\\", "/")
+        texts.append((rel, path.read_text(encoding="utf-8")))
+    return texts
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# ── Legacy reader (line re-join + per-form char scan), kept as baseline ──
+
+def _legacy_strip_comment(line: str) -> str:
+    in_string = False
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if c == '\\' and in_string:
+            i += 2
+            continue
+        if c == '"':
+            in_string = not in_string
+        elif not in_string and line[i:i+2] == ";;":
+            return line[:i]
+        i += 1
+    return line
+
+
+def _legacy_count_parens(text: str, in_string: bool) -> tuple[int, bool]:
+    net = 0
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c == '\\' and in_string:
+            i += 2
+            continue
+        if c == '"':
+            in_string = not in_string
+        elif not in_string:
+            if c == '(':
+                net += 1
+            elif c == ')':
+                net -= 1
+        i += 1
+    return net, in_string
+
+
+def _legacy_tokenize(s: str) -> list:
+    tokens = []
+    stack = [tokens]
+    i = 0
+    n = len(s)
+    while i < n:
+        c = s[i]
+        if c == '(':
+            new = []
+            stack[-1].append(new)
+            stack.append(new)
+            i += 1
+        elif c == ')':
+            if len(stack) > 1:
+                stack.pop()
+            i += 1
+        elif c == '"':
+            j = i + 1
+            while j < n:
+                if s[j] == '\\':
+                    j += 2
+                    continue
+                if s[j] == '"':
+                    break
+                j += 1
+            stack[-1].append(s[i:j+1])
+            i = j + 1
+        elif c in (' ', '\t', '\n', '\r'):
+            i += 1
+        else:
+            j = i
+            while j < n and s[j] not in (' ', '\t', '\n', '\r', '(', ')'):
+                j += 1
+            stack[-1].append(s[i:j])
+            i = j
+    return tokens
+
+
+def _legacy_read(text: str) -> int:
+    forms = 0
+    buf = ""
+    depth = 0
+    in_string = False
+    for line in text.splitlines():
+        cleaned = _legacy_strip_comment(line.rstrip())
+        stripped = cleaned.strip()
+        if not stripped:
+            continue
+        buf += (" " if buf else "") + stripped
+        net, in_string = _legacy_count_parens(cleaned, in_string)
+        depth += net
+        if depth <= 0 and not in_string:
+            _legacy_tokenize(buf)
+            forms += 1
+            buf = ""
+            depth = 0
+            in_string = False
+    return forms
+
+
+def _legacy_search(by_entity, query: str) -> list[str]:
+    """search_entity as a linear scan over every entity name."""
+    if query in by_entity:
+        return [query]
+    query_lower = query.lower()
+    for e in by_entity:
+        if e.lower() == query_lower:
+            return [e]
+    query_norm = re.sub(r'[\s\-_]+', '', query_lower)
+    if len(query_norm) < 3:
+        return []
+    candidates = []
+    for e in by_entity:
+        if len(e) < 3:
+            continue
+        e_norm = re.sub(r'[\s\-_]+', '', e.lower())
+        if query_norm in e_norm:
+            if e_norm == query_norm:
+                score = 0
+            elif e_norm.startswith(query_norm):
+                score = 1 + len(e_norm)
+            else:
+                score = 100 + len(e_norm)
+            candidates.append((score, e))
+    candidates.sort(key=lambda x: x[0])
+    return [e for _, e in candidates[:20]]
+
+
+# ── Benchmarks ───────────────────────────────────────────────────────────
+
+def bench_parse(repeat: int):
+    corpus = _corpus()
+    lines = sum(t.count("\n") for _, t in corpus)
+    print(f"Corpus: {len(corpus)} files, {lines:,} lines under {_REPO_ROOT}")
+
+    legacy = _best_of(lambda: [_legacy_read(t) for _, t in corpus], repeat)
+    reader = _best_of(lambda: [sum(1 for _ in read_forms(t)) for _, t in corpus], repeat)
+    facts = _best_of(lambda: [parse_krf(t, rel) for rel, t in corpus], repeat)
+
+    print(f"  legacy read_sexps+tokenize  {legacy * 1000:8.1f} ms")
+    print(f"  read_forms (single pass)    {reader * 1000:8.1f} ms  ({legacy / reader:.1f}x)")
+    print(f"  parse_krf (forms -> Facts)  {facts * 1000:8.1f} ms")
+
+    # Writer: every form rendered back to text must read back unchanged
+    forms = [f for _, t in corpus for f, _, _, _ in read_forms(t)]
+    written = _best_of(lambda: [render(f) for f in forms], repeat)
+    reread = [f for f, _, _, _ in read_forms("\n".join(render(f) for f in forms))]
+    assert reread == forms, "rendered forms do not read back unchanged"
+    print(f"  render (forms -> text)      {written * 1000:8.1f} ms  ({len(forms):,} forms round-trip)")
+
+
+def bench_memory():
+    Config.KRF_SNAPSHOTS = False  # measure a cold parse, not a snapshot
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    idx = KRFIndex()
+    for tier_name in _TIERS:
+        tier, _ = _load_tier_sync(tier_name)
+        idx.merge(tier)
+        del tier
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"All {len(_TIERS)} tiers: {idx.total_facts:,} facts, {len(idx.by_entity):,} entities")
+    print(f"  resident index  {(current - base) / 2**20:8.2f} MiB")
+    print(f"  peak during load {(peak - base) / 2**20:7.2f} MiB")
+
+
+_NAME_WORDS = (
+    "Sow", "Boar", "Gilt", "Litter", "Farrow", "Wean", "Feed", "Barn", "Pen",
+    "Show", "Breed", "Duroc", "Hampshire", "Yorkshire", "Berkshire", "Sale",
+    "Invoice", "Contact", "Order", "Route", "Signal", "Metric", "Protocol",
+    "Charlotte", "Voice", "Agent", "County", "Fair", "Ledger", "Weight",
+)
+
+
+def _synthetic_names(n: int, seed: int = 7) -> list[str]:
+    """Distinct entity-shaped names: CamelCase, hyphenated and numbered."""
+    rng = random.Random(seed)
+    names = []
+    for i in range(n):
+        words = rng.sample(_NAME_WORDS, rng.randint(1, 3))
+        sep = "-" if rng.random() < 0.2 else ""
+        names.append(f"{sep.join(words)}{sep}{i}")
+    return names
+
+
+def bench_search(repeat: int, sizes: list[int]):
+    queries = ["SowLitter", "sow-litter", "duroc", "FairSale", "charlotte voice",
+               "Invoice12", "zzqx", "Barn-Pen-Show"]
+    print(f"Queries: {', '.join(queries)}, plus one case-insensitive exact hit")
+    for n in sizes:
+        idx = KRFIndex()
+        idx.ingest([Fact("arity", (name,), "BenchMt", "bench.krf", 0)
+                    for name in _synthetic_names(n)])
+        queries_n = queries + [idx.entity_names.names[n // 2].upper()]
+
+        for q in queries_n:
+            assert idx.search_entity(q) == _legacy_search(idx.by_entity, q), q
+
+        legacy = _best_of(lambda: [_legacy_search(idx.by_entity, q) for q in queries_n],
+                          1 if n >= 500_000 else repeat)
+        indexed = _best_of(lambda: [idx.search_entity(q) for q in queries_n], repeat)
+        per_q = len(queries_n)
+        print(f"  {n:>9,} entities  linear {legacy / per_q * 1000:9.2f} ms/query"
+              f"  trigram {indexed / per_q * 1000:7.3f} ms/query  ({legacy / indexed:,.0f}x)")
+
+
+def bench_query(repeat: int):
+    Config.KRF_SNAPSHOTS = False
+    idx = KRFIndex()
+    for tier_name in _TIERS:
+        idx.merge(_load_tier_sync(tier_name)[0])
+    krf._index = idx
+
+    queries = [
+        dict(microtheory="ISGProductCatalogMt", predicate="soldByBrand"),
+        dict(microtheory="ISGProductCatalogMt", predicate="isa"),
+        dict(microtheory="ISGPersonnelMt", attribute="::EMAIL"),
+        dict(microtheory="ISGProductCatalogMt", predicate="hasAttribute", attribute="label"),
+        dict(predicate="comment", microtheory="ISGPersonnelMt"),
+        dict(where="hasCFM between 15 and 20 and hasListPrice < 3000"),
+        dict(search_text="oil-free scroll compressor"),
+    ]
+    print(f"All {len(_TIERS)} tiers: {idx.total_facts:,} facts; limit=1 so formatting stays out of the way")
+    for q in queries:
+        t = _best_of(lambda: [krf._query(limit=1, **q) for _ in range(100)], repeat) / 100
+        print(f"  {t * 1000:7.3f} ms  {q}")
+
+    print("Follow-up pages (limit=1, resuming halfway through via next_cursor)")
+    for q in queries:
+        total = re.search(r"\((\d+) facts\)", krf._query(limit=1, **q))
+        if not total or int(total.group(1)) < 2:
+            continue
+        cursor = None
+        for _ in range(int(total.group(1)) // 2):
+            cursor = re.search(r"^next_cursor: (\S+)$", krf._query(limit=1, cursor=cursor, **q), re.M)
+            if not cursor:
+                break
+            cursor = cursor.group(1)
+        t = _best_of(lambda: [krf._query(limit=1, cursor=cursor, **q) for _ in range(100)], repeat) / 100
+        print(f"  {t * 1000:7.3f} ms  {q}")
+
+
+def bench_load(repeat: int, workers_list: list[int]):
+    Config.KRF_SNAPSHOTS = False  # cold parse every time
+
+    async def load_all():
+        await krf.init_krf_index()
+        for name, cfg in _TIERS.items():
+            if not cfg["auto"]:
+                await krf.load_domain(name)
+
+    print(f"Cold loads, best of {repeat}")
+    for workers in workers_list:
+        Config.KRF_LOAD_WORKERS = workers
+        startup = _best_of(lambda: asyncio.run(krf.init_krf_index()), repeat)
+        everything = _best_of(lambda: asyncio.run(load_all()), repeat)
+        print(f"  {workers} worker(s)  startup (auto tiers) {startup * 1000:7.1f} ms"
+              f"  all tiers {everything * 1000:7.1f} ms")
+
+
+_BREEDS = ("Duroc", "Hampshire", "Yorkshire", "Berkshire", "Landrace", "ChesterWhite", "SpottedSwine")
+
+
+def _write_fixture(path: Path, size_mb: int, seed: int = 11):
+    """Write about size_mb of animal/pedigree KRF shaped like the sounder converter output."""
+    rng = random.Random(seed)
+    target = size_mb << 20
+    written = 0
+    i = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(";;; Synthetic registered animals (bench_krf.py stream)\n\n(in-microtheory SounderAnimalsMt)\n\n")
+        while written < target:
+            block = [f";; batch {i // 1000} (animals {i}..{i + 999})"]
+            for i in range(i, i + 1000):
+                aid = f"ANIMAL-{i}"
+                name = rng.choice(_NAME_WORDS) + (' \\"Big\\" ' if i % 97 == 0 else " ") + str(i)
+                block += [
+                    f"(isa {aid} SwineAnimal)",
+                    f'(hasRegistrationNumber {aid} "{rng.randint(100000, 999999)}-{i}")',
+                    f"(hasBreed {aid} {rng.choice(_BREEDS)})",
+                    f'(hasShortName {aid} "{name}")',
+                    f'(bornOn {aid} "{rng.randint(2010, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")',
+                    f"(hasBirthWeight {aid} {rng.uniform(1.5, 4.5):.2f})",
+                ]
+                if i:
+                    block.append(f"(sireOf ANIMAL-{rng.randrange(i)} {aid})")
+                if i % 501 == 0:
+                    block.append(f'(comment {aid} "Pedigree note;; see the\n    {rng.choice(_BREEDS)} herd book (p. {i % 300})")')
+            i += 1
+            text = "\n".join(block) + "\n"
+            f.write(text)
+            written += len(text)
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_stream(size_mb: int, ingest_mb: int, fixture: str | None):
+    path = Path(fixture) if fixture else Path(tempfile.gettempdir()) / f"krf-stream-{size_mb}mb.krf"
+    if not path.exists():
+        t0 = time.perf_counter()
+        _write_fixture(path, size_mb)
+        print(f"Wrote {path} in {time.perf_counter() - t0:.1f} s")
+    rel = os.path.relpath(path, _CHARLOTTE_OS)
+    size = path.stat().st_size
+
+    # Block-wise parse of the whole fixture: resident memory must not track file size
+    gc.collect()
+    before = krf._rss_bytes() / 2**20
+    facts = 0
+    samples = []
+    t0 = time.perf_counter()
+    for batch in stream_krf(path, rel):
+        facts += len(batch)
+        samples.append(batch[len(batch) // 2])
+    elapsed = time.perf_counter() - t0
+    print(f"{path.name}: {size / 2**20:,.0f} MiB, {facts:,} facts")
+    print(f"  stream_krf        {elapsed:8.1f} s  {size / 2**20 / elapsed:6.1f} MiB/s"
+          f"  peak RSS +{_peak_rss_mb() - before:,.1f} MiB")
+
+    # Offsets stay valid across blocks: raw text re-read from seek marks re-parses to the same fact
+    for fact in samples[::max(1, len(samples) // 20)]:
+        assert tokenize(fact.raw) == (fact.predicate,) + fact.args, fact
+    print(f"  raw text of {len(samples[::max(1, len(samples) // 20)])} sampled facts re-parses identically")
+
+    # Whole-file vs streamed ingest of a prefix small enough to index here
+    head = Path(tempfile.gettempdir()) / f"krf-stream-{ingest_mb}mb.krf"
+    if not head.exists():
+        _write_fixture(head, ingest_mb)
+    head_rel = os.path.relpath(head, _CHARLOTTE_OS)
+    results = {}
+    for mode in ("whole", "stream"):
+        gc.collect()
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        idx = KRFIndex()
+        if mode == "whole":
+            idx.ingest(parse_krf(head.read_text(encoding="utf-8"), head_rel))
+        else:
+            for batch in stream_krf(head, head_rel):
+                idx.ingest(batch)
+        elapsed = time.perf_counter() - t0
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[mode] = idx
+        print(f"  {mode:6} ingest of {head.stat().st_size / 2**20:,.0f} MiB  {elapsed:6.1f} s"
+              f"  index {(current - base) / 2**20:7.1f} MiB  peak {(peak - base) / 2**20:7.1f} MiB")
+    whole, streamed = results["whole"], results["stream"]
+    assert list(whole.fact_args) == list(streamed.fact_args)
+    assert list(whole.fact_line) == list(streamed.fact_line)
+    assert list(whole.fact_start) == list(streamed.fact_start)
+    assert {p: list(c.values) for p, c in whole.numeric.items()} == \
+           {p: list(c.values) for p, c in streamed.numeric.items()}
+    print(f"  both ingests hold the same {whole.total_facts:,} facts")
+
+
+def _derived_state(idx: KRFIndex) -> tuple:
+    """Primitive resolution of an index, without the empty entries either path may leave."""
+    return ({coll: sups for coll, sups in idx.genls_closure.items() if sups},
+            dict(idx.coll_to_primitive),
+            dict(idx.entity_primitive),
+            {prim: ents for prim, ents in idx.by_primitive.items() if ents})
+
+
+def _check_derived(idx: KRFIndex, step: str) -> float:
+    """Assert idx's incremental resolution equals a full rebuild. Returns the rebuild time."""
+    ref = copy.copy(idx)  # build_derived_indices rebinds every map it derives
+    t0 = time.perf_counter()
+    ref.build_derived_indices()
+    elapsed = time.perf_counter() - t0
+    names = ("genls_closure", "coll_to_primitive", "entity_primitive", "by_primitive")
+    for name, mine, full in zip(names, _derived_state(idx), _derived_state(ref)):
+        assert mine == full, f"{name} differs from a full rebuild after {step}"
+    return elapsed
+
+
+def bench_derived(orders: int):
+    Config.KRF_SNAPSHOTS = False
+    tiers = {name: _load_tier_sync(name)[0] for name in _TIERS}
+    rng = random.Random(5)
+    sequences = [list(tiers)] + [rng.sample(list(tiers), len(tiers)) for _ in range(orders - 1)]
+    print(f"{len(tiers)} tiers, {len(sequences)} merge orders; "
+          "resolution checked against build_derived_indices() after every merge and unload")
+    merge_s = unload_s = rebuild_s = 0.0
+    steps = 0
+    for order in sequences:
+        idx = KRFIndex()
+        for name in order:
+            t0 = time.perf_counter()
+            idx.merge(tiers[name], name)
+            merge_s += time.perf_counter() - t0
+            rebuild_s += _check_derived(idx, f"merging {name} (order {order})")
+            steps += 1
+        for name in rng.sample(order, len(order)):
+            t0 = time.perf_counter()
+            idx.unload(name)
+            unload_s += time.perf_counter() - t0
+            rebuild_s += _check_derived(idx, f"unloading {name} (order {order})")
+            steps += 1
+        assert not _derived_state(idx)[2], "entities left typed after unloading every tier"
+    merges = steps // 2
+    print(f"  {steps} steps identical to a full rebuild")
+    print(f"  merge  {merge_s / merges * 1000:7.1f} ms/tier   unload {unload_s / merges * 1000:7.1f} ms/tier"
+          f"   full rebuild {rebuild_s / steps * 1000:7.1f} ms/step")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Charlotte KRF benchmarks")
+    parser.add_argument("bench", choices=["parse", "memory", "search", "query", "load", "stream", "derived"],
+                        help="Benchmark to run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Entity counts for the search benchmark")
+    parser.add_argument("--workers", default="1,4",
+                        help="KRF_LOAD_WORKERS values for the load benchmark")
+    parser.add_argument("--size-mb", type=int, default=1024, help="Fixture size for the stream benchmark")
+    parser.add_argument("--ingest-mb", type=int, default=16,
+                        help="Fixture size indexed both whole and streamed by the stream benchmark")
+    parser.add_argument("--fixture", help="Existing .krf file for the stream benchmark (default: generated)")
+    parser.add_argument("--orders", type=int, default=4,
+                        help="Tier merge orders for the derived check (declared order, then shuffled)")
+    args = parser.parse_args()
+
+    if args.bench == "parse":
+        bench_parse(args.repeat)
+    elif args.bench == "memory":
+        bench_memory()
+    elif args.bench == "search":
+        bench_search(args.repeat, [int(n) for n in args.sizes.split(",")])
+    elif args.bench == "query":
+        bench_query(args.repeat)
+    elif args.bench == "load":
+        bench_load(args.repeat, [int(n) for n in args.workers.split(",")])
+    elif args.bench == "stream":
+        bench_stream(args.size_mb, args.ingest_mb, args.fixture)
+    elif args.bench == "derived":
+        bench_derived(args.orders)
+
+
+if __name__ == "__main__":
+    main()
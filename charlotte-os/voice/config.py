@@ -24,8 +24,10 @@ def _load_dotenv(path: Path) -> None:
                 os.environ[key] = value
 
 
+_VOICE_DIR = Path(__file__).resolve().parent
+
 # Load .env from voice/ directory, then home directory fallback
-_load_dotenv(Path(__file__).parent / ".env")
+_load_dotenv(_VOICE_DIR / ".env")
 _load_dotenv(Path.home() / "charlotte" / "voice" / ".env")
 
 
@@ -70,6 +72,21 @@ class Config:
     SESSION_EXPIRY_HOURS: int = int(os.getenv("SESSION_EXPIRY_HOURS", "72"))
     SESSION_CONTEXT_MESSAGES: int = int(os.getenv("SESSION_CONTEXT_MESSAGES", "50"))
 
+    # KRF index
+    KRF_SNAPSHOTS: bool = os.getenv("KRF_SNAPSHOTS", "true").lower() in ("1", "true", "yes")
+    KRF_SNAPSHOT_DIR: str = str(_VOICE_DIR / os.getenv("KRF_SNAPSHOT_DIR", "krf-cache"))  # relative to voice/
+    KRF_LOAD_WORKERS: int = int(os.getenv("KRF_LOAD_WORKERS", str(min(4, os.cpu_count() or 1))))
+    KRF_STREAM_MIN_MB: int = int(os.getenv("KRF_STREAM_MIN_MB", "32"))
+    KRF_MAX_RSS_MB: int = int(os.getenv("KRF_MAX_RSS_MB", "768"))
+    KRF_QUERY_CACHE_SIZE: int = int(os.getenv("KRF_QUERY_CACHE_SIZE", "256"))
+    KRF_PREFETCH: bool = os.getenv("KRF_PREFETCH", "true").lower() in ("1", "true", "yes")
+    KRF_PREFETCH_MIN_HITS: int = int(os.getenv("KRF_PREFETCH_MIN_HITS", "1"))
+    KRF_PREFETCH_MAX_RSS_MB: int = int(os.getenv("KRF_PREFETCH_MAX_RSS_MB", "512"))
+    KRF_RULES: bool = os.getenv("KRF_RULES", "true").lower() in ("1", "true", "yes")
+    KRF_RULES_MAX_DERIVED: int = int(os.getenv("KRF_RULES_MAX_DERIVED", "100000"))
+    KRF_WATCH: bool = os.getenv("KRF_WATCH", "true").lower() in ("1", "true", "yes")
+    KRF_WATCH_POLL_S: float = float(os.getenv("KRF_WATCH_POLL_S", "2.0"))
+
     # Security
     APP_AUTH_TOKEN: str = os.getenv("APP_AUTH_TOKEN", "")
     ALLOWED_PATHS: list = [
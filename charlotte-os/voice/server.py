@@ -40,7 +40,8 @@ from deepgram_client import DeepgramStreamer, DemoDeepgramStreamer
 from elevenlabs_client import ElevenLabsTTS, DemoElevenLabsTTS
 from twilio_handler import handle_voice_webhook, TwilioMediaStream, generate_sms_twiml, validate_twilio_signature
 from tools.notes import set_store as set_notes_store
-from tools.krf import init_krf_index
+from tools.krf import (init_krf_index, prefetch_for_text, prefetch_stats, query_cache_stats, rules_stats,
+                       start_krf_watcher, stop_krf_watcher, watch_stats)
 
 log = logging.getLogger("charlotte.voice")
 
@@ -66,9 +67,10 @@ async def handle_twilio_media(request: web.Request) -> web.WebSocketResponse:
     current_task = None
 
     async def on_transcript(text: str, is_final: bool):
-        """Transcript events — for logging. Processing is triggered by turn events."""
+        """Transcript events — for logging and KRF prefetch. Processing is triggered by turn events."""
         if is_final and text.strip():
             log.info("STT [twilio]: %s", text)
+            prefetch_for_text(text)
 
     async def on_utterance(text: str):
         """Confirmed end of turn — fire the agent."""
@@ -618,6 +620,7 @@ async def handle_twilio_sms(request: web.Request) -> web.Response:
     sender = post_data.get("From", "unknown")
     body = post_data.get("Body", "").strip()
     log.info("Incoming SMS from %s: %s", sender, body[:200])
+    prefetch_for_text(body)
 
     if not body:
         twiml = generate_sms_twiml("I received an empty message. Send me some text and I'll respond.")
@@ -739,6 +742,7 @@ async def handle_app_ws(request: web.Request) -> web.WebSocketResponse:
     async def on_transcript(text: str, is_final: bool):
         await ws.send_json({"type": "transcript", "text": text, "is_final": is_final})
         if is_final and text.strip():
+            prefetch_for_text(text)
             await process_app_utterance(text)
 
     async def process_app_utterance(text: str):
@@ -868,6 +872,10 @@ async def handle_health(request: web.Request) -> web.Response:
         "status": "ok",
         "mode": "demo" if Config.DEMO else "live",
         "uptime": time.time() - _start_time,
+        "krf_prefetch": prefetch_stats(),
+        "krf_query_cache": query_cache_stats(),
+        "krf_rules": rules_stats(),
+        "krf_watch": watch_stats(),
     })
 
 
@@ -906,6 +914,7 @@ async def on_startup(app: web.Application):
     await store.init()
     set_notes_store(store)
     await init_krf_index()
+    start_krf_watcher()
     agent = ClaudeAgent()
     log.info("Charlotte Voice Agent started")
     log.info(Config.log_status())
@@ -916,6 +925,7 @@ async def on_startup(app: web.Application):
 
 async def on_shutdown(app: web.Application):
     """Cleanup on server shutdown."""
+    await stop_krf_watcher()
     if store:
         await store.close()
     log.info("Charlotte Voice Agent stopped")
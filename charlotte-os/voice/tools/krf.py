@@ -2,23 +2,61 @@
 Charlotte Voice Agent — KRF Parser & Query Tools
 ===================================================
 Substrate reader: loads KRF files at startup, builds an in-memory
-inverted index, and exposes three tools for Claude agents to query
+inverted index, and exposes four tools for Claude agents to query
 the knowledge graph without reading raw files.
 
 Components:
-  1. Tokenizer + parser (escaped-quote-safe, line-tracking)
-  2. Fact dataclass
-  3. KRFIndex — six dict-based indices for O(1) primary lookup
-  4. Tiered loader — auto-load core/knowledge, on-demand domains
-  5. Three tool definitions: query_krf, list_microtheories, load_domain
+  1. Single-pass reader (escaped-quote-safe, line-tracking), also fed
+     block by block for files too large to read whole — from the shared
+     codec in charlotte-os/krf_codec.py
+  2. Fact dataclass (lazy raw text from source offsets), also from the
+     codec, plus the loader's worker-process row form
+  3. KRFIndex — columnar fact store + array-backed posting lists,
+     sorted value columns for numeric predicates, and a full-text
+     term index over quoted strings
+  4. Tiered loader — auto-load core/knowledge, on-demand domains,
+     per-tier binary snapshots so warm starts skip parsing,
+     memory-mapped per-entity profile summaries beside them,
+     batched streaming ingest of large files, and hot reload that
+     splices edited files of loaded tiers into the live index
+  5. Forward-chaining rules — semi-naive materialization of implies
+     consequences into a separate derived layer
+  6. Predictive prefetch of on-demand tiers from conversation text
+  7. Query engine, plus bounded graph traversal over a CSR adjacency
+  8. Four tool definitions: query_krf, traverse_krf, list_microtheories,
+     load_domain
 """
 
 import asyncio
+import base64
+import copy
+import ctypes
+import hashlib
+import heapq
+import json
 import logging
+import math
+import mmap
+import operator
+import os
+import pickle
 import re
-from collections import defaultdict
-from dataclasses import dataclass, field
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Container, Iterable, Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, count, islice
 from pathlib import Path
+from sys import intern
+
+from config import Config
 
 log = logging.getLogger("charlotte.tools.krf")
 
@@ -27,202 +65,40 @@ log = logging.getLogger("charlotte.tools.krf")
 # charlotte-os/ is two levels up from voice/tools/
 _CHARLOTTE_OS = Path(__file__).resolve().parent.parent.parent
 
-# Type alias for parsed S-expressions
-SExpr = str | list  # Atom or nested list
-
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 1. TOKENIZER + PARSER
+# 1. READER
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _strip_comment(line: str) -> str:
-    """Remove ;; comments from a line, respecting quoted strings."""
-    in_string = False
-    i = 0
-    while i < len(line):
-        c = line[i]
-        if c == '\\' and in_string:
-            i += 2  # skip escaped char inside string
-            continue
-        if c == '"':
-            in_string = not in_string
-        elif not in_string and i + 1 < len(line) and line[i:i+2] == ";;":
-            return line[:i]
-        i += 1
-    return line
-
-
-def _count_parens(text: str, in_string: bool = False) -> tuple[int, bool]:
-    """Count net parentheses (open - close) outside quoted strings.
-
-    Handles escaped quotes inside strings. Returns (net, in_string).
-    """
-    net = 0
-    i = 0
-    while i < len(text):
-        c = text[i]
-        if c == '\\' and in_string:
-            i += 2
-            continue
-        if c == '"':
-            in_string = not in_string
-        elif not in_string:
-            if c == '(':
-                net += 1
-            elif c == ')':
-                net -= 1
-        i += 1
-    return net, in_string
-
-
-def read_sexps(text: str) -> list[tuple[str, int]]:
-    """Parse text into complete S-expressions with line numbers.
-
-    Returns list of (raw_sexp_string, start_line_number) tuples.
-    Line numbers are 1-based.
-    """
-    results = []
-    buf = ""
-    depth = 0
-    in_string = False
-    start_line = 0
-
-    for line_no, line in enumerate(text.splitlines(), 1):
-        cleaned = _strip_comment(line.rstrip())
-        stripped = cleaned.strip()
-        if not stripped:
-            continue
-
-        if not buf:
-            start_line = line_no
-        buf += (" " if buf else "") + stripped
-
-        net, in_string = _count_parens(cleaned, in_string)
-        depth += net
-
-        if depth <= 0 and not in_string and buf.strip():
-            results.append((buf.strip(), start_line))
-            buf = ""
-            depth = 0
-            in_string = False
-
-    # Flush remainder (malformed — shouldn't happen in well-formed KRF)
-    if buf.strip():
-        results.append((buf.strip(), start_line))
-
-    return results
-
-
-def tokenize(sexp: str) -> SExpr:
-    """Tokenize an S-expression string into a nested list structure.
-
-    Handles escaped quotes inside strings (char-by-char scan).
-    '(isa X "a \\"thing\\"")' -> ['isa', 'X', '"a \\"thing\\""']
-    """
-    tokens = []
-    stack = [tokens]
-    i = 0
-    s = sexp.strip()
-    n = len(s)
-
-    while i < n:
-        c = s[i]
-        if c == '(':
-            new = []
-            stack[-1].append(new)
-            stack.append(new)
-            i += 1
-        elif c == ')':
-            if len(stack) > 1:
-                stack.pop()
-            i += 1
-        elif c == '"':
-            # Scan for closing quote, handling escapes
-            j = i + 1
-            while j < n:
-                if s[j] == '\\':
-                    j += 2  # skip escaped char
-                    continue
-                if s[j] == '"':
-                    break
-                j += 1
-            stack[-1].append(s[i:j+1])
-            i = j + 1
-        elif c in (' ', '\t', '\n', '\r'):
-            i += 1
-        else:
-            # Atom — read until whitespace or paren
-            j = i
-            while j < n and s[j] not in (' ', '\t', '\n', '\r', '(', ')'):
-                j += 1
-            stack[-1].append(s[i:j])
-            i = j
-
-    # Unwrap single top-level list
-    if len(tokens) == 1 and isinstance(tokens[0], list):
-        return tokens[0]
-    return tokens
+# The reader, Fact and writer live in charlotte-os/krf_codec.py, shared with
+# compile-manifest.py and the KRF converters so every tool parses KRF the
+# same way. Names are re-exported here for existing imports.
+if str(_CHARLOTTE_OS) not in sys.path:
+    sys.path.append(str(_CHARLOTTE_OS))
 
-
-def _unquote(s: str) -> str:
-    """Strip surrounding quotes and unescape interior."""
-    if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
-        return s[1:-1].replace('\\"', '"').replace('\\\\', '\\')
-    return s
+from krf_codec import (STREAM_BATCH_FACTS, TOKEN_RE, Fact, SExpr, batched, decode_source, freeze,  # noqa: E402
+                       parse_krf, read_forms, read_forms_chunked, render, stream_krf, tokenize, unquote)
+import krf_codec  # noqa: E402
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 2. FACT DATACLASS
+# 2. FACTS
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass(slots=True)
-class Fact:
-    predicate: str          # "isa", "hasAttribute", "implies", etc.
-    args: list              # Remaining arguments (SExpr items)
-    microtheory: str        # Scoping context
-    source_file: str        # Relative path from charlotte-os/
-    line_hint: int          # Approximate line number
-    raw: str                # Original S-expression text
-
-
-def parse_krf(text: str, source_file: str) -> list[Fact]:
-    """Parse KRF text into Fact objects.
+def _parse_rows(text: str, source_file: str) -> list[tuple]:
+    """parse_krf for a worker process: facts as plain tuples, cheap to pickle.
 
-    Tracks in-microtheory declarations to scope subsequent facts.
-    Skips malformed S-expressions with a warning.
+    Rows are (predicate, args, microtheory, line, start, end).
     """
-    facts = []
-    current_mt = "UnknownMt"
+    return [(f.predicate, f.args, f.microtheory, f.line_hint, f.start, f.end)
+            for f in parse_krf(text, source_file)]
 
-    for raw, line_no in read_sexps(text):
-        try:
-            parsed = tokenize(raw)
-        except Exception as e:
-            log.warning("Parse error in %s:%d — %s", source_file, line_no, e)
-            continue
 
-        if not parsed or not isinstance(parsed, list) or len(parsed) == 0:
-            continue
-
-        pred = parsed[0]
-        if not isinstance(pred, str):
-            continue
-
-        # Track microtheory
-        if pred == "in-microtheory" and len(parsed) >= 2:
-            current_mt = parsed[1] if isinstance(parsed[1], str) else str(parsed[1])
-            continue
-
-        facts.append(Fact(
-            predicate=pred,
-            args=parsed[1:],
-            microtheory=current_mt,
-            source_file=source_file,
-            line_hint=line_no,
-            raw=raw,
-        ))
-
-    return facts
+def _facts_from_rows(rows: list[tuple], source_file: str) -> list[Fact]:
+    """Rebuild Facts from _parse_rows output, re-interning in this process."""
+    source_file = intern(source_file)
+    return [Fact(intern(pred), freeze(args), intern(mt), source_file, line, start, end)
+            for pred, args, mt, line, start, end in rows]
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -238,149 +114,1044 @@ _META_PREDICATES = frozenset({
     "mapsToKnowledgeType", "canTransition",
 })
 
+# Primitive types in resolution precedence: an entity typed under two
+# primitives resolves to the earlier one
+_PRIMITIVES = ("NODE", "EDGE", "METRIC", "SIGNAL", "PROTOCOL")
+_PRIMITIVE_RANK = {p: i for i, p in enumerate(_PRIMITIVES)}
 
-def _extract_entities(args: list) -> list[str]:
+
+def _extract_entities(args: tuple) -> list[str]:
     """Extract entity names (strings that look like identifiers) from args."""
     entities = []
     for a in args:
         if isinstance(a, str) and not a.startswith("?") and not a.startswith('"'):
             entities.append(a)
-        elif isinstance(a, list):
+        elif isinstance(a, tuple):
             entities.extend(_extract_entities(a))
     return entities
 
 
+def _edge_targets(args: tuple) -> list[str]:
+    """Distinct entity targets of an edge fact: its atom args after the first."""
+    return list(dict.fromkeys(a for a in args[1:]
+                              if isinstance(a, str) and not a.startswith("?") and not a.startswith('"')))
+
+
+def _normalize_phone(raw: str) -> str | None:
+    """E.164 form of a phone number, assuming +1 when the country code is missing."""
+    digits = re.sub(r'\D', '', raw)
+    if raw.lstrip().startswith("+"):
+        return f"+{digits}" if 8 <= len(digits) <= 15 else None
+    if len(digits) == 10:
+        return f"+1{digits}"
+    if len(digits) == 11 and digits.startswith("1"):
+        return f"+{digits}"
+    return None
+
+
+def _normalize_email(raw: str) -> str | None:
+    email = raw.strip().lower()
+    return email if "@" in email else None
+
+
+# Index generations are unique across KRFIndex instances, so a cache keyed
+# on one can never confuse a rebuilt index with the one it replaced
+_generations = count(1)
+
+# Contact attributes kept in the by_contact reverse index
+_CONTACT_NORMALIZERS = {"::PHONE": _normalize_phone, "::EMAIL": _normalize_email}
+
+
+def _attribute_triple(args: tuple) -> tuple[str, str, str] | None:
+    """(entity, attribute, unquoted value) of hasAttribute args, if well-formed."""
+    if len(args) < 3 or not isinstance(args[0], str) or not isinstance(args[1], str):
+        return None
+    val = args[2] if isinstance(args[2], str) else str(args[2])
+    return args[0], args[1], unquote(val)
+
+
+def _new_attr_map() -> defaultdict:
+    """Per-entity attribute map factory (module-level so snapshots can pickle it)."""
+    return defaultdict(list)
+
+
+# Separators ignored by fuzzy entity-name matching
+_NAME_SEP_RE = re.compile(r'[\s\-_]+')
+
+
+def _intersect_sorted(postings: list[Sequence[int]]) -> Sequence[int]:
+    """Intersect ascending ID lists, smallest first. Result stays ascending."""
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not result:
+            break
+        kept = []
+        lo, n = 0, len(other)
+        for i in result:
+            lo = bisect_left(other, i, lo)
+            if lo == n:
+                break
+            if other[lo] == i:
+                kept.append(i)
+        result = kept
+    return result
+
+
+def _new_counts() -> array:
+    """Term counts parallel to a by_term posting list."""
+    return array("H")
+
+
+# Full-text terms: lowercase alphanumeric runs, with a plural "s" dropped
+# so "compressors" finds "compressor". _words splits like _TERM_RE, but
+# with a byte translate instead of a regex scan, which ingest needs.
+_TERM_RE = re.compile(r'[a-z0-9]+')
+_WORD_BYTES = bytes(c if 48 <= c <= 57 or 97 <= c <= 122 else 32 for c in range(256))
+
+
+def _words(text: str) -> list[str]:
+    return text.lower().encode("ascii", "replace").translate(_WORD_BYTES).decode("ascii").split()
+
+
+def _stem(word: str) -> str:
+    return word[:-1] if len(word) > 4 and word[-1] == "s" and word[-2] != "s" else word
+
+
+_stems: dict[str, str] = {}  # word -> term; the vocabulary is small enough to keep
+
+
+def _text_terms(text: str) -> list[str]:
+    stems = _stems
+    return [stems.get(w) or stems.setdefault(w, _stem(w)) for w in _words(text)]
+
+
+def _fact_text(args: tuple) -> str:
+    """The quoted string args of a fact, unquoted: what full-text search sees."""
+    return " ".join(unquote(a) for a in args if isinstance(a, str) and a.startswith('"'))
+
+
+def _new_postings() -> array:
+    """Posting list of fact IDs. IDs are assigned in ingest order, so every
+    posting list is ascending without sorting."""
+    return array("I")
+
+
+def _postings_after(postings: Sequence[int], fid: int) -> Iterator[int]:
+    """The IDs of an ascending posting list past `fid`, without copying it."""
+    if isinstance(postings, _MergedPostings):
+        return postings.after(fid)
+    return map(postings.__getitem__, range(bisect_right(postings, fid), len(postings)))
+
+
+class _MergedPostings:
+    """Disjoint ascending posting lists read as one, merged lazily."""
+
+    __slots__ = ("parts", "size")
+
+    def __init__(self, parts: list[Sequence[int]]):
+        self.parts = parts
+        self.size = sum(map(len, parts))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        return heapq.merge(*self.parts)
+
+    def __contains__(self, fid: int) -> bool:
+        for part in self.parts:
+            i = bisect_left(part, fid)
+            if i < len(part) and part[i] == fid:
+                return True
+        return False
+
+    def after(self, fid: int) -> Iterator[int]:
+        return heapq.merge(*(_postings_after(part, fid) for part in self.parts))
+
+
+# Bare numeric literals (no units, separators or %) get a typed index
+_NUMERIC_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+def _numeric_value(atom) -> float | None:
+    return float(atom) if isinstance(atom, str) and _NUMERIC_RE.fullmatch(atom) else None
+
+
+class _NumericColumn:
+    """(value, fact ID) pairs of one numeric predicate, ascending by value.
+
+    Values and fact IDs are parallel arrays, so a range lookup is two
+    bisects on `values` and a slice of `fids`.
+    """
+
+    __slots__ = ("values", "fids")
+
+    def __init__(self):
+        self.values = array("d")
+        self.fids = array("I")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, pairs: Iterable[tuple[float, int]]):
+        """Fold (value, fact ID) pairs in, keeping the arrays sorted.
+
+        A small batch (a streamed ingest adds one per block) is spliced in
+        by bisection instead of re-sorting the column.
+        """
+        new = sorted(pairs)
+        values, fids = self.values, self.fids
+        if len(new) * 16 >= len(values):
+            merged = sorted(chain(zip(values, fids), new))
+            self.values = array("d", (v for v, _ in merged))
+            self.fids = array("I", (f for _, f in merged))
+            return
+        out_values, out_fids = array("d"), array("I")
+        prev = 0
+        for v, f in new:
+            i = bisect_right(values, v, prev)
+            while i > prev and values[i - 1] == v and fids[i - 1] > f:
+                i -= 1  # ties are ordered by fact ID
+            out_values += values[prev:i]
+            out_fids += fids[prev:i]
+            out_values.append(v)
+            out_fids.append(f)
+            prev = i
+        out_values += values[prev:]
+        out_fids += fids[prev:]
+        self.values, self.fids = out_values, out_fids
+
+    def range(self, lo: float, hi: float, lo_open: bool = False, hi_open: bool = False) -> slice:
+        """Positions of the values within [lo, hi], either end optionally open."""
+        values = self.values
+        i = bisect_right(values, lo) if lo_open else bisect_left(values, lo)
+        j = bisect_left(values, hi) if hi_open else bisect_right(values, hi)
+        return slice(i, max(i, j))
+
+
+class _SymbolTable:
+    """Interns symbol strings to dense integer IDs."""
+
+    __slots__ = ("ids", "names")
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def intern(self, name: str) -> int:
+        sid = self.ids.get(name)
+        if sid is None:
+            sid = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return sid
+
+    def __getstate__(self):
+        return self.names
+
+    def __setstate__(self, names):
+        self.names = names
+        self.ids = {n: i for i, n in enumerate(names)}
+
+
+class _NameIndex:
+    """Case-insensitive lookup over a growing set of names.
+
+    Keeps a lowercase alias map for exact matches and trigram postings
+    over each name lowercased with separators stripped, for substring
+    candidates and "did you mean" suggestions. Name IDs follow add() order.
+    """
+
+    __slots__ = ("names", "norms", "lower", "trigrams")
+
+    def __init__(self):
+        self.names: list[str] = []
+        self.norms: list[str] = []                 # lowercased, separators stripped
+        self.lower: dict[str, str] = {}            # lowercase -> first name seen
+        self.trigrams: dict[str, array] = defaultdict(_new_postings)  # -> name IDs
+
+    def add(self, name: str):
+        nid = len(self.names)
+        self.names.append(name)
+        lower = name.lower()
+        self.lower.setdefault(lower, name)
+        norm = _NAME_SEP_RE.sub('', lower)
+        self.norms.append(norm)
+        if len(name) >= 3:  # tiny keys like "or", "an" never fuzzy-match
+            for gram in {norm[i:i + 3] for i in range(len(norm) - 2)}:
+                self.trigrams[gram].append(nid)
+
+    def candidates(self, norm: str) -> Sequence[int]:
+        """Ascending IDs of names holding every trigram of `norm` (len >= 3)."""
+        postings = [self.trigrams.get(norm[i:i + 3]) for i in range(len(norm) - 2)]
+        if not all(postings):
+            return ()
+        return _intersect_sorted(postings)
+
+    def similar(self, query: str, n: int = 3) -> list[str]:
+        """Names sharing the most trigrams with `query`, best first."""
+        norm = _NAME_SEP_RE.sub('', query.lower())
+        grams = {norm[i:i + 3] for i in range(len(norm) - 2)}
+        shared: dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for nid in self.trigrams.get(gram, ()):
+                shared[nid] += 1
+        # Jaccard similarity of trigram sets
+        scored = []
+        for nid, common in shared.items():
+            jaccard = common / (len(grams) + len(self.norms[nid]) - 2 - common)
+            if jaccard >= 0.3:
+                scored.append((-jaccard, nid))
+        scored.sort()
+        return [self.names[nid] for _, nid in scored[:n]]
+
+
+def _copy_state(value):
+    """Copy index state one container at a time.
+
+    Unlike a pickle round trip (one long C call), the per-key Python loop
+    lets the interpreter switch threads, so a copy taken in a worker
+    thread doesn't stall the event loop. Tuples and strings are shared.
+    """
+    if isinstance(value, dict):
+        out = value.copy()                  # keeps a defaultdict's factory
+        for key, item in out.items():
+            if not isinstance(item, (str, int, float, tuple)):
+                out[key] = _copy_state(item)
+        return out
+    if isinstance(value, array):
+        return value[:]
+    if isinstance(value, (list, set)):
+        return value.copy()
+    slots = getattr(type(value), "__slots__", None)
+    if slots is not None:
+        out = type(value).__new__(type(value))
+        for name in slots:
+            setattr(out, name, _copy_state(getattr(value, name)))
+        return out
+    if hasattr(value, "__dict__"):
+        out = type(value).__new__(type(value))
+        out.__dict__.update({name: _copy_state(item) for name, item in vars(value).items()})
+        return out
+    return value
+
+
 class KRFIndex:
-    """In-memory inverted index over parsed KRF facts."""
+    """In-memory inverted index over parsed KRF facts.
+
+    Facts live in a columnar store: a fact ID is a row number, predicate,
+    microtheory and source file are symbol IDs in `array` columns, and
+    args are nested tuples of interned atoms. Every posting list is an
+    ascending `array("I")` of fact IDs; use fact() to materialize a row.
+    """
 
     def __init__(self):
-        # Primary indices
-        self.by_entity: dict[str, list[Fact]] = defaultdict(list)
-        self.by_predicate: dict[str, list[Fact]] = defaultdict(list)
-        self.by_microtheory: dict[str, list[Fact]] = defaultdict(list)
+        # Columnar fact store (row = fact ID)
+        self.symbols = _SymbolTable()       # predicates, microtheories, source files
+        self.fact_pred = array("I")
+        self.fact_mt = array("I")
+        self.fact_file = array("I")
+        self.fact_line = array("I")
+        self.fact_start = array("I")        # char offsets into the source file,
+        self.fact_end = array("I")          # so raw text is re-read lazily
+        self.fact_terms = array("I")        # full-text length: terms in the quoted args
+        self.fact_args: list[tuple] = []
+
+        # Primary indices (posting lists of fact IDs)
+        self.by_entity: dict[str, array] = defaultdict(_new_postings)
+        self.by_predicate: dict[str, array] = defaultdict(_new_postings)
+        self.by_microtheory: dict[str, array] = defaultdict(_new_postings)
+        self.by_file: dict[str, array] = defaultdict(_new_postings)
+        self.by_attribute: dict[str, array] = defaultdict(_new_postings)  # ::PHONE -> hasAttribute facts
         self.by_primitive: dict[str, set[str]] = defaultdict(set)  # NODE -> {entities}
-        self.attributes: dict[str, dict[str, list[str]]] = defaultdict(lambda: defaultdict(list))
-        self.edges_from: dict[str, list[tuple[str, list]]] = defaultdict(list)
-        self.edges_to: dict[str, list[tuple[str, list]]] = defaultdict(list)
-
-        # Derived caches (built after loading)
+        self.attributes: dict[str, dict[str, list[str]]] = defaultdict(_new_attr_map)
+        self.by_contact: dict[str, list[str]] = defaultdict(list)  # E.164 phone / email -> entities
+        self.edges_from: dict[str, array] = defaultdict(_new_postings)
+        self.edges_to: dict[str, array] = defaultdict(_new_postings)
+        self.numeric: dict[str, _NumericColumn] = {}  # hasCFM -> (value, fact) pairs by value
+        self.by_term: dict[str, array] = defaultdict(_new_postings)  # full-text term -> facts
+        self.term_counts: dict[str, array] = defaultdict(_new_counts)  # parallel occurrences
+
+        # Name lookups over the keys of by_entity/by_predicate/by_microtheory
+        self.entity_names = _NameIndex()
+        self.predicate_names = _NameIndex()
+        self.microtheory_names = _NameIndex()
+
+        # Type hierarchy and derived primitive resolution (kept current by
+        # _add_isa/_add_genls as facts arrive)
         self.isa_map: dict[str, set[str]] = defaultdict(set)     # entity -> {collections}
+        self.isa_members: dict[str, set[str]] = defaultdict(set) # collection -> {entities}
         self.genls_map: dict[str, set[str]] = defaultdict(set)   # sub -> {supers}
+        self.genls_specs: dict[str, set[str]] = defaultdict(set) # super -> {subs}
+        self.genls_closure: dict[str, set[str]] = {}             # sub -> all ancestors
+        self.coll_to_primitive: dict[str, str] = {p: p for p in _PRIMITIVES}
         self.entity_primitive: dict[str, str] = {}                # entity -> "NODE" etc.
         self.comments: dict[str, str] = {}                        # entity -> comment text
 
-        # Load tracking
+        # Load tracking; each merged tier owns one contiguous run of fact IDs
         self.loaded_tiers: set[str] = set()
+        self.tier_spans: dict[str, tuple[int, int, int]] = {}  # tier -> (start, end, files)
         self.total_facts: int = 0
         self.total_files: int = 0
+        self.generation: int = next(_generations)  # bumped on every change
+        self.stable_since: int = self.generation      # fact IDs last moved (unload)
+
+    # ── Fact access ──
+
+    def predicate(self, fid: int) -> str:
+        return self.symbols.names[self.fact_pred[fid]]
+
+    def source_file(self, fid: int) -> str:
+        return self.symbols.names[self.fact_file[fid]]
+
+    def fact(self, fid: int) -> Fact:
+        """Materialize one row of the fact store."""
+        names = self.symbols.names
+        return Fact(
+            predicate=names[self.fact_pred[fid]],
+            args=self.fact_args[fid],
+            microtheory=names[self.fact_mt[fid]],
+            source_file=names[self.fact_file[fid]],
+            line_hint=self.fact_line[fid],
+            start=self.fact_start[fid],
+            end=self.fact_end[fid],
+        )
+
+    # ── Ingest ──
 
     def ingest(self, facts: list[Fact]):
         """Add facts to all indices."""
+        sym = self.symbols.intern
+        self.generation = next(_generations)
+        numeric = defaultdict(list)  # predicate -> new (value, fact ID) pairs
+        new_terms: dict[str, tuple[list, list]] = {}  # term -> new (fact IDs, counts)
+        stems = _stems
         for fact in facts:
+            fid = len(self.fact_args)
             self.total_facts += 1
             pred = fact.predicate
             args = fact.args
 
-            # by_predicate
-            self.by_predicate[pred].append(fact)
-
-            # by_microtheory
-            self.by_microtheory[fact.microtheory].append(fact)
-
-            # Extract all entity names for by_entity
-            entities = _extract_entities(args)
-            for e in entities:
-                self.by_entity[e].append(fact)
+            self.fact_pred.append(sym(pred))
+            self.fact_mt.append(sym(fact.microtheory))
+            self.fact_file.append(sym(fact.source_file))
+            self.fact_line.append(fact.line_hint)
+            self.fact_start.append(fact.start)
+            self.fact_end.append(fact.end)
+            self.fact_args.append(args)
+
+            # Escapes unquote to punctuation, so the raw atoms give the same terms
+            quoted = [a for a in args if isinstance(a, str) and a[:1] == '"']
+            if quoted:
+                words = _words(" ".join(quoted))
+                self.fact_terms.append(len(words))
+                for word in words:
+                    term = stems.get(word)
+                    if term is None:
+                        term = stems[word] = _stem(word)
+                    entry = new_terms.get(term)
+                    if entry is None:
+                        new_terms[term] = ([fid], [1])
+                    elif entry[0][-1] == fid:  # repeated in this fact: bump its count
+                        if entry[1][-1] < 0xFFFF:
+                            entry[1][-1] += 1
+                    else:
+                        entry[0].append(fid)
+                        entry[1].append(1)
+            else:
+                self.fact_terms.append(0)
+
+            postings = self.by_predicate.get(pred)
+            if postings is None:
+                self.predicate_names.add(pred)
+                postings = self.by_predicate[pred]
+            postings.append(fid)
+            postings = self.by_microtheory.get(fact.microtheory)
+            if postings is None:
+                self.microtheory_names.add(fact.microtheory)
+                postings = self.by_microtheory[fact.microtheory]
+            postings.append(fid)
+            self.by_file[fact.source_file].append(fid)
+
+            # Each fact is posted once per distinct entity it mentions
+            entities = set(_extract_entities(args))
+
+            if pred == "hasAttribute" and len(args) >= 2 and isinstance(args[1], str):
+                self.by_attribute[args[1]].append(fid)
 
             # Specific predicate handling
             if pred == "isa" and len(args) >= 2:
                 subj = args[0] if isinstance(args[0], str) else None
                 coll = args[1] if isinstance(args[1], str) else None
                 if subj and coll:
-                    self.isa_map[subj].add(coll)
-                    self.by_entity[subj].append(fact)
+                    self._add_isa(subj, coll)
+                    entities.add(subj)
 
             elif pred == "genls" and len(args) >= 2:
                 sub = args[0] if isinstance(args[0], str) else None
                 sup = args[1] if isinstance(args[1], str) else None
                 if sub and sup:
-                    self.genls_map[sub].add(sup)
+                    self._add_genls(sub, sup)
 
             elif pred == "comment" and len(args) >= 2:
                 subj = args[0] if isinstance(args[0], str) else None
                 text = args[1] if isinstance(args[1], str) else None
                 if subj and text:
-                    self.comments[subj] = _unquote(text)
+                    self.comments[subj] = unquote(text)
 
             elif pred == "hasAttribute" and len(args) >= 3:
-                entity = args[0] if isinstance(args[0], str) else None
-                attr = args[1] if isinstance(args[1], str) else None
-                val = args[2] if isinstance(args[2], str) else str(args[2])
-                if entity and attr:
-                    self.attributes[entity][attr].append(_unquote(val))
-                    self.by_entity[entity].append(fact)
+                triple = _attribute_triple(args)
+                if triple and triple[0] and triple[1]:
+                    self._add_attribute(*triple)
+                    entities.add(triple[0])
 
             elif pred not in _META_PREDICATES and len(args) >= 2:
                 # Non-meta predicate with 2+ args -> edge
                 first = args[0] if isinstance(args[0], str) else None
                 if first and not first.startswith("?"):
-                    self.edges_from[first].append((pred, args))
-                    # Index the target(s)
-                    for a in args[1:]:
-                        if isinstance(a, str) and not a.startswith("?") and not a.startswith('"'):
-                            self.edges_to[a].append((pred, args))
+                    self.edges_from[first].append(fid)
+                    for a in _edge_targets(args):
+                        self.edges_to[a].append(fid)
+                    if len(args) == 2 and (value := _numeric_value(args[1])) is not None:
+                        numeric[pred].append((value, fid))
+
+            for e in entities:
+                postings = self.by_entity.get(e)
+                if postings is None:
+                    self.entity_names.add(e)
+                    postings = self.by_entity[e]
+                postings.append(fid)
+
+        for pred, pairs in numeric.items():
+            self.numeric.setdefault(pred, _NumericColumn()).add(pairs)
+        for term, (fids, counts) in new_terms.items():
+            self.by_term[term].extend(fids)
+            self.term_counts[term].extend(counts)
+
+    def _add_attribute(self, entity: str, attr: str, value: str):
+        self.attributes[entity][attr].append(value)
+        normalize = _CONTACT_NORMALIZERS.get(attr)
+        if normalize and (key := normalize(value)):
+            self._add_contact(key, entity)
+
+    def _add_contact(self, key: str, entity: str):
+        owners = self.by_contact[key]
+        if entity not in owners:
+            owners.append(entity)
+
+    def find_contact(self, raw: str) -> list[str]:
+        """Entities whose ::PHONE or ::EMAIL matches `raw` after normalization."""
+        key = _normalize_email(raw) if "@" in raw else _normalize_phone(raw)
+        return self.by_contact.get(key, []) if key else []
+
+    def merge(self, other: "KRFIndex", tier_name: str | None = None):
+        """Fold another index (one tier built in isolation) into this one.
+
+        Equivalent to ingesting the other index's facts after this one's:
+        its symbol IDs are remapped and its fact IDs rebased past ours.
+        Primitive resolution is cross-tier, so the other index's derived
+        maps are ignored and its isa/genls pairs are replayed instead.
+        With `tier_name`, the new fact IDs are recorded so unload() can
+        take them out again.
+        """
+        base = len(self.fact_args)
+        self.generation = next(_generations)
+        if tier_name:
+            self.tier_spans[tier_name] = (base, base + len(other.fact_args), other.total_files)
+            self.loaded_tiers.add(tier_name)
+        remap = [self.symbols.intern(n) for n in other.symbols.names]
+        self.fact_pred.extend(remap[s] for s in other.fact_pred)
+        self.fact_mt.extend(remap[s] for s in other.fact_mt)
+        self.fact_file.extend(remap[s] for s in other.fact_file)
+        self.fact_line.extend(other.fact_line)
+        self.fact_start.extend(other.fact_start)
+        self.fact_end.extend(other.fact_end)
+        self.fact_terms.extend(other.fact_terms)
+        self.fact_args.extend(other.fact_args)
+
+        for src, dst, names in ((other.by_entity, self.by_entity, self.entity_names),
+                                (other.by_predicate, self.by_predicate, self.predicate_names),
+                                (other.by_microtheory, self.by_microtheory, self.microtheory_names)):
+            for key in src:
+                if key not in dst:
+                    names.add(key)
+        for src, dst in ((other.by_entity, self.by_entity),
+                         (other.by_predicate, self.by_predicate),
+                         (other.by_microtheory, self.by_microtheory),
+                         (other.by_file, self.by_file),
+                         (other.by_attribute, self.by_attribute),
+                         (other.edges_from, self.edges_from),
+                         (other.edges_to, self.edges_to)):
+            for key, fids in src.items():
+                dst[key].extend(f + base for f in fids)
+        for pred, column in other.numeric.items():
+            self.numeric.setdefault(pred, _NumericColumn()).add(
+                zip(column.values, (f + base for f in column.fids)))
+        for term, fids in other.by_term.items():
+            self.by_term[term].extend(f + base for f in fids)
+            self.term_counts[term].extend(other.term_counts[term])
+
+        for entity, attrs in other.attributes.items():
+            mine = self.attributes[entity]
+            for attr, vals in attrs.items():
+                mine[attr].extend(vals)
+
+        # genls first, so each new isa sees its collection's final primitive
+        for sub, sups in other.genls_map.items():
+            for sup in sups:
+                self._add_genls(sub, sup)
+        for entity, colls in other.isa_map.items():
+            for coll in colls:
+                self._add_isa(entity, coll)
+        for key, owners in other.by_contact.items():
+            for entity in owners:
+                self._add_contact(key, entity)
+        self.comments.update(other.comments)
+
+        self.total_facts += other.total_facts
+        self.total_files += other.total_files
+
+    def copy(self) -> "KRFIndex":
+        """An independent copy (see _copy_state).
+
+        Lets a worker thread build a changed index while queries keep
+        reading this one.
+        """
+        return _copy_state(self)
+
+    def tiers_of(self, fids: Sequence[int]) -> list[str]:
+        """Tiers owning any of the ascending fact IDs `fids`."""
+        owners = []
+        for tier_name, (start, end, _) in self.tier_spans.items():
+            i = bisect_left(fids, start)
+            if i < len(fids) and fids[i] < end:
+                owners.append(tier_name)
+        return owners
+
+    def unload(self, tier_name: str) -> int:
+        """Remove a merged tier: its rows, postings and everything derived from them.
+
+        Rows after the tier shift down so fact IDs stay dense. Side tables
+        keyed by entity (attributes, contacts, comments, isa/genls) are
+        rebuilt only for the entities the tier touched, from the facts that
+        remain. Returns the number of facts removed.
+        """
+        start, end, files = self.tier_spans.pop(tier_name)
+        removed = end - start
+        self._splice(start, end)
+        for other, (s, e, f) in self.tier_spans.items():
+            if s >= end:
+                self.tier_spans[other] = (s - removed, e - removed, f)
+        self.loaded_tiers.discard(tier_name)
+        self.total_files -= files
+        return removed
+
+    def replace_file(self, tier_name: str, rel: str, new: "KRFIndex | None", files: Sequence[str]) -> range:
+        """Swap one source file's facts in a merged tier for the rows of `new`.
+
+        `files` is the tier's file order on disk now. The file's rows are
+        replaced in place; a file the tier did not have goes where a fresh
+        load would put it, and new=None drops the file. Returns the fact
+        IDs of the new rows.
+        """
+        t_start, t_end, t_files = self.tier_spans[tier_name]
+        rows = self.by_file.get(rel, ())
+        lo = bisect_left(rows, t_start)
+        hi = bisect_left(rows, t_end, lo)
+        if lo < hi:
+            start, end = rows[lo], rows[hi - 1] + 1
+        else:
+            start = end = t_end
+            for later in files[files.index(rel) + 1:] if rel in files else ():
+                rows = self.by_file.get(later, ())
+                i = bisect_left(rows, t_start)
+                if i < len(rows) and rows[i] < t_end:
+                    start = end = rows[i]
+                    break
+
+        shift = self._splice(start, end, new)
+        after = False
+        for other, (s, e, f) in self.tier_spans.items():
+            if other == tier_name:
+                self.tier_spans[other] = (s, e + shift, len(files))
+                after = True
+            elif after:
+                self.tier_spans[other] = (s + shift, e + shift, f)
+        self.total_files += len(files) - t_files
+        return range(start, end + shift)
+
+    def _splice(self, start: int, end: int, new: "KRFIndex | None" = None) -> int:
+        """Replace rows [start, end) with the rows of `new`, or just remove them.
+
+        Later rows shift by the difference, which is returned; tier spans
+        are left to the caller. Side tables keyed by entity are rebuilt
+        only for the entities the old or new rows touch.
+        """
+        self.generation = self.stable_since = next(_generations)
+        added = len(new.fact_args) if new is not None else 0
+        shift = added - (end - start)
+        names = self.symbols.names
+
+        isa_pairs, genls_pairs = set(), set()
+        attr_entities, comment_entities = set(), set()
+        for fid in range(start, end):
+            pred = names[self.fact_pred[fid]]
+            args = self.fact_args[fid]
+            if len(args) < 2 or not isinstance(args[0], str):
+                continue
+            if pred in ("isa", "genls") and isinstance(args[1], str):
+                (isa_pairs if pred == "isa" else genls_pairs).add((args[0], args[1]))
+            elif pred == "hasAttribute":
+                attr_entities.add(args[0])
+            elif pred == "comment":
+                comment_entities.add(args[0])
+
+        if new is None:
+            for column in (self.fact_pred, self.fact_mt, self.fact_file, self.fact_line,
+                           self.fact_start, self.fact_end, self.fact_terms, self.fact_args):
+                del column[start:end]
+        else:
+            remap = [self.symbols.intern(n) for n in new.symbols.names]
+            self.fact_pred[start:end] = array("I", (remap[s] for s in new.fact_pred))
+            self.fact_mt[start:end] = array("I", (remap[s] for s in new.fact_mt))
+            self.fact_file[start:end] = array("I", (remap[s] for s in new.fact_file))
+            self.fact_line[start:end] = new.fact_line
+            self.fact_start[start:end] = new.fact_start
+            self.fact_end[start:end] = new.fact_end
+            self.fact_terms[start:end] = new.fact_terms
+            self.fact_args[start:end] = new.fact_args
+            attr_entities.update(new.attributes)
+            comment_entities.update(new.comments)
+
+        def spliced(fids: array, lo: int, hi: int, incoming: Sequence[int] | None) -> array:
+            kept = fids[:lo]
+            if incoming:
+                kept.extend(f + start for f in incoming)
+            if shift:
+                kept.extend(f + shift for f in fids[hi:])
+            else:
+                kept.extend(fids[hi:])
+            return kept
+
+        for attr, names_index in (("by_entity", "entity_names"),
+                                  ("by_predicate", "predicate_names"),
+                                  ("by_microtheory", "microtheory_names"),
+                                  ("by_file", None), ("by_attribute", None),
+                                  ("edges_from", None), ("edges_to", None)):
+            postings = getattr(self, attr)
+            incoming = getattr(new, attr) if new is not None else {}
+            dropped = False
+            for key in list(postings):
+                fids = postings[key]
+                add = incoming.get(key)
+                if (not fids or fids[-1] < start) and not add:
+                    continue
+                lo = bisect_left(fids, start)
+                kept = spliced(fids, lo, bisect_left(fids, end, lo), add)
+                if kept:
+                    postings[key] = kept
+                else:
+                    del postings[key]
+                    dropped = True
+            fresh = [key for key in incoming if key not in postings]
+            for key in fresh:
+                postings[key] = array("I", (f + start for f in incoming[key]))
+            if names_index and dropped:
+                rebuilt = _NameIndex()
+                for key in postings:
+                    rebuilt.add(key)
+                setattr(self, names_index, rebuilt)
+            elif names_index:
+                for key in fresh:
+                    getattr(self, names_index).add(key)
+
+        incoming = new.by_term if new is not None else {}
+        for term in list(self.by_term):
+            fids = self.by_term[term]
+            add = incoming.get(term)
+            if fids[-1] < start and not add:
+                continue
+            lo = bisect_left(fids, start)
+            hi = bisect_left(fids, end, lo)
+            if lo == 0 and hi == len(fids) and not add:
+                del self.by_term[term], self.term_counts[term]
+                continue
+            self.by_term[term] = spliced(fids, lo, hi, add)
+            counts = self.term_counts[term]
+            if add:
+                counts[lo:hi] = new.term_counts[term]
+            else:
+                del counts[lo:hi]
+        for term in incoming:
+            if term not in self.by_term:
+                self.by_term[term] = array("I", (f + start for f in incoming[term]))
+                self.term_counts[term] = array("H", new.term_counts[term])
+
+        incoming = new.numeric if new is not None else {}
+        for pred in list(self.numeric) + [p for p in incoming if p not in self.numeric]:
+            column = self.numeric.get(pred) or _NumericColumn()
+            kept = _NumericColumn()
+            for value, fid in zip(column.values, column.fids):
+                if fid < start or fid >= end:
+                    kept.values.append(value)
+                    kept.fids.append(fid if fid < start else fid + shift)
+            if pred in incoming:
+                kept.add(zip(incoming[pred].values, (f + start for f in incoming[pred].fids)))
+            if kept:
+                self.numeric[pred] = kept
+            else:
+                del self.numeric[pred]
+
+        self.total_facts += shift
+
+        for entity in attr_entities:
+            self._reload_attributes(entity)
+        for entity in comment_entities:
+            self._reload_comment(entity)
+
+        colls, entities = set(), set()
+        for entity, coll in isa_pairs:
+            if not self._asserted("isa", entity, coll):
+                self._drop_isa(entity, coll)
+                entities.add(entity)
+        for sub, sup in genls_pairs:
+            if not self._asserted("genls", sub, sup):
+                self._drop_genls(sub, sup)
+                colls.add(sub)
+        self._rederive(colls, entities)
+        if new is not None:
+            for sub, sups in new.genls_map.items():
+                for sup in sups:
+                    self._add_genls(sub, sup)
+            for entity, types in new.isa_map.items():
+                for coll in types:
+                    self._add_isa(entity, coll)
+        return shift
+
+    def _asserted(self, pred: str, subj: str, obj: str) -> bool:
+        """Whether a remaining fact states (pred subj obj ...)."""
+        pred_sym = self.symbols.ids.get(pred)
+        for fid in self.by_entity.get(subj, ()):
+            args = self.fact_args[fid]
+            if self.fact_pred[fid] == pred_sym and len(args) >= 2 and args[0] == subj and args[1] == obj:
+                return True
+        return False
+
+    def _reload_attributes(self, entity: str):
+        old = self.attributes.pop(entity, {})
+        for attr, normalize in _CONTACT_NORMALIZERS.items():
+            for value in old.get(attr, ()):
+                key = normalize(value)
+                owners = self.by_contact.get(key) if key else None
+                if owners and entity in owners:
+                    owners.remove(entity)
+                    if not owners:
+                        del self.by_contact[key]
+        pred_sym = self.symbols.ids.get("hasAttribute")
+        for fid in self.by_entity.get(entity, ()):
+            if self.fact_pred[fid] == pred_sym:
+                triple = _attribute_triple(self.fact_args[fid])
+                if triple and triple[0] == entity and triple[1]:
+                    self._add_attribute(*triple)
+
+    def _reload_comment(self, entity: str):
+        self.comments.pop(entity, None)
+        pred_sym = self.symbols.ids.get("comment")
+        for fid in self.by_entity.get(entity, ()):
+            args = self.fact_args[fid]
+            if (self.fact_pred[fid] == pred_sym and len(args) >= 2
+                    and args[0] == entity and isinstance(args[1], str)):
+                self.comments[entity] = unquote(args[1])
+
+    # ── Primitive resolution ──
+    #
+    # If (genls X NODE) then every (isa Y X) makes Y a NODE. A collection
+    # resolves to the highest-ranked primitive among itself and its genls
+    # ancestors; an entity to the highest-ranked primitive among its
+    # collections. Facts only ever add isa/genls pairs, so each new pair
+    # can only widen closures and improve ranks — it is enough to push it
+    # down to the collections and entities below it.
+
+    def _best_primitive(self, coll: str) -> str | None:
+        if coll in _PRIMITIVE_RANK:
+            return coll
+        ancestors = self.genls_closure.get(coll)
+        if ancestors:
+            for p in _PRIMITIVES:
+                if p in ancestors:
+                    return p
+        return None
+
+    def _offer_primitive(self, entity: str, prim: str):
+        current = self.entity_primitive.get(entity)
+        if current is None or _PRIMITIVE_RANK[prim] < _PRIMITIVE_RANK[current]:
+            if current is not None:
+                self.by_primitive[current].discard(entity)
+            self.entity_primitive[entity] = prim
+            self.by_primitive[prim].add(entity)
+
+    def _add_isa(self, entity: str, coll: str):
+        colls = self.isa_map[entity]
+        if coll in colls:
+            return
+        colls.add(coll)
+        self.isa_members[coll].add(entity)
+        prim = self.coll_to_primitive.get(coll)
+        if prim:
+            self._offer_primitive(entity, prim)
+
+    def _add_genls(self, sub: str, sup: str):
+        sups = self.genls_map[sub]
+        if sup in sups:
+            return
+        sups.add(sup)
+        self.genls_specs[sup].add(sub)
+
+        # sub and every collection below it gain sup and sup's ancestors.
+        # A spec's closure is always a superset of its super's, so stop
+        # descending wherever nothing new was gained.
+        gained = {sup} | self.genls_closure.get(sup, set())
+        stack = [sub]
+        while stack:
+            coll = stack.pop()
+            closure = self.genls_closure.setdefault(coll, set())
+            if gained <= closure:
+                continue
+            closure |= gained
+            prim = self._best_primitive(coll)
+            if prim and prim != self.coll_to_primitive.get(coll):
+                self.coll_to_primitive[coll] = prim
+                for entity in self.isa_members.get(coll, ()):
+                    self._offer_primitive(entity, prim)
+            stack.extend(self.genls_specs.get(coll, ()))
+
+    def _drop_isa(self, entity: str, coll: str):
+        colls = self.isa_map.get(entity)
+        if colls:
+            colls.discard(coll)
+            if not colls:
+                del self.isa_map[entity]
+        members = self.isa_members.get(coll)
+        if members:
+            members.discard(entity)
+            if not members:
+                del self.isa_members[coll]
+
+    def _drop_genls(self, sub: str, sup: str):
+        sups = self.genls_map.get(sub)
+        if sups:
+            sups.discard(sup)
+            if not sups:
+                del self.genls_map[sub]
+        specs = self.genls_specs.get(sup)
+        if specs:
+            specs.discard(sub)
+            if not specs:
+                del self.genls_specs[sup]
+
+    def _resolve_entity(self, entity: str):
+        """Recompute one entity's primitive from its current collections."""
+        ranks = [_PRIMITIVE_RANK[p] for c in self.isa_map.get(entity, ())
+                 if (p := self.coll_to_primitive.get(c))]
+        prim = _PRIMITIVES[min(ranks)] if ranks else None
+        current = self.entity_primitive.get(entity)
+        if prim == current:
+            return
+        if current is not None:
+            members = self.by_primitive[current]
+            members.discard(entity)
+            if not members:
+                del self.by_primitive[current]
+        if prim is None:
+            del self.entity_primitive[entity]
+        else:
+            self.entity_primitive[entity] = prim
+            self.by_primitive[prim].add(entity)
+
+    def _rederive(self, colls: set[str], entities: set[str]):
+        """Recompute resolution after isa/genls pairs were removed.
+
+        Removal can shrink closures, so unlike _add_genls this recomputes
+        every collection below `colls` and every entity typed by them.
+        """
+        below: set[str] = set()
+        stack = list(colls)
+        while stack:
+            coll = stack.pop()
+            if coll not in below:
+                below.add(coll)
+                stack.extend(self.genls_specs.get(coll, ()))
+
+        for coll in below:
+            sups = self.genls_map.get(coll)
+            if not sups:
+                self.genls_closure.pop(coll, None)
+                continue
+            ancestors: set[str] = set()
+            stack = list(sups)
+            while stack:
+                c = stack.pop()
+                if c not in ancestors:
+                    ancestors.add(c)
+                    stack.extend(self.genls_map.get(c, ()))
+            self.genls_closure[coll] = ancestors
+
+        entities = set(entities)
+        for coll in below:
+            prim = self._best_primitive(coll)
+            if prim:
+                self.coll_to_primitive[coll] = prim
+            else:
+                self.coll_to_primitive.pop(coll, None)
+            entities.update(self.isa_members.get(coll, ()))
+        for entity in entities:
+            self._resolve_entity(entity)
 
     def build_derived_indices(self):
-        """Build primitive type resolution after all facts loaded.
+        """Rebuild primitive resolution from isa_map/genls_map from scratch.
 
-        Chases genls chains: if (genls X NODE) then all (isa Y X) -> Y is NODE.
+        ingest() and merge() keep it current incrementally; this full pass
+        is the reference they must agree with.
         """
-        primitives = {"NODE", "EDGE", "METRIC", "SIGNAL", "PROTOCOL"}
+        self.isa_members = defaultdict(set)
+        for entity, colls in self.isa_map.items():
+            for coll in colls:
+                self.isa_members[coll].add(entity)
+        self.genls_specs = defaultdict(set)
+        for sub, sups in self.genls_map.items():
+            for sup in sups:
+                self.genls_specs[sup].add(sub)
 
-        # Build transitive genls closure
         # genls_closure[X] = all ancestors of X via genls
-        genls_closure: dict[str, set[str]] = {}
-
-        def _ancestors(coll: str) -> set[str]:
-            if coll in genls_closure:
-                return genls_closure[coll]
-            result = set()
-            genls_closure[coll] = result  # sentinel to break cycles
-            for parent in self.genls_map.get(coll, set()):
-                result.add(parent)
-                result |= _ancestors(parent)
-            genls_closure[coll] = result
-            return result
-
-        # Compute closure for all known collections
-        for coll in list(self.genls_map.keys()):
-            _ancestors(coll)
-
-        # Which collections resolve to which primitive?
-        coll_to_primitive: dict[str, str] = {}
-        for coll in genls_closure:
-            ancestors = genls_closure[coll] | {coll}
-            for p in primitives:
-                if p in ancestors:
-                    coll_to_primitive[coll] = p
-                    break
-
-        # Also: direct primitives map to themselves
-        for p in primitives:
-            coll_to_primitive[p] = p
-
-        # Now resolve entities: if (isa Entity SomeCollection) and
-        # SomeCollection resolves to a primitive, then Entity -> primitive
-        for entity, collections in self.isa_map.items():
-            for coll in collections:
-                if coll in coll_to_primitive:
-                    prim = coll_to_primitive[coll]
-                    self.entity_primitive[entity] = prim
-                    self.by_primitive[prim].add(entity)
-                    break
+        self.genls_closure = {}
+        for coll, sups in self.genls_map.items():
+            ancestors: set[str] = set()
+            stack = list(sups)
+            while stack:
+                c = stack.pop()
+                if c not in ancestors:
+                    ancestors.add(c)
+                    stack.extend(self.genls_map.get(c, ()))
+            self.genls_closure[coll] = ancestors
+
+        self.coll_to_primitive = {p: p for p in _PRIMITIVES}
+        for coll in self.genls_closure:
+            prim = self._best_primitive(coll)
+            if prim:
+                self.coll_to_primitive[coll] = prim
+
+        self.entity_primitive = {}
+        self.by_primitive = defaultdict(set)
+        for entity, colls in self.isa_map.items():
+            ranks = [_PRIMITIVE_RANK[p] for c in colls
+                     if (p := self.coll_to_primitive.get(c))]
+            if ranks:
+                prim = _PRIMITIVES[min(ranks)]
+                self.entity_primitive[entity] = prim
+                self.by_primitive[prim].add(entity)
 
         log.info("Derived indices: %d entities with primitive types, %d genls closures",
-                 len(self.entity_primitive), len(genls_closure))
+                 len(self.entity_primitive), len(self.genls_closure))
 
     def search_entity(self, query: str) -> list[str]:
         """Find entities matching query. Exact first, then ranked fuzzy match."""
@@ -390,20 +1161,22 @@ class KRFIndex:
 
         # Case-insensitive exact
         query_lower = query.lower()
-        for e in self.by_entity:
-            if e.lower() == query_lower:
-                return [e]
+        exact = self.entity_names.lower.get(query_lower)
+        if exact is not None:
+            return [exact]
 
-        # Ranked fuzzy: collect all substring matches then sort by relevance
-        query_norm = re.sub(r'[\s\-_]+', '', query_lower)
+        # Ranked fuzzy: substring matches of the normalized name
+        query_norm = _NAME_SEP_RE.sub('', query_lower)
         if len(query_norm) < 3:
             return []  # Too short for fuzzy — avoid matching everything
 
-        candidates = []  # (score, entity)
-        for e in self.by_entity:
-            if len(e) < 3:
-                continue  # Skip tiny keys like "or", "an"
-            e_norm = re.sub(r'[\s\-_]+', '', e.lower())
+        # Any name containing the query contains all of its trigrams, so
+        # only names in every trigram's postings need the substring check
+        candidates = []  # (score, entity), in by_entity order
+        names = self.entity_names
+        norms = names.norms
+        for eid in names.candidates(query_norm):
+            e_norm = norms[eid]
             if query_norm in e_norm:
                 # Score: lower is better
                 # - Exact norm match = 0
@@ -415,7 +1188,7 @@ class KRFIndex:
                     score = 1 + len(e_norm)
                 else:
                     score = 100 + len(e_norm)
-                candidates.append((score, e))
+                candidates.append((score, names.names[eid]))
 
         candidates.sort(key=lambda x: x[0])
         return [e for _, e in candidates[:20]]
@@ -463,6 +1236,10 @@ _TIERS = {
         "patterns": ["demos/*.krf"],
         "auto": False,
     },
+    "compressors": {  # the compressor catalog beside charlotte-os/
+        "patterns": ["../compressors/**/*.krf"],
+        "auto": False,
+    },
 }
 
 
@@ -481,52 +1258,387 @@ def _resolve_tier_files(tier_name: str) -> list[Path]:
     return files
 
 
-def _load_tier_sync(tier_name: str) -> tuple[list[Fact], int]:
-    """Load and parse all KRF files in a tier (sync, for asyncio.to_thread).
-
-    Returns (facts, file_count).
+# ── Tier snapshots ──────────────────────────────────────────────────────
+# Each tier's fact store and primary indices are pickled to
+# KRF_SNAPSHOT_DIR/<tier>.snap together with a (mtime_ns, size, sha256)
+# stamp per source file. A file whose mtime and size match is trusted
+# as-is; otherwise its sha256 decides whether it must be re-parsed.
+# Snapshots are read whole: merging a tier copies its columns into the
+# live index anyway, so mapping the file would save nothing.
+
+_SNAPSHOT_VERSION = 10
+
+
+def _snapshot_path(tier_name: str) -> Path:
+    return Path(Config.KRF_SNAPSHOT_DIR) / f"{tier_name}.snap"
+
+
+def _read_snapshot(tier_name: str) -> dict | None:
+    """Unpickle a tier snapshot. None if missing or unusable."""
+    path = _snapshot_path(tier_name)
+    try:
+        with open(path, "rb") as f:
+            snap = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning("Ignoring unreadable KRF snapshot %s: %s", path, e)
+        return None
+    if not isinstance(snap, dict) or snap.get("version") != _SNAPSHOT_VERSION:
+        return None
+    return snap
+
+
+def _write_snapshot(tier_name: str, snap: dict):
+    """Atomically replace a tier snapshot. Failures only cost the next warm start."""
+    path = _snapshot_path(tier_name)
+    tmp = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("Could not write KRF snapshot %s: %s", path, e)
+
+
+# ── Entity profile summaries ────────────────────────────────────────────
+# Next to each snapshot, KRF_SNAPSHOT_DIR/<tier>.profiles holds one
+# pickled summary record per entity (see _summarize_entity) behind an
+# offset directory. The file is memory-mapped and records are unpickled
+# only when a profile is rendered, so hub entities cost the same as any
+# other. The directory carries a digest of the snapshot's file stamps.
+
+_PROFILE_VERSION = 1
+_PROFILE_TOP_N = 50  # attribute/edge lines kept per record; larger limits read the index
+_PROFILE_MAGIC = b"KRFPROF\0"
+_tier_profiles: dict[str, "_TierProfiles"] = {}  # tier -> summaries of its last load
+
+
+class _TierProfiles:
+    """Per-entity summary records of one tier, read lazily from a mapped file."""
+
+    __slots__ = ("mm", "offsets", "facts")
+
+    def __init__(self, mm: mmap.mmap, offsets: dict[str, tuple[int, int]], facts: int):
+        self.mm = mm
+        self.offsets = offsets
+        self.facts = facts
+
+    def get(self, entity: str) -> tuple | None:
+        span = self.offsets.get(entity)
+        if span is None:
+            return None
+        start, size = span
+        return pickle.loads(self.mm[start:start + size])
+
+
+def _profiles_path(tier_name: str) -> Path:
+    return Path(Config.KRF_SNAPSHOT_DIR) / f"{tier_name}.profiles"
+
+
+def _stamps_digest(stamps: dict[str, tuple[int, int, str]]) -> str:
+    return hashlib.sha256(repr(sorted(stamps.items())).encode()).hexdigest()
+
+
+def _map_profiles(tier_name: str, digest: str) -> _TierProfiles | None:
+    """Map a tier's profile file. None if missing, stale or unusable."""
+    path = _profiles_path(tier_name)
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:8] != _PROFILE_MAGIC:
+            return None
+        head = pickle.loads(mm[int.from_bytes(mm[8:16], "little"):])
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning("Ignoring unreadable KRF profiles %s: %s", path, e)
+        return None
+    if head.get("version") != _PROFILE_VERSION or head.get("digest") != digest:
+        return None
+    return _TierProfiles(mm, head["offsets"], head["facts"])
+
+
+def _write_profiles(tier_name: str, tier: "KRFIndex", digest: str):
+    """Summarize every entity of a tier into its profile file."""
+    path = _profiles_path(tier_name)
+    tmp = path.with_suffix(".ptmp")
+    offsets = {}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_PROFILE_MAGIC + bytes(8))
+            for entity in tier.by_entity:
+                blob = pickle.dumps(_summarize_entity(entity, tier, _PROFILE_TOP_N),
+                                    protocol=pickle.HIGHEST_PROTOCOL)
+                offsets[entity] = (f.tell(), len(blob))
+                f.write(blob)
+            head_at = f.tell()
+            pickle.dump({"version": _PROFILE_VERSION, "digest": digest,
+                         "facts": len(tier.fact_args), "offsets": offsets},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.seek(8)
+            f.write(head_at.to_bytes(8, "little"))
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("Could not write KRF profiles %s: %s", path, e)
+
+
+def _refresh_profiles(tier_name: str, tier: "KRFIndex", stamps: dict[str, tuple[int, int, str]]):
+    """Map the tier's profile file, regenerating it if it does not match `stamps`."""
+    digest = _stamps_digest(stamps)
+    profiles = _map_profiles(tier_name, digest)
+    if profiles is None:
+        _write_profiles(tier_name, tier, digest)
+        profiles = _map_profiles(tier_name, digest)
+    if profiles is None:
+        _tier_profiles.pop(tier_name, None)
+    else:
+        _tier_profiles[tier_name] = profiles
+
+
+@contextmanager
+def _parse_pool() -> Iterator[Executor | None]:
+    """Process pool for parsing, or None when KRF_LOAD_WORKERS <= 1.
+
+    Workers start on first submit, so warm loads never spawn any.
+    """
+    if Config.KRF_LOAD_WORKERS <= 1:
+        yield None
+        return
+    pool = ProcessPoolExecutor(max_workers=Config.KRF_LOAD_WORKERS)
+    try:
+        yield pool
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _load_tier_sync(tier_name: str, pool: Executor | None = None) -> tuple[KRFIndex, int]:
+    """Load a tier into its own KRFIndex (sync, for asyncio.to_thread).
+
+    Files unchanged since the tier snapshot reuse their stored facts; only
+    changed files are re-parsed, in `pool` when given. Files of at least
+    KRF_STREAM_MIN_MB are never read whole: they are hashed and parsed in
+    blocks, and ingested batch by batch. If nothing changed, the snapshot's
+    index is returned without re-ingesting.
+    Returns (tier_index, file_count).
     """
     files = _resolve_tier_files(tier_name)
-    all_facts = []
+    snap = _read_snapshot(tier_name) if Config.KRF_SNAPSHOTS else None
+    old_stamps = snap["files"] if snap else {}
+    old_index: KRFIndex | None = snap["index"] if snap else None
+
+    stamps: dict[str, tuple[int, int, str]] = {}
+    facts_by_file: dict[str, list[Fact] | Path | None] = {}  # None = reuse, Path = stream
+    pending: dict[str, str] = {}                              # rel -> text to parse
+    streamed = 0
+
     for path in files:
-        rel = str(path.relative_to(_CHARLOTTE_OS)).replace("\\", "/")
+        rel = os.path.relpath(path, _CHARLOTTE_OS).replace("\\", "/")
         try:
-            text = path.read_text(encoding="utf-8")
-            facts = parse_krf(text, rel)
-            all_facts.extend(facts)
+            st = path.stat()
+            prev = old_stamps.get(rel)
+            if prev and prev[0] == st.st_mtime_ns and prev[1] == st.st_size:
+                stamps[rel] = prev
+                facts_by_file[rel] = None
+                continue
+
+            if krf_codec.streamed(st.st_size, Config.KRF_STREAM_MIN_MB):
+                data = None
+                with open(path, "rb") as f:
+                    digest = hashlib.file_digest(f, "sha256").hexdigest()
+            else:
+                data = path.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+            stamps[rel] = (st.st_mtime_ns, st.st_size, digest)
+            if prev and prev[2] == digest:
+                facts_by_file[rel] = None  # touched, not changed
+                continue
+
+            if data is None:
+                facts_by_file[rel] = path
+                streamed += 1
+                continue
+            pending[rel] = decode_source(data)
+            facts_by_file[rel] = []  # keeps file order; filled below
         except Exception as e:
-            log.warning("Error parsing %s: %s", rel, e)
-    return all_facts, len(files)
+            log.warning("Error reading %s: %s", rel, e)
+
+    if pool is not None and len(pending) > 1:
+        futures = {rel: pool.submit(_parse_rows, text, rel) for rel, text in pending.items()}
+        for rel, future in futures.items():
+            try:
+                facts_by_file[rel] = _facts_from_rows(future.result(), rel)
+            except Exception as e:
+                stamps.pop(rel)  # retry on the next load
+                log.warning("Error parsing %s: %s", rel, e)
+    else:
+        for rel, text in pending.items():
+            try:
+                facts_by_file[rel] = parse_krf(text, rel)
+            except Exception as e:
+                stamps.pop(rel)
+                log.warning("Error parsing %s: %s", rel, e)
+    reparsed = len(pending) + streamed
+
+    if old_index is not None and not reparsed and stamps.keys() == old_stamps.keys():
+        tier = old_index
+        log.info("KRF tier '%s': warm from snapshot", tier_name)
+    else:
+        tier = KRFIndex()
+        for rel, facts in facts_by_file.items():
+            if isinstance(facts, Path):
+                try:
+                    for batch in stream_krf(facts, rel):
+                        tier.ingest(batch)
+                except Exception as e:
+                    stamps.pop(rel)  # keeps what was read; retried on the next load
+                    log.warning("Error parsing %s: %s", rel, e)
+                continue
+            if facts is None:
+                reused = (old_index.fact(f) for f in old_index.by_file.get(rel, ()))
+                for batch in batched(reused, STREAM_BATCH_FACTS):
+                    tier.ingest(batch)
+                continue
+            tier.ingest(facts)
+        tier.total_files = len(files)
+        if snap:
+            log.info("KRF tier '%s': %d of %d files re-parsed", tier_name, reparsed, len(files))
+
+    if Config.KRF_SNAPSHOTS and stamps != old_stamps:
+        _write_snapshot(tier_name, {
+            "version": _SNAPSHOT_VERSION,
+            "files": stamps,
+            "index": tier,
+        })
+    if Config.KRF_SNAPSHOTS:
+        _refresh_profiles(tier_name, tier, stamps)
+    else:
+        _tier_profiles.pop(tier_name, None)
+    _tier_stamps[tier_name] = dict(stamps)
+
+    return tier, len(files)
+
+
+# ── Memory budget and eviction ──────────────────────────────────────────
+# load_domain keeps the process under KRF_MAX_RSS_MB by unloading
+# on-demand tiers, least recently used first; each use of a tier buys it
+# _EVICT_USE_CREDIT_S more residency (up to 10 uses). Evicted tiers come
+# back from their snapshot when asked for again.
+
+_INDEX_BYTES_PER_SOURCE_BYTE = 8  # resident index is ~7x the .krf source
+_EVICT_USE_CREDIT_S = 60.0
+_tier_usage: dict[str, tuple[float, int]] = {}  # tier -> (last used, uses)
+_reusable_bytes = 0  # freed by eviction; kept by the allocator, not returned to the OS
+_recorded_uses: set[str] | None = None  # collects tier uses while a cacheable query runs
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (Linux), or 0 when unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _tier_source_bytes(tier_name: str) -> int:
+    total = 0
+    for path in _resolve_tier_files(tier_name):
+        try:
+            total += path.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def _touch_tiers(tier_names: Iterable[str], use: bool = True):
+    now = time.monotonic()
+    for tier_name in tier_names:
+        _, uses = _tier_usage.get(tier_name, (0.0, 0))
+        _tier_usage[tier_name] = (now, uses + use)
+        if use and _recorded_uses is not None:
+            _recorded_uses.add(tier_name)
+
+
+def _eviction_order() -> list[str]:
+    """Loaded on-demand tiers, least valuable first."""
+    def value(tier_name: str) -> float:
+        last_used, uses = _tier_usage.get(tier_name, (0.0, 0))
+        return last_used + min(uses, 10) * _EVICT_USE_CREDIT_S
+    return sorted((t for t in _index.tier_spans if not _TIERS[t]["auto"]), key=value)
+
+
+def _make_room(incoming: str) -> list[str]:
+    """Unload tiers until `incoming` fits under KRF_MAX_RSS_MB. Returns the evicted tiers.
+
+    Unloading can retract rule consequences, so when anything was evicted
+    the caller rebuilds the derived layer from what remains.
+    """
+    global _reusable_bytes
+    budget = Config.KRF_MAX_RSS_MB * 2**20
+    if budget <= 0:
+        return []
+    need = _tier_source_bytes(incoming) * _INDEX_BYTES_PER_SOURCE_BYTE
+    available = budget - _rss_bytes() + _reusable_bytes
+    evicted = []
+    for victim in _eviction_order():
+        if available >= need:
+            break
+        removed = _index.unload(victim)
+        _tier_profiles.pop(victim, None)
+        freed = _tier_source_bytes(victim) * _INDEX_BYTES_PER_SOURCE_BYTE
+        available += freed
+        _reusable_bytes += freed
+        evicted.append(victim)
+        log.info("KRF evicted tier '%s' (%d facts) to make room for '%s'", victim, removed, incoming)
+    _reusable_bytes = max(0, _reusable_bytes - need)
+    return evicted
 
 
 async def init_krf_index():
     """Initialize the KRF index at server startup.
 
-    Loads auto-load tiers (core, knowledge) in a background thread.
+    Loads the auto-load tiers (core, knowledge, contacts) concurrently,
+    parsing in a shared process pool, then merges them in declared order.
     """
-    global _index
+    global _index, _prefetcher, _rules
     _index = KRFIndex()
+    _rules = None
 
     auto_tiers = [name for name, cfg in _TIERS.items() if cfg["auto"]]
-    log.info("KRF init: loading tiers %s from %s", auto_tiers, _CHARLOTTE_OS)
+    log.info("KRF init: loading tiers %s from %s (%d workers)",
+             auto_tiers, _CHARLOTTE_OS, Config.KRF_LOAD_WORKERS)
+
+    with _parse_pool() as pool:
+        loaded = await asyncio.gather(
+            *(asyncio.to_thread(_load_tier_sync, name, pool) for name in auto_tiers))
+
+    for tier_name, (tier, file_count) in zip(auto_tiers, loaded):
+        _index.merge(tier, tier_name)
+        log.info("KRF tier '%s': %d files, %d facts", tier_name, file_count, tier.total_facts)
 
-    for tier_name in auto_tiers:
-        facts, file_count = await asyncio.to_thread(_load_tier_sync, tier_name)
-        _index.ingest(facts)
-        _index.total_files += file_count
-        _index.loaded_tiers.add(tier_name)
-        log.info("KRF tier '%s': %d files, %d facts", tier_name, file_count, len(facts))
+    if Config.KRF_RULES:
+        _rules = _RuleEngine.build(_index)
+        log.info("KRF rules: %d compiled (%d skipped), %d facts derived in %.0f ms",
+                 len(_rules.rules), _rules.skipped, _rules.derived.total_facts, _rules.update_ms)
 
-    _index.build_derived_indices()
+    log.info("KRF index ready: %d facts, %d files, %d entities (%d typed), %d microtheories",
+             _index.total_facts, _index.total_files, len(_index.by_entity),
+             len(_index.entity_primitive), len(_index.by_microtheory))
 
-    log.info("KRF index ready: %d facts, %d files, %d entities, %d microtheories",
-             _index.total_facts, _index.total_files,
-             len(_index.by_entity), len(_index.by_microtheory))
+    if Config.KRF_PREFETCH:
+        _prefetcher = await asyncio.to_thread(_Prefetcher.build, _index.entity_names.names)
 
 
-async def load_domain(domain: str) -> str:
-    """Load an on-demand tier into the index. Returns status message."""
-    global _index
+async def load_domain(domain: str, evict: bool = True) -> str:
+    """Load an on-demand tier into the index. Returns status message.
+
+    With `evict`, less used tiers are unloaded first if the new one would
+    push the process past KRF_MAX_RSS_MB.
+    """
+    global _index, _rules
     if _index is None:
         return "Error: KRF index not initialized"
 
@@ -543,18 +1655,833 @@ async def load_domain(domain: str) -> str:
         if domain in _index.loaded_tiers:
             return f"Domain '{domain}' already loaded"
 
-        facts, file_count = await asyncio.to_thread(_load_tier_sync, domain)
-        _index.ingest(facts)
-        _index.total_files += file_count
-        _index.loaded_tiers.add(domain)
-        _index.build_derived_indices()
+        evicted = _make_room(domain) if evict else []
+        if evicted and _rules is not None:
+            # Queries keep the previous layer until the new one is swapped in
+            _rules = await asyncio.to_thread(_RuleEngine.build, _index)
+            _index.generation = next(_generations)
+        with _parse_pool() as pool:
+            tier, file_count = await asyncio.to_thread(_load_tier_sync, domain, pool)
+        _index.merge(tier, domain)
+        _touch_tiers([domain], use=False)
+        if _rules is not None:
+            # Materialize the new tier's consequences off the event loop;
+            # queries keep the previous layer until the new one is swapped in
+            start, end, _ = _index.tier_spans[domain]
+            _rules = await asyncio.to_thread(_rules.updated, _index, range(start, end))
+            _index.generation = next(_generations)
+
+    log.info("KRF domain '%s' loaded: %d files, %d facts", domain, file_count, tier.total_facts)
+    msg = f"Loaded '{domain}': {file_count} files, {tier.total_facts} facts. Total index: {_index.total_facts} facts."
+    if evicted:
+        msg += f" Unloaded to stay within memory budget: {', '.join(evicted)}."
+    return msg
+
+
+# ── Hot reload ──────────────────────────────────────────────────────────
+# A background watcher re-ingests the .krf files of loaded tiers when
+# they change on disk, so edits land without a restart. Directories are
+# watched through Linux inotify (via ctypes), with polling every
+# KRF_WATCH_POLL_S as the fallback. Each pass compares every file's
+# (mtime, size), then sha256, with what was loaded, and parses only the
+# changed files. All of that runs in a worker thread. The worker splices
+# them into a copy of the index with replace_file, and carries the rule
+# layer along: it updates a copy when files only gained facts, and
+# rebuilds it otherwise. The new index and rules are then published in
+# one swap with a generation bump. Queries keep the old generation until
+# then, and see every file of a pass entirely before or after it.
+
+_WATCH_SETTLE_S = 0.25  # editors save in several steps; let the burst finish
+_tier_stamps: dict[str, dict[str, tuple[int, int, str]]] = {}  # tier -> file -> stamp as loaded
+_watch_task: "asyncio.Task | None" = None
+_watch_stats = {"mode": None, "passes": 0, "files_reloaded": 0, "last_reload_ms": None}
+
+_IN_CLOSE_WRITE, _IN_MOVED_FROM, _IN_MOVED_TO = 0x8, 0x40, 0x80
+_IN_CREATE, _IN_DELETE, _IN_ONLYDIR, _IN_ISDIR = 0x100, 0x200, 0x1000000, 0x40000000
+_IN_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class _Inotify:
+    """Directory watches through the Linux inotify API."""
+
+    _MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_ONLYDIR
+
+    def __init__(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch  # AttributeError off Linux
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: set[Path] = set()
+
+    def watch(self, directory: Path):
+        if directory not in self.dirs:
+            if self._add_watch(self.fd, os.fsencode(directory), self._MASK) < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.dirs.add(directory)
+
+    def drain(self) -> bool:
+        """Consume queued events. True if any named a .krf file or a directory."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            pos = 0
+            while pos < len(data):
+                _, mask, _, size = _IN_EVENT.unpack_from(data, pos)
+                name = data[pos + _IN_EVENT.size:pos + _IN_EVENT.size + size].rstrip(b"\0")
+                relevant = relevant or bool(mask & _IN_ISDIR) or name.endswith(b".krf")
+                pos += _IN_EVENT.size + size
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _watch_dirs() -> set[Path]:
+    """Every directory a tier pattern can match files in, plus each pattern's fixed root."""
+    dirs = set()
+    for cfg in _TIERS.values():
+        for pattern in cfg["patterns"]:
+            parent = os.path.dirname(pattern)
+            root = _CHARLOTTE_OS / parent.split("*", 1)[0]
+            candidates = chain([root], _CHARLOTTE_OS.glob(parent)) if parent else [_CHARLOTTE_OS]
+            dirs.update(p.resolve() for p in candidates if p.is_dir())
+    return dirs
+
+
+def _index_file(path: Path, rel: str, prev: tuple | None) -> tuple[tuple[int, int, str], "KRFIndex | None"]:
+    """Stamp a file and, unless its content still matches `prev`, index it on its own."""
+    st = path.stat()
+    if krf_codec.streamed(st.st_size, Config.KRF_STREAM_MIN_MB):
+        data = None
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+    else:
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+    stamp = (st.st_mtime_ns, st.st_size, digest)
+    if prev and prev[2] == digest:
+        return stamp, None
+    piece = KRFIndex()
+    if data is None:
+        for batch in stream_krf(path, rel):
+            piece.ingest(batch)
+    else:
+        piece.ingest(parse_krf(decode_source(data), rel))
+    return stamp, piece
+
+
+def _scan_changes(tier_names: Iterable[str]) -> list[tuple]:
+    """Changed, new and deleted files of the given tiers (sync, for asyncio.to_thread).
+
+    Returns (tier, file, stamp, index, tier file order) per file. A deleted
+    file has no stamp or index; a touched but unchanged one has no index.
+    A file that fails to parse keeps its old facts until it changes again.
+    """
+    changes = []
+    indexed: dict[tuple[str, str | None], tuple] = {}  # a file in two tiers is parsed once
+    for tier_name in tier_names:
+        known = _tier_stamps.setdefault(tier_name, {})
+        paths = _resolve_tier_files(tier_name)
+        order = [os.path.relpath(p, _CHARLOTTE_OS).replace("\\", "/") for p in paths]
+        for path, rel in zip(paths, order):
+            prev = known.get(rel)
+            key = (rel, prev[2] if prev else None)
+            try:
+                st = path.stat()
+                if prev and prev[:2] == (st.st_mtime_ns, st.st_size):
+                    continue
+                if key not in indexed:
+                    indexed[key] = _index_file(path, rel, prev)
+            except Exception as e:
+                log.warning("KRF hot reload: error reading %s: %s", rel, e)
+                with suppress(OSError):
+                    st = path.stat()
+                    known[rel] = (st.st_mtime_ns, st.st_size, "")
+                continue
+            changes.append((tier_name, rel, *indexed[key], order))
+        for rel in known.keys() - set(order):
+            changes.append((tier_name, rel, None, None, order))
+    return changes
+
+
+def _retracts(idx: KRFIndex, tier_name: str, rel: str, new: KRFIndex | None) -> bool:
+    """Whether swapping `new` in for a file's rows drops a fact or may move a rule."""
+    start, end, _ = idx.tier_spans[tier_name]
+    rows = idx.by_file.get(rel, ())
+    lo = bisect_left(rows, start)
+    hi = bisect_left(rows, end, lo)
+    if lo == hi:
+        return False
+    if new is None:
+        return True
+    names = new.symbols.names
+    incoming = Counter((names[p], names[m], a) for p, m, a in zip(new.fact_pred, new.fact_mt, new.fact_args))
+    names = idx.symbols.names
+    for fid in rows[lo:hi]:
+        fact = (names[idx.fact_pred[fid]], names[idx.fact_mt[fid]], idx.fact_args[fid])
+        if fact[0] == "implies" or incoming[fact] <= 0:
+            return True
+        incoming[fact] -= 1
+    return False
+
+
+def _apply_changes(idx: KRFIndex, rules: "_RuleEngine | None",
+                   changes: list[tuple]) -> tuple[KRFIndex, "_RuleEngine | None", bool]:
+    """Splice changed files into a copy of `idx` (sync, for asyncio.to_thread).
+
+    `changes` are (tier, file, new rows or None, tier file order). The rule
+    layer is carried along on a copy too, or rebuilt once any change can
+    retract a consequence. Neither `idx` nor `rules` is modified.
+    Returns (index, rules, rebuilt).
+    """
+    idx = idx.copy()
+    rebuild = forked = False
+    for tier_name, rel, piece, order in changes:
+        if rules is not None and not rebuild:
+            rebuild = _retracts(idx, tier_name, rel, piece)
+        rows = idx.replace_file(tier_name, rel, piece, order)
+        if rules is not None and not rebuild:
+            if forked:
+                rules.update(idx, rows)
+            else:
+                rules, forked = rules.updated(idx, rows), True
+    if rebuild:
+        rules = _RuleEngine.build(idx)
+    return idx, rules, rebuild
+
+
+async def reload_changed() -> int:
+    """Re-ingest the .krf files of loaded tiers that changed on disk.
+
+    Returns the number of files swapped into the index.
+    """
+    global _index, _rules
+    if _index is None:
+        return 0
+    async with _load_lock:
+        changes = await asyncio.to_thread(_scan_changes, list(_index.loaded_tiers))
+        t0 = time.perf_counter()
+        splices = [(tier_name, rel, piece, order) for tier_name, rel, stamp, piece, order in changes
+                   if stamp is None or piece is not None]  # skip touched, content unchanged
+        rebuild = False
+        if splices:
+            _index, _rules, rebuild = await asyncio.to_thread(_apply_changes, _index, _rules, splices)
+            _index.generation = next(_generations)
+        for tier_name, rel, stamp, piece, order in changes:
+            known = _tier_stamps[tier_name]
+            if stamp is None:
+                known.pop(rel, None)
+            else:
+                known[rel] = stamp
+        for tier_name, rel, _, _ in splices:
+            _tier_profiles.pop(tier_name, None)  # summaries describe the old rows
+        swapped = [rel for _, rel, _, _ in splices]
+
+    _watch_stats["passes"] += 1
+    if swapped:
+        elapsed = (time.perf_counter() - t0) * 1000
+        _watch_stats["files_reloaded"] += len(swapped)
+        _watch_stats["last_reload_ms"] = round(elapsed, 1)
+        log.info("KRF hot reload: %s in %.0f ms%s", ", ".join(sorted(set(swapped))), elapsed,
+                 " (rules rebuilt)" if rebuild else "")
+    return len(swapped)
+
+
+async def _watch():
+    """Run reload passes on inotify events, or every KRF_WATCH_POLL_S, until cancelled."""
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+    notify = None
+    try:
+        notify = _Inotify()
+        for directory in _watch_dirs():
+            notify.watch(directory)
+        loop.add_reader(notify.fd, lambda: notify.drain() and changed.set())
+    except (OSError, AttributeError) as e:
+        if notify is not None:
+            notify.close()
+            notify = None
+        log.info("KRF watch: inotify unavailable (%s); polling every %.1f s", e, Config.KRF_WATCH_POLL_S)
+    _watch_stats["mode"] = "inotify" if notify else "poll"
+
+    try:
+        while True:
+            if notify is None:
+                await asyncio.sleep(Config.KRF_WATCH_POLL_S)
+            else:
+                await changed.wait()
+                await asyncio.sleep(_WATCH_SETTLE_S)
+                changed.clear()
+                try:
+                    for directory in _watch_dirs():  # picks up new subdirectories
+                        notify.watch(directory)
+                except OSError as e:
+                    log.warning("KRF watch: %s", e)
+            try:
+                await reload_changed()
+            except Exception:
+                log.exception("KRF hot reload failed")
+    finally:
+        if notify is not None:
+            loop.remove_reader(notify.fd)
+            notify.close()
+
+
+def start_krf_watcher():
+    """Start hot reload in the background (no-op unless KRF_WATCH)."""
+    global _watch_task
+    if Config.KRF_WATCH and _watch_task is None:
+        _watch_task = asyncio.get_running_loop().create_task(_watch())
+
+
+async def stop_krf_watcher():
+    global _watch_task
+    if _watch_task is not None:
+        _watch_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await _watch_task
+        _watch_task = None
+
+
+def watch_stats() -> dict | None:
+    return dict(_watch_stats) if _watch_task else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 5. FORWARD-CHAINING RULES
+# ═══════════════════════════════════════════════════════════════════════════
+# (implies antecedent consequent) facts whose antecedent is a conjunction
+# of positive literals and comparison tests are compiled to Horn form and
+# joined over the posting lists, cheapest literal first, to fixpoint
+# semi-naively: each round binds one literal to only the facts that
+# arrived in the round before. Derived facts go into a separate KRFIndex layer under the
+# rule's microtheory, with the rule's source location as provenance.
+# Rules using not/or/thereExists/forAll are not monotone (or need
+# existentials) and are skipped, so merging a tier only ever adds
+# consequences; unloading one rebuilds the layer.
+
+_rules: "_RuleEngine | None" = None
+
+_COMPARISONS = {
+    "greaterThan": operator.gt,
+    "lessThan": operator.lt,
+    "greaterThanOrEqual": operator.ge,
+    "greaterThanOrEqualTo": operator.ge,
+    "lessThanOrEqual": operator.le,
+    "lessThanOrEqualTo": operator.le,
+    "equals": operator.eq,
+    "different": operator.ne,
+}
+_NON_HORN = frozenset({"and", "not", "or", "thereExists", "forAll", "implies"})
+
+
+def _is_var(x) -> bool:
+    return isinstance(x, str) and x.startswith("?")
+
+
+def _pattern_vars(pattern) -> set[str]:
+    if isinstance(pattern, tuple):
+        return set().union(*map(_pattern_vars, pattern)) if pattern else set()
+    return {pattern} if _is_var(pattern) else set()
+
+
+@lru_cache(maxsize=None)
+def _literal_vars(lit: tuple) -> frozenset[str]:
+    return frozenset(_pattern_vars(lit[1:]))
+
+
+def _unify(pattern, value, binding: dict) -> dict | None:
+    """Extend `binding` so `pattern` matches `value`, or None."""
+    if isinstance(pattern, str):
+        if not pattern.startswith("?"):
+            return binding if pattern == value else None
+        bound = binding.get(pattern)
+        if bound is None:
+            binding = dict(binding)
+            binding[pattern] = value
+            return binding
+        return binding if bound == value else None
+    if not isinstance(value, tuple) or len(value) != len(pattern):
+        return None
+    for p, v in zip(pattern, value):
+        binding = _unify(p, v, binding)
+        if binding is None:
+            return None
+    return binding
+
+
+def _substitute(pattern, binding: dict):
+    if isinstance(pattern, tuple):
+        return tuple(_substitute(p, binding) for p in pattern)
+    return binding.get(pattern, pattern) if _is_var(pattern) else pattern
+
+
+def _compare(test: tuple, binding: dict) -> bool:
+    """Evaluate a comparison literal; numbers compare numerically, other atoms by name."""
+    a, b = (_substitute(x, binding) for x in test[1:])
+    try:
+        a, b = float(unquote(a)), float(unquote(b))
+    except (TypeError, ValueError):
+        if test[0] not in ("equals", "different"):
+            return False
+    return _COMPARISONS[test[0]](a, b)
+
+
+@dataclass(slots=True)
+class _Rule:
+    origin: Fact                      # the implies fact, for microtheory and provenance
+    body: tuple[tuple, ...]           # positive literals
+    tests: tuple[tuple, ...]          # comparison literals
+    heads: tuple[tuple, ...]          # consequents
+
+
+def _compile_rule(fact: Fact) -> _Rule | None:
+    """Horn form of an implies fact, or None when it is not monotone or not safe."""
+    if len(fact.args) != 2 or not all(isinstance(a, tuple) and a for a in fact.args):
+        return None
+    antecedent, consequent = fact.args
+    literals = antecedent[1:] if antecedent[0] == "and" else (antecedent,)
+    heads = consequent[1:] if consequent[0] == "and" else (consequent,)
+    body, tests = [], []
+    for lit in chain(literals, heads):
+        if not isinstance(lit, tuple) or len(lit) < 2 or not isinstance(lit[0], str):
+            return None
+        if _is_var(lit[0]) or lit[0] in _NON_HORN:
+            return None
+    for lit in literals:
+        if lit[0] in _COMPARISONS:
+            if len(lit) != 3:
+                return None
+            tests.append(lit)
+        else:
+            body.append(lit)
+    bound = set().union(*(_pattern_vars(lit[1:]) for lit in body)) if body else set()
+    if not body or any(not _pattern_vars(lit[1:]) <= bound for lit in chain(tests, heads)):
+        return None
+    return _Rule(fact, tuple(body), tuple(tests), tuple(heads))
+
+
+class _RuleEngine:
+    """Semi-naive forward chaining over the base index's implies rules.
+
+    `derived` holds the materialized consequences; `update` is called
+    with the fact IDs each merge adds and runs every rule to fixpoint.
+    """
+
+    def __init__(self):
+        self.rules: list[_Rule] = []
+        self.skipped = 0
+        self.derived = KRFIndex()
+        self.known: set[tuple] = set()  # (predicate, args) of every derived fact
+        self.rounds = 0
+        self.capped = False
+        self.update_ms = 0.0
+        self._below: dict[str, frozenset[str]] = {}
+
+    @classmethod
+    def build(cls, idx: KRFIndex) -> "_RuleEngine":
+        engine = cls()
+        engine.update(idx, range(len(idx.fact_args)))
+        return engine
+
+    def stats(self) -> dict:
+        return {
+            "rules": len(self.rules),
+            "skipped": self.skipped,
+            "derived": self.derived.total_facts,
+            "rounds": self.rounds,
+            "capped": self.capped,
+            "last_update_ms": round(self.update_ms, 1),
+        }
+
+    # ── Matching ──
+
+    def _collections_below(self, idx: KRFIndex, coll: str) -> frozenset[str]:
+        """`coll` and every collection under it by genls, so (isa ?X C) sees subtypes."""
+        below = self._below.get(coll)
+        if below is None:
+            seen, stack = {coll}, [coll]
+            while stack:
+                for sub in idx.genls_specs.get(stack.pop(), ()):
+                    if sub not in seen:
+                        seen.add(sub)
+                        stack.append(sub)
+            below = self._below[coll] = frozenset(seen)
+        return below
+
+    def _isa_scope(self, idx: KRFIndex, lit: tuple, binding: dict) -> frozenset[str] | None:
+        if lit[0] != "isa" or len(lit) != 3:
+            return None
+        coll = _substitute(lit[2], binding)
+        return self._collections_below(idx, coll) if isinstance(coll, str) and not _is_var(coll) else None
+
+    def _match(self, lit: tuple, args: tuple, binding: dict, colls: frozenset[str] | None) -> dict | None:
+        if len(args) != len(lit) - 1:
+            return None
+        if colls is not None:
+            return _unify(lit[1], args[0], binding) if args[1] in colls else None
+        out = binding
+        for pattern, value in zip(lit[1:], args):
+            if not isinstance(pattern, str):
+                out = _unify(pattern, value, out)
+                if out is None:
+                    return None
+            elif pattern[0] != "?":
+                if pattern != value:
+                    return None
+            else:
+                bound = out.get(pattern)
+                if bound is None:
+                    if out is binding:
+                        out = dict(binding)
+                    out[pattern] = value
+                elif bound != value:
+                    return None
+        return out
+
+    def _candidates(self, layer: KRFIndex, lit: tuple, binding: dict,
+                    colls: frozenset[str] | None, among: list[int] | None = None) -> Iterable[int]:
+        """Facts of `layer` that may match `lit`: the shortest of its predicate's
+        posting list (or `among`, a sorted subset of it) and those of its
+        bound atoms, probed by predicate."""
+        best = layer.by_predicate.get(lit[0]) if among is None else among
+        if not best:
+            return ()
+        pred_postings = best
+        for pos, pattern in enumerate(lit[1:]):
+            if colls is not None and pos == 1:
+                postings = _MergedPostings([layer.by_entity[c] for c in colls if c in layer.by_entity])
+            else:
+                value = _substitute(pattern, binding)
+                if not isinstance(value, str) or _is_var(value) or value.startswith('"'):
+                    continue
+                postings = layer.by_entity.get(value, ())
+            if len(postings) < len(best):
+                best = postings
+                if not best:
+                    return ()
+        if best is pred_postings:
+            return best
+        if among is not None:
+            among = set(among)
+            return (fid for fid in best if fid in among)
+        sym = layer.symbols.ids[lit[0]]
+        return (fid for fid in best if layer.fact_pred[fid] == sym)
+
+    def _estimate(self, idx: KRFIndex, lit: tuple, binding: dict) -> int:
+        """Candidate count for `lit` under `binding`, from posting lengths."""
+        colls = self._isa_scope(idx, lit, binding)
+        total = 0
+        for layer in (idx, self.derived):
+            best = len(layer.by_predicate.get(lit[0], ()))
+            if colls is not None:
+                best = min(best, sum(len(layer.by_entity.get(c, ())) for c in colls))
+            for pattern in lit[1:2] if colls is not None else lit[1:]:
+                value = binding.get(pattern, pattern) if isinstance(pattern, str) else None
+                if isinstance(value, str) and value[0] not in '?"':
+                    best = min(best, len(layer.by_entity.get(value, ())))
+            total += best
+        return total
+
+    def _solve(self, idx: KRFIndex, lits: tuple, tests: tuple, binding: dict, out: list):
+        """Join `lits` under `binding`, appending each complete binding to `out`.
+
+        The plan is chosen as the join goes: each step takes the literal
+        with the fewest candidates given what is bound so far, and each
+        test runs as soon as its variables are bound.
+        """
+        if tests:
+            waiting = []
+            for test in tests:
+                if _literal_vars(test) <= binding.keys():
+                    if not _compare(test, binding):
+                        return
+                else:
+                    waiting.append(test)
+            tests = tuple(waiting)
+        if not lits:
+            out.append(binding)
+            return
+        i = 0
+        if len(lits) > 1:
+            i = min(range(len(lits)), key=lambda j: self._estimate(idx, lits[j], binding))
+        lit, rest = lits[i], lits[:i] + lits[i + 1:]
+        colls = self._isa_scope(idx, lit, binding)
+        for layer in (idx, self.derived):
+            for fid in self._candidates(layer, lit, binding, colls):
+                b = self._match(lit, layer.fact_args[fid], binding, colls)
+                if b is not None:
+                    self._solve(idx, rest, tests, b, out)
+
+    # ── Fixpoint ──
+
+    def _entailed(self, idx: KRFIndex, pred: str, args: tuple) -> bool:
+        """Whether the base index already states (pred args), directly or by genls."""
+        if (pred, args) in self.known:
+            return True
+        if pred == "isa" and len(args) == 2:
+            colls = idx.isa_map.get(args[0], ())
+            if args[1] in colls or any(args[1] in idx.genls_closure.get(c, ()) for c in colls):
+                return True
+        atoms = [a for a in args if isinstance(a, str) and not a.startswith('"')]
+        postings = min((idx.by_entity.get(a, ()) for a in atoms), key=len, default=None)
+        if postings is None:
+            postings = idx.by_predicate.get(pred, ())
+        sym = idx.symbols.ids.get(pred)
+        return any(idx.fact_pred[fid] == sym and idx.fact_args[fid] == args for fid in postings)
+
+    def _delta(self, layer: KRFIndex, fids: Iterable[int]) -> dict[str, list[int]]:
+        by_pred = defaultdict(list)
+        for fid in fids:
+            by_pred[layer.predicate(fid)].append(fid)
+        return by_pred
+
+    def _emit(self, idx: KRFIndex, rule: _Rule, bindings: list[dict], out: list[Fact]):
+        """Instantiate the rule's heads, keeping consequences not already known."""
+        origin = rule.origin
+        for binding in bindings:
+            for head in rule.heads:
+                args = _substitute(head[1:], binding)
+                if self._entailed(idx, head[0], args):
+                    continue
+                if len(self.known) >= Config.KRF_RULES_MAX_DERIVED:
+                    if not self.capped:
+                        log.warning("KRF rules: stopped at KRF_RULES_MAX_DERIVED=%d derived facts",
+                                    Config.KRF_RULES_MAX_DERIVED)
+                    self.capped = True
+                    return
+                self.known.add((head[0], args))
+                out.append(Fact(head[0], args, origin.microtheory, origin.source_file,
+                                origin.line_hint, origin.start, origin.end))
+
+    def _fire(self, idx: KRFIndex, rules: list[_Rule],
+              deltas: list[tuple[KRFIndex, dict[str, list[int]]]]) -> list[Fact]:
+        """Consequences of `rules` from joins that use at least one delta fact."""
+        out: list[Fact] = []
+        for rule in rules:
+            for i, lit in enumerate(rule.body):
+                rest = rule.body[:i] + rule.body[i + 1:]
+                colls = self._isa_scope(idx, lit, {})
+                for layer, delta in deltas:
+                    bindings = []
+                    for fid in self._candidates(layer, lit, {}, colls, delta.get(lit[0], [])):
+                        first = self._match(lit, layer.fact_args[fid], {}, colls)
+                        if first is not None:
+                            self._solve(idx, rest, rule.tests, first, bindings)
+                    self._emit(idx, rule, bindings, out)
+        return out
+
+    def updated(self, idx: KRFIndex, new_fids: Sequence[int]) -> "_RuleEngine":
+        """A copy of this engine brought up to date by update() (sync, for asyncio.to_thread).
+
+        This engine is left as it was, so queries can keep reading its
+        derived layer until the copy is swapped in.
+        """
+        engine = copy.copy(self)
+        engine.rules = list(self.rules)
+        engine.known = set(self.known)
+        engine.derived = self.derived.copy()
+        engine._below = {}
+        engine.update(idx, new_fids)
+        return engine
+
+    def update(self, idx: KRFIndex, new_fids: Sequence[int]):
+        """Bring `derived` up to date after base facts `new_fids` were added to `idx`."""
+        t0 = time.perf_counter()
+        self._below.clear()
+        base_delta = self._delta(idx, new_fids)
+
+        new_rules = []
+        for fid in base_delta.get("implies", ()):
+            rule = _compile_rule(idx.fact(fid))
+            if rule is None:
+                self.skipped += 1
+            else:
+                new_rules.append(rule)
+
+        # A new (genls Sub Sup) lets older isa facts under Sub match literals on Sup
+        isa_delta = set(base_delta.get("isa", ()))
+        for fid in base_delta.get("genls", ()):
+            sub = idx.fact_args[fid][0]
+            if isinstance(sub, str):
+                for coll in self._collections_below(idx, sub):
+                    isa_delta.update(f for f in idx.by_entity.get(coll, ())
+                                     if idx.predicate(f) == "isa" and idx.fact_args[f][1:2] == (coll,))
+        if isa_delta:
+            base_delta["isa"] = sorted(isa_delta)
+
+        # Round 0: known rules over the new facts, new rules over everything
+        pending = self._fire(idx, self.rules, [(idx, base_delta)])
+        for rule in new_rules:
+            bindings = []
+            self._solve(idx, rule.body, rule.tests, {}, bindings)
+            self._emit(idx, rule, bindings, pending)
+        self.rules.extend(new_rules)
+
+        # Later rounds: every rule over what the previous round derived
+        while pending:
+            start = len(self.derived.fact_args)
+            self.derived.ingest(pending)
+            self.rounds += 1
+            if self.capped:
+                break
+            fresh = self._delta(self.derived, range(start, len(self.derived.fact_args)))
+            pending = self._fire(idx, self.rules, [(self.derived, fresh)])
+        self.update_ms = (time.perf_counter() - t0) * 1000
+
 
-    log.info("KRF domain '%s' loaded: %d files, %d facts", domain, file_count, len(facts))
-    return f"Loaded '{domain}': {file_count} files, {len(facts)} facts. Total index: {_index.total_facts} facts."
+def rules_stats() -> dict | None:
+    return _rules.stats() if _rules else None
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 5. QUERY ENGINE
+# 6. PREDICTIVE PREFETCH
+# ═══════════════════════════════════════════════════════════════════════════
+# STT transcripts and SMS bodies are matched against keywords drawn from
+# the names each on-demand tier declares; a match starts load_domain in
+# the background so the tier is usually in memory before Claude asks.
+
+_prefetcher: "_Prefetcher | None" = None
+
+_DECLARED_RE = re.compile(r'\((?:isa|in-microtheory)\s+([^\s()";?][^\s()";]*)')
+_NAME_WORD_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+_TEXT_WORD_RE = re.compile(r'[a-z0-9]+')
+_PREFETCH_STOPWORDS = frozenset({
+    "about", "could", "from", "have", "into", "just", "know", "like", "more",
+    "over", "should", "some", "than", "that", "them", "then", "there", "they",
+    "this", "what", "when", "where", "which", "will", "with", "would", "your",
+})
+
+
+def _name_keywords(name: str) -> set[str]:
+    """Lowercase words of an entity name (CamelCase/hyphen split) plus the whole name."""
+    words = {w.lower() for w in _NAME_WORD_RE.findall(name) if len(w) >= 4 and not w.isdigit()}
+    whole = _NAME_SEP_RE.sub('', name.lower())
+    if len(whole) >= 4:
+        words.add(whole)
+    return words - _PREFETCH_STOPWORDS
+
+
+class _Prefetcher:
+    """Starts loading on-demand tiers that the conversation points at.
+
+    Hit rate is hits / started: a prefetched tier is a hit once a
+    load_domain or query_krf call asks for it. `missed` counts blocking
+    load_domain calls for tiers that were never prefetched.
+    """
+
+    def __init__(self, keywords: dict[str, str]):
+        self.keywords = keywords        # keyword -> the one on-demand tier using it
+        self.pending: set[str] = set()  # prefetched, not yet asked for
+        self.tasks: dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.hits = 0
+        self.missed = 0
+        self.skipped_memory = 0
+
+    @classmethod
+    def build(cls, loaded_names: Iterable[str]) -> "_Prefetcher":
+        """Scan on-demand tier files for declared names (sync, for asyncio.to_thread).
+
+        Keywords shared by two tiers, or already used by loaded entities,
+        carry no signal and are dropped.
+        """
+        owners: dict[str, set[str]] = defaultdict(set)
+        tiers = [name for name, cfg in _TIERS.items() if not cfg["auto"]]
+        for tier_name in tiers:
+            for path in _resolve_tier_files(tier_name):
+                try:
+                    text = path.read_text(encoding="utf-8")
+                except OSError:
+                    continue
+                for name in _DECLARED_RE.findall(text):
+                    for word in _name_keywords(name):
+                        owners[word].add(tier_name)
+
+        loaded_words = set()
+        for name in loaded_names:
+            loaded_words |= _name_keywords(name)
+        keywords = {w: next(iter(tiers)) for w, tiers in owners.items()
+                    if len(tiers) == 1 and w not in loaded_words}
+        log.info("KRF prefetch: %d keywords over %d on-demand tiers", len(keywords), len(tiers))
+        return cls(keywords)
+
+    def tiers_for(self, text: str) -> Counter:
+        """Keyword hits per tier in free text (words and joined word runs)."""
+        words = _TEXT_WORD_RE.findall(text.lower())
+        grams = set(words)
+        grams.update(a + b for a, b in zip(words, words[1:]))
+        grams.update(a + b + c for a, b, c in zip(words, words[1:], words[2:]))
+        return Counter(self.keywords[g] for g in grams if g in self.keywords)
+
+    def _fits(self, tier_name: str) -> bool:
+        budget = Config.KRF_PREFETCH_MAX_RSS_MB * 2**20
+        if budget <= 0:
+            return True
+        projected = sum(_tier_source_bytes(t) for t in (*self.tasks, tier_name))
+        return _rss_bytes() + projected * _INDEX_BYTES_PER_SOURCE_BYTE <= budget
+
+    def observe(self, text: str) -> list[str]:
+        """Start background loads for tiers `text` points at. Returns them."""
+        if _index is None:
+            return []
+        started = []
+        for tier_name, hits in self.tiers_for(text).most_common():
+            if (hits < Config.KRF_PREFETCH_MIN_HITS or tier_name in _index.loaded_tiers
+                    or tier_name in self.tasks):
+                continue
+            if not self._fits(tier_name):
+                self.skipped_memory += 1
+                log.info("KRF prefetch: skipping '%s' (memory budget)", tier_name)
+                continue
+            # Never evict for a guess; only explicit requests page tiers out
+            task = asyncio.get_running_loop().create_task(load_domain(tier_name, evict=False))
+            task.add_done_callback(lambda _t, name=tier_name: self.tasks.pop(name, None))
+            self.tasks[tier_name] = task
+            self.pending.add(tier_name)
+            self.started += 1
+            started.append(tier_name)
+            log.info("KRF prefetch: loading '%s' (%d keyword hits)", tier_name, hits)
+        return started
+
+    def note_request(self, tiers: Iterable[str], blocking: bool = False):
+        """Record that a tool call needed `tiers`; `blocking` for load_domain."""
+        for tier_name in tiers:
+            if tier_name in self.pending:
+                self.pending.discard(tier_name)
+                self.hits += 1
+            elif blocking and _index is not None and tier_name not in _index.loaded_tiers:
+                self.missed += 1
+
+    def stats(self) -> dict:
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.started, 3) if self.started else None,
+            "unused": len(self.pending),
+            "missed": self.missed,
+            "skipped_memory": self.skipped_memory,
+            "in_flight": sorted(self.tasks),
+        }
+
+
+def prefetch_for_text(text: str) -> list[str]:
+    """Hook for STT transcripts and SMS bodies; a no-op until init or when disabled."""
+    if _prefetcher is None or not text:
+        return []
+    return _prefetcher.observe(text)
+
+
+def prefetch_stats() -> dict | None:
+    return _prefetcher.stats() if _prefetcher else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 7. QUERY ENGINE
 # ═══════════════════════════════════════════════════════════════════════════
 
 def _format_entity_mini(entity: str, idx: KRFIndex) -> str:
@@ -591,9 +2518,10 @@ def _format_entity_mini(entity: str, idx: KRFIndex) -> str:
             break
 
     # Key relationships (up to 5)
-    edges = idx.edges_from.get(entity, [])
+    edges = idx.edges_from.get(entity, ())
     if edges:
-        for pred, args in edges[:5]:
+        for fid in edges[:5]:
+            pred, args = idx.predicate(fid), idx.fact_args[fid]
             targets = [a for a in args[1:] if isinstance(a, str) and not a.startswith("?")]
             if targets:
                 lines.append(f"    {pred} -> {', '.join(targets)}")
@@ -603,9 +2531,78 @@ def _format_entity_mini(entity: str, idx: KRFIndex) -> str:
     return "\n".join(lines)
 
 
+def _summarize_entity(entity: str, idx: KRFIndex, top_n: int) -> tuple:
+    """Profile summary record for `entity` in `idx`.
+
+    Returns (attributes, attribute_count, outgoing, outgoing_count,
+    incoming, incoming_count, sources): the first `top_n` (key, value)
+    attribute pairs in key order and the first `top_n` rendered edge
+    lines, with their full counts and the sorted source files.
+    """
+    attrs = idx.attributes.get(entity, {})
+    attr_top = []
+    for k, vals in sorted(attrs.items()):
+        attr_top.extend((k, v) for v in vals[:top_n - len(attr_top)])
+        if len(attr_top) >= top_n:
+            break
+
+    edges = idx.edges_from.get(entity, ())
+    outgoing = []
+    for fid in edges[:top_n]:
+        pred, args = idx.predicate(fid), idx.fact_args[fid]
+        targets = [a for a in args[1:] if isinstance(a, str) and not a.startswith("?")]
+        if targets:
+            outgoing.append(f"{pred} -> {', '.join(targets)}")
+        else:
+            outgoing.append(f"{pred} {' '.join(render(a, check=False) for a in args[1:])}")
+
+    edges_in = idx.edges_to.get(entity, ())
+    incoming = []
+    for fid in edges_in[:top_n]:
+        args = idx.fact_args[fid]
+        source = args[0] if len(args) > 0 and isinstance(args[0], str) else "?"
+        incoming.append(f"{source} -> {idx.predicate(fid)}")
+
+    sources = tuple(sorted({idx.source_file(f) for f in idx.by_entity.get(entity, ())}))
+    return (tuple(attr_top), sum(map(len, attrs.values())), tuple(outgoing), len(edges),
+            tuple(incoming), len(edges_in), sources)
+
+
+def _stored_summary(entity: str, idx: KRFIndex) -> tuple | None:
+    """Combine `entity`'s records from the tier profile files.
+
+    None unless every fact of `idx` belongs to a tier whose profiles were
+    mapped when it was loaded. Tiers are combined in fact-ID order, which
+    is the order the index itself lists attribute values and edges in.
+    """
+    records = []
+    covered = 0
+    for tier_name, (start, end, _) in sorted(idx.tier_spans.items(), key=lambda kv: kv[1][0]):
+        profiles = _tier_profiles.get(tier_name)
+        if profiles is None or profiles.facts != end - start:
+            return None
+        covered += end - start
+        if (record := profiles.get(entity)) is not None:
+            records.append(record)
+    if covered != len(idx.fact_args) or not records:
+        return None
+    if len(records) == 1:
+        return records[0]
+    attrs, n_attrs, out, n_out, inc, n_in, sources = zip(*records)
+    return (tuple(sorted(chain.from_iterable(attrs), key=lambda kv: kv[0])[:_PROFILE_TOP_N]),
+            sum(n_attrs), tuple(chain.from_iterable(out))[:_PROFILE_TOP_N], sum(n_out),
+            tuple(chain.from_iterable(inc))[:_PROFILE_TOP_N], sum(n_in),
+            tuple(sorted(set(chain.from_iterable(sources)))))
+
+
 def _format_entity_profile(entity: str, idx: KRFIndex, attr_filter: str | None = None,
                            limit: int = 50) -> str:
-    """Format a structured entity profile."""
+    """Format a structured entity profile.
+
+    Rendered from the tiers' precomputed summaries when they cover the
+    request; attribute filtering and limits above _PROFILE_TOP_N read the
+    full index instead.
+    """
     lines = []
 
     # Identity
@@ -620,10 +2617,17 @@ def _format_entity_profile(entity: str, idx: KRFIndex, attr_filter: str | None =
     if collections:
         lines.append(f"  Collections: {', '.join(sorted(collections))}")
 
+    summary = None
+    if not attr_filter and 0 < limit <= _PROFILE_TOP_N:
+        summary = _stored_summary(entity, idx)
+    if summary is None:
+        summary = _summarize_entity(entity, idx, max(limit, 1))
+    attr_top, n_attrs, outgoing, n_out, incoming, n_in, sources = summary
+
     # Attributes
-    attrs = idx.attributes.get(entity, {})
-    if attrs:
-        if attr_filter:
+    if attr_filter:
+        attrs = idx.attributes.get(entity, {})
+        if attrs:
             # Filter to specific attribute
             matching = {}
             attr_lower = attr_filter.lower()
@@ -637,68 +2641,116 @@ def _format_entity_profile(entity: str, idx: KRFIndex, attr_filter: str | None =
                         lines.append(f"    {k}: {v}")
             else:
                 lines.append(f"  No attribute matching '{attr_filter}'")
-        else:
-            lines.append("  Attributes:")
-            count = 0
-            for k, vals in sorted(attrs.items()):
-                for v in vals:
-                    lines.append(f"    {k}: {v}")
-                    count += 1
-                    if count >= limit:
-                        lines.append(f"    ... (truncated at {limit})")
-                        break
-                if count >= limit:
-                    break
-
-    # Relationships (edges from)
-    edges = idx.edges_from.get(entity, [])
-    if edges:
-        lines.append("  Relationships (outgoing):")
-        shown = 0
-        for pred, args in edges:
-            targets = [a for a in args[1:] if isinstance(a, str) and not a.startswith("?")]
-            if targets:
-                lines.append(f"    {pred} -> {', '.join(targets)}")
-            else:
-                lines.append(f"    {pred} {' '.join(str(a) for a in args[1:])}")
-            shown += 1
-            if shown >= limit:
+    elif n_attrs:
+        lines.append("  Attributes:")
+        lines.extend(f"    {k}: {v}" for k, v in attr_top[:max(limit, 1)])
+        if n_attrs >= limit:
+            lines.append(f"    ... (truncated at {limit})")
+
+    # Relationships
+    for label, shown, total in (("outgoing", outgoing, n_out), ("incoming", incoming, n_in)):
+        if total:
+            lines.append(f"  Relationships ({label}):")
+            lines.extend(f"    {line}" for line in shown[:max(limit, 1)])
+            if total >= limit:
                 lines.append(f"    ... (truncated at {limit})")
-                break
 
-    # Relationships (edges to)
-    edges_in = idx.edges_to.get(entity, [])
-    if edges_in:
-        lines.append("  Relationships (incoming):")
-        shown = 0
-        for pred, args in edges_in:
-            source = args[0] if len(args) > 0 and isinstance(args[0], str) else "?"
-            lines.append(f"    {source} -> {pred}")
-            shown += 1
-            if shown >= limit:
+    # Consequences of implies rules
+    if _rules is not None:
+        derived = _rules.derived.by_entity.get(entity, ())
+        if derived:
+            lines.append(f"  Derived by rules ({len(derived)}):")
+            lines.extend(f"    {_derived_line(fid, _rules.derived)}" for fid in derived[:max(limit, 1)])
+            if len(derived) > limit:
                 lines.append(f"    ... (truncated at {limit})")
-                break
 
     # Source context
-    facts = idx.by_entity.get(entity, [])
+    facts = idx.by_entity.get(entity, ())
     if facts:
-        sources = set(f.source_file for f in facts)
-        lines.append(f"  Sources: {', '.join(sorted(sources))}")
+        lines.append(f"  Sources: {', '.join(sources)}")
         lines.append(f"  Total facts: {len(facts)}")
 
     return "\n".join(lines)
 
 
-def _format_primitive_listing(primitive: str, idx: KRFIndex, limit: int = 50) -> str:
-    """Format a compact listing of entities of a given primitive type."""
-    entities = idx.by_primitive.get(primitive, set())
+def _sorted_primitive(primitive: str, idx: KRFIndex) -> list[str]:
+    """Entities of a primitive in name order, sorted once per index generation."""
+    cached = _primitive_order.get(primitive)
+    if cached is None or cached[0] != idx.generation:
+        cached = (idx.generation, sorted(idx.by_primitive.get(primitive, ())))
+        _primitive_order[primitive] = cached
+    return cached[1]
+
+
+_primitive_order: dict[str, tuple[int, list[str]]] = {}  # primitive -> (generation, names)
+
+
+class _MtScopes:
+    """genlMt closure over the loaded microtheories, as bitsets.
+
+    Bit i of visible[mt] is set when names[i] is mt itself or a
+    microtheory it inherits from, directly or through other genlMt links.
+    Rebuilt whenever the index generation changes.
+    """
+
+    def __init__(self, idx: KRFIndex):
+        self.generation = idx.generation
+        self.parents: dict[str, set[str]] = defaultdict(set)
+        for fid in idx.by_predicate.get("genlMt", ()):
+            args = idx.fact_args[fid]
+            if len(args) == 2 and isinstance(args[0], str) and isinstance(args[1], str):
+                self.parents[args[0]].add(args[1])
+
+        names = set(idx.by_microtheory).union(self.parents, *self.parents.values())
+        self.names = sorted(names)
+        self.visible = {mt: 1 << i for i, mt in enumerate(self.names)}
+        changed = True
+        while changed:  # to fixpoint, so genlMt cycles are harmless
+            changed = False
+            for mt, sups in self.parents.items():
+                mask = self.visible[mt]
+                for sup in sups:
+                    mask |= self.visible[sup]
+                if mask != self.visible[mt]:
+                    self.visible[mt] = mask
+                    changed = True
+
+    def visible_from(self, mt: str) -> list[str]:
+        """mt first, then every microtheory it inherits from, by name."""
+        mask = self.visible.get(mt, 0)
+        return [mt] + [m for i, m in enumerate(self.names) if mask >> i & 1 and m != mt]
+
+
+_mt_scopes: _MtScopes | None = None
+
+
+def _mt_scopes_for(idx: KRFIndex) -> _MtScopes:
+    global _mt_scopes
+    if _mt_scopes is None or _mt_scopes.generation != idx.generation:
+        _mt_scopes = _MtScopes(idx)
+    return _mt_scopes
+
+
+def _format_primitive_listing(primitive: str, idx: KRFIndex, limit: int = 50,
+                              after: str = "") -> str:
+    """Format a compact listing of entities of a given primitive type.
+
+    Lists the entities named after `after`, which a cursor carries over
+    from the previous page.
+    """
+    entities = _sorted_primitive(primitive, idx)
     if not entities:
         return f"No entities of type {primitive} found. Try loading a domain first (load_domain tool)."
 
-    lines = [f"=== {primitive} entities ({len(entities)} total) ==="]
-    sorted_entities = sorted(entities)
+    start = bisect_right(entities, after) if after else 0
+    page = entities[start:start + limit]
+    if start:
+        lines = [f"=== {primitive} entities ({len(entities)} total, "
+                 f"showing {start + 1}-{start + len(page)}) ==="]
+    else:
+        lines = [f"=== {primitive} entities ({len(entities)} total) ==="]
 
-    for e in sorted_entities[:limit]:
+    for e in page:
         label = ""
         attrs = idx.attributes.get(e, {})
         for key in ("::LABEL", "::TITLE_SHORT", "::ROLE"):
@@ -712,59 +2764,428 @@ def _format_primitive_listing(primitive: str, idx: KRFIndex, limit: int = 50) ->
         else:
             lines.append(f"  {e}")
 
-    if len(entities) > limit:
-        lines.append(f"  ... ({len(entities) - limit} more)")
+    remaining = len(entities) - start - len(page)
+    if remaining > 0:
+        lines.append(f"  ... ({remaining} more)")
+        lines.append(_cursor_line(idx, "p", primitive, a=page[-1]))
 
     return "\n".join(lines)
 
 
-def _format_fact_list(facts: list[Fact], label: str, limit: int = 50) -> str:
-    """Format a generic list of facts."""
-    lines = [f"=== {label} ({len(facts)} facts) ==="]
-    for f in facts[:limit]:
-        # Compact representation
-        args_str = " ".join(
-            _unquote(a) if isinstance(a, str) else str(a)
-            for a in f.args[:4]
-        )
-        lines.append(f"  ({f.predicate} {args_str})")
-        lines.append(f"    [{f.source_file}:{f.line_hint}]")
+# ── Numeric range queries ──
+# where="hasCFM between 15 and 20 and hasListPrice < 3000" is answered from
+# KRFIndex.numeric: each clause is two bisects into its predicate's
+# sorted values, and the subjects found by every clause are intersected,
+# smallest clause first.
+
+_INF = float("inf")
+_WHERE_NUM = r'\$?([-+]?(?:(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d*)?|\.\d+))'
+_WHERE_CLAUSE_RE = re.compile(
+    rf'\s*([A-Za-z][\w\-]*)\s*'
+    rf'(?:(?:between|from)\s+{_WHERE_NUM}\s+(?:and|to)\s+{_WHERE_NUM}|(<=|>=|<|>|==?)\s*{_WHERE_NUM})?'
+    rf'\s*(?:(?:\band\b|,)\s*|$)', re.I)
+
+
+def _parse_where(where: str) -> list[tuple[str, float, float, bool, bool]]:
+    """Clauses of a where filter as (predicate, lo, hi, lo_open, hi_open).
+
+    Raises ValueError with a user-facing message. A bare predicate name
+    matches any value.
+    """
+    clauses = []
+    pos = 0
+    while pos < len(where):
+        m = _WHERE_CLAUSE_RE.match(where, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Could not read the where filter at '{where[pos:]}'. Use clauses like "
+                             "'hasCFM between 15 and 20' or 'hasListPrice < 3000', joined by 'and'.")
+        pred, lo, hi, op, value = m.groups()
+        if lo is not None:
+            lo, hi = sorted((float(lo.replace(",", "")), float(hi.replace(",", ""))))
+            clauses.append((pred, lo, hi, False, False))
+        elif op is not None:
+            x = float(value.replace(",", ""))
+            clauses.append((pred,) + {
+                "<": (-_INF, x, False, True), "<=": (-_INF, x, False, False),
+                ">": (x, _INF, True, False), ">=": (x, _INF, False, False),
+            }.get(op, (x, x, False, False)))
+        else:
+            clauses.append((pred, -_INF, _INF, False, False))
+        pos = m.end()
+    if not clauses:
+        raise ValueError("Empty where filter.")
+    return clauses
+
+
+def _format_number(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _format_numeric_query(where: str, idx: KRFIndex, limit: int = 50, after: str = "") -> str:
+    """Format the entities whose numeric facts satisfy every clause of `where`.
+
+    Entities are listed in name order, from after `after` (carried by a
+    cursor); the first page ends with min/avg/max of each clause's
+    matching values per collection, over all matches.
+    """
+    try:
+        clauses = _parse_where(where)
+    except ValueError as e:
+        return str(e)
+
+    lower = {p.lower(): p for p in idx.numeric}
+    resolved = []  # (predicate, positions in its column)
+    for pred, lo, hi, lo_open, hi_open in clauses:
+        name = pred if pred in idx.numeric else lower.get(pred.lower())
+        if name is None:
+            known = sorted(idx.numeric, key=lambda p: -len(idx.numeric[p]))[:12]
+            hint = (f" Numeric predicates loaded: {', '.join(known)}." if known
+                    else " Try loading the compressors domain first (load_domain tool).")
+            return f"No numeric facts for '{pred}'.{hint}"
+        resolved.append((name, idx.numeric[name].range(lo, hi, lo_open, hi_open)))
+
+    # entity -> predicate -> matching values, narrowed clause by clause
+    rows: dict[str, dict[str, list[float]]] | None = None
+    fids = []
+    for name, span in sorted(resolved, key=lambda r: r[1].stop - r[1].start):
+        column = idx.numeric[name]
+        found: dict[str, dict[str, list[float]]] = {}
+        for value, fid in zip(column.values[span], column.fids[span]):
+            subj = idx.fact_args[fid][0]
+            if not isinstance(subj, str) or (rows is not None and subj not in rows):
+                continue
+            entry = found.get(subj)
+            if entry is None:
+                entry = found[subj] = dict(rows[subj]) if rows is not None else {}
+                entry[name] = []
+            entry[name].append(value)
+            fids.append(fid)
+        rows = found
+        if not rows:
+            break
+    preds = list(dict.fromkeys(name for name, _ in resolved))
+    if not rows:
+        return f"No entities with {where}."
+    _touch_tiers(idx.tiers_of(sorted(fids)))
+
+    names = sorted(rows)
+    start = bisect_right(names, after) if after else 0
+    page = names[start:start + limit]
+    if start:
+        lines = [f"=== where {where} ({len(names)} entities, showing {start + 1}-{start + len(page)}) ==="]
+    else:
+        lines = [f"=== where {where} ({len(names)} entities) ==="]
+    for e in page:
+        values = "; ".join(f"{p} {', '.join(map(_format_number, rows[e][p]))}" for p in preds)
+        lines.append(f"  {e} — {values}")
+    remaining = len(names) - start - len(page)
+    if remaining > 0:
+        lines.append(f"  ... ({remaining} more)")
+        lines.append(_cursor_line(idx, "w", where, a=page[-1]))
+
+    if not start:
+        by_coll = defaultdict(list)
+        for e in names:
+            for coll in idx.isa_map.get(e) or ("(no collection)",):
+                by_coll[coll].append(e)
+        ranked = sorted(by_coll.items(), key=lambda kv: (-len(kv[1]), kv[0]))
+        lines.append("By collection (min / avg / max):")
+        for coll, members in ranked[:15]:
+            stats = []
+            for p in preds:
+                values = [v for e in members for v in rows[e][p]]
+                stats.append(f"{p} {_format_number(min(values))} / "
+                             f"{_format_number(sum(values) / len(values))} / {_format_number(max(values))}")
+            lines.append(f"  {coll} ({len(members)}): {'; '.join(stats)}")
+        if len(ranked) > 15:
+            lines.append(f"  ... ({len(ranked) - 15} more collections)")
+
+    return "\n".join(lines)
+
+
+# ── Full-text search ──
+# search_text ranks facts by BM25 over the terms of their quoted strings
+# (comments, names, quoted attribute values and other literals), read
+# from KRFIndex.by_term. Scores depend on corpus-wide statistics, so a
+# cursor is only good for the index generation that issued it.
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_SNIPPET_CHARS = 160
+
+
+_text_stats: tuple[int, int, int] = (0, 0, 0)  # (generation, facts with text, total terms)
+
 
+def _bm25(terms: list[str], idx: KRFIndex) -> dict[int, float]:
+    """BM25 score of every fact containing at least one of `terms`."""
+    global _text_stats
+    lengths = idx.fact_terms
+    if _text_stats[0] != idx.generation:
+        _text_stats = (idx.generation, len(lengths) - lengths.count(0), sum(lengths))
+    _, docs, total = _text_stats
+    if not docs:
+        return {}
+    norm = _BM25_K1 * (1 - _BM25_B)
+    scale = _BM25_K1 * _BM25_B * docs / total  # k1 * b / avgdl
+    scores: dict[int, float] = defaultdict(float)
+    for term in dict.fromkeys(terms):
+        fids = idx.by_term.get(term)
+        if not fids:
+            continue
+        idf = math.log(1 + (docs - len(fids) + 0.5) / (len(fids) + 0.5))
+        for fid, tf in zip(fids, idx.term_counts[term]):
+            scores[fid] += idf * tf * (_BM25_K1 + 1) / (tf + norm + scale * lengths[fid])
+    return scores
+
+
+def _snippet(text: str, terms: set[str], width: int = _SNIPPET_CHARS) -> str:
+    """The `width`-char stretch of `text` covering the most distinct query terms."""
+    if len(text) <= width:
+        return text
+    hits = [(m.start(), t) for m in _TERM_RE.finditer(text.lower()) if (t := _stem(m.group())) in terms]
+    start, best = 0, 0
+    for i, (pos, _) in enumerate(hits):
+        covered = len({t for p, t in hits[i:] if p < pos + width - 20})
+        if covered > best:
+            start, best = max(0, pos - 20), covered
+    if start:
+        space = text.find(" ", start, start + 20)
+        start = space + 1 if space >= 0 else start
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > start else end
+    return ("..." if start else "") + text[start:end] + ("..." if end < len(text) else "")
+
+
+def _format_text_search(query: str, idx: KRFIndex, filters: list, label: str,
+                        limit: int = 50, offset: int = 0) -> str:
+    """Format facts matching `query`, best first, that pass `filters`.
+
+    `offset` skips the results shown on earlier pages.
+    """
+    terms = _text_terms(query)
+    if not terms:
+        return "search_text needs at least one word or number."
+    scores = _bm25(terms, idx)
+    probes = [(column, accepted) for _, column, accepted in filters]
+    ranked = sorted((fid for fid in scores
+                     if all((fid if column is None else column[fid]) in accepted
+                            for column, accepted in probes)),
+                    key=lambda fid: (-scores[fid], fid))
+    if not ranked:
+        return f"No facts matching {label}."
+    page = ranked[offset:offset + limit]
+    _touch_tiers(idx.tiers_of(sorted(page)))
+
+    if offset:
+        lines = [f"=== {label} ({len(ranked)} facts, showing {offset + 1}-{offset + len(page)}) ==="]
+    else:
+        lines = [f"=== {label} ({len(ranked)} facts) ==="]
+    wanted = set(terms)
+    for fid in page:
+        args = idx.fact_args[fid]
+        head = " ".join([idx.predicate(fid)] + [a for a in args if isinstance(a, str) and not a.startswith('"')])
+        lines.append(f"  {head}: {_snippet(_fact_text(args), wanted)}")
+        lines.append(f"    [{idx.source_file(fid)}:{idx.fact_line[fid]}]")
+
+    shown = offset + len(page)
+    if len(ranked) > shown:
+        lines.append(f"  ... ({len(ranked) - shown} more)")
+        lines.append(_cursor_line(idx, "t", label, a=shown))
+    return "\n".join(lines)
+
+
+def _raw_one_line(fact: Fact, max_len: int = 240) -> str:
+    """Source text of a fact with comments dropped and whitespace collapsed."""
+    text = TOKEN_RE.sub(lambda m: "" if m.group().startswith(";;") else m.group(), fact.raw)
+    text = " ".join(text.split())
+    return text if len(text) <= max_len else text[:max_len - 3] + "..."
+
+
+def _format_fact_list(facts: Sequence[int], idx: KRFIndex, label: str, limit: int = 50,
+                      total: int | None = None, offset: int = 0, scope: str | None = None) -> str:
+    """Format a generic list of facts (by fact ID).
+
+    For a follow-up page, `facts` starts at result number `offset` of
+    `total`; a cursor line is added while results remain. Facts from
+    microtheories other than `scope` (inherited ones) name their own.
+    """
+    scope_id = idx.symbols.ids.get(scope) if scope else None
+    page = facts[:limit]
+    if total is None:
+        total = len(facts)
+    if offset:
+        lines = [f"=== {label} ({total} facts, showing {offset + 1}-{offset + len(page)}) ==="]
+    else:
+        lines = [f"=== {label} ({total} facts) ==="]
+    for fid in page:
+        args = idx.fact_args[fid]
+        if any(isinstance(a, tuple) for a in args):
+            # Rules and other nested forms read best as written
+            lines.append(f"  {_raw_one_line(idx.fact(fid))}")
+        else:
+            # Compact representation
+            args_str = " ".join(unquote(a) for a in args[:4])
+            lines.append(f"  ({idx.predicate(fid)} {args_str})")
+        if scope_id is None or idx.fact_mt[fid] == scope_id:
+            lines.append(f"    [{idx.source_file(fid)}:{idx.fact_line[fid]}]")
+        else:
+            lines.append(f"    [{idx.source_file(fid)}:{idx.fact_line[fid]}, "
+                         f"{idx.symbols.names[idx.fact_mt[fid]]}]")
+
+    shown = offset + len(page)
+    if page and total > shown:
+        lines.append(f"  ... ({total - shown} more)")
+        lines.append(_cursor_line(idx, "f", label, a=page[-1], n=shown, t=total))
+
+    return "\n".join(lines)
+
+
+def _derived_line(fid: int, derived: KRFIndex) -> str:
+    """A derived fact with the rule that produced it."""
+    args = " ".join(unquote(a) if isinstance(a, str) else render(a, check=False) for a in derived.fact_args[fid])
+    return f"({derived.predicate(fid)} {args})  [derived by {derived.source_file(fid)}:{derived.fact_line[fid]}]"
+
+
+def _format_derived_list(facts: Sequence[int], derived: KRFIndex, label: str, limit: int = 50) -> str:
+    """Format facts derived by rules; they are not paged, so only `limit` show."""
+    lines = [f"=== {label}, derived by rules ({len(facts)} facts) ==="]
+    lines.extend(f"  {_derived_line(fid, derived)}" for fid in facts[:limit])
     if len(facts) > limit:
         lines.append(f"  ... ({len(facts) - limit} more)")
-
     return "\n".join(lines)
 
 
-def _resolve_predicate(predicate: str, idx: KRFIndex) -> tuple[str, list[Fact]]:
-    """Resolve a predicate name (case-insensitive) to its facts."""
-    facts = idx.by_predicate.get(predicate, [])
-    if facts:
-        return predicate, facts
-    for p, f_list in idx.by_predicate.items():
-        if p.lower() == predicate.lower():
-            return p, f_list
-    return predicate, []
+def _resolve_predicate(predicate: str, idx: KRFIndex) -> tuple[str, Sequence[int]]:
+    """Resolve a predicate name (case-insensitive) to its fact IDs."""
+    name = predicate if predicate in idx.by_predicate else idx.predicate_names.lower.get(predicate.lower())
+    if name is None:
+        return predicate, ()
+    return name, idx.by_predicate[name]
 
 
-def _resolve_microtheory(microtheory: str, idx: KRFIndex) -> tuple[str, list[Fact]]:
-    """Resolve a microtheory name (case-insensitive) to its facts."""
-    facts = idx.by_microtheory.get(microtheory, [])
-    if facts:
-        return microtheory, facts
-    for mt, f_list in idx.by_microtheory.items():
-        if mt.lower() == microtheory.lower():
-            return mt, f_list
-    return microtheory, []
+def _resolve_microtheory(microtheory: str, idx: KRFIndex) -> tuple[str, Sequence[int]]:
+    """Resolve a microtheory name (case-insensitive) to its fact IDs."""
+    name = microtheory if microtheory in idx.by_microtheory else idx.microtheory_names.lower.get(microtheory.lower())
+    if name is None:
+        return microtheory, ()
+    return name, idx.by_microtheory[name]
+
+
+def _did_you_mean(query: str, names: _NameIndex) -> str:
+    suggestions = names.similar(query)
+    return f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+
+
+def _resolve_attribute(attribute: str, idx: KRFIndex) -> Sequence[int]:
+    """hasAttribute fact IDs whose attribute name contains `attribute` (case-insensitive).
+
+    Always a _MergedPostings, even for one name, so probing it as a filter's
+    `accepted` set is a bisect rather than a scan of the array.
+    """
+    attr_lower = attribute.lower()
+    postings = [fids for name, fids in idx.by_attribute.items() if attr_lower in name.lower()]
+    # Each fact has one attribute name, so the lists are disjoint
+    return _MergedPostings(postings)
+
+
+def _run_filters(filters: list[tuple[Sequence[int], Sequence | None, Container]]) -> Sequence[int]:
+    """Intersect query filters, most selective first.
+
+    Each filter is (posting list, column, accepted). Posting lengths are
+    exact selectivities, so the plan is to walk the shortest list and
+    probe the rest: a fact passes a filter when column[fid] is in
+    `accepted`, or when fid itself is (column None). Order stays ascending.
+    """
+    filters = sorted(filters, key=lambda flt: len(flt[0]))
+    facts = filters[0][0]
+    if isinstance(facts, _MergedPostings):
+        facts = sorted(chain.from_iterable(facts.parts))  # timsort merges the runs in C
+    for _, column, accepted in filters[1:]:
+        if not facts:
+            break
+        if column is None:
+            facts = [f for f in facts if f in accepted]
+        else:
+            facts = [f for f in facts if column[f] in accepted]
+    return facts
+
+
+def _scan_filters(filters: list[tuple[Sequence[int], Sequence | None, Container]],
+                  after: int) -> Iterator[int]:
+    """Lazily yield the fact IDs past `after` that pass every filter, ascending.
+
+    Same plan as _run_filters, but resumable: a follow-up page walks the
+    shortest list from `after` and stops once the page is full.
+    """
+    filters = sorted(filters, key=lambda flt: len(flt[0]))
+    probes = [(column, accepted) for _, column, accepted in filters[1:]]
+    for fid in _postings_after(filters[0][0], after):
+        for column, accepted in probes:
+            if (fid if column is None else column[fid]) not in accepted:
+                break
+        else:
+            yield fid
+
+
+# ── Cursors ──
+# A cursor is an opaque token naming where the previous page stopped: the
+# last entity name for primitive listings and numeric range queries, the
+# rank reached for full-text search, the last fact ID otherwise. Fact IDs
+# only move when a tier is unloaded, so fact cursors expire then; new
+# tiers append higher IDs, which later pages simply pick up.
+
+_CURSOR_COUNTS = {"p": (), "w": (), "t": (), "a": ("n",), "f": ("n", "t")}  # int fields besides the position
+_NAMED_CURSORS = frozenset({"p", "w"})  # positioned by entity name
+
+
+def _query_tag(query: str) -> str:
+    return hashlib.blake2s(query.encode(), digest_size=4).hexdigest()
+
+
+def _cursor_line(idx: KRFIndex, kind: str, query: str, **state) -> str:
+    state.update(k=kind, q=_query_tag(query), g=idx.generation)
+    token = base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode())
+    return f"next_cursor: {token.decode().rstrip('=')}"
+
+
+def _read_cursor(cursor: str, kind: str, query: str, idx: KRFIndex) -> dict:
+    """Decode a cursor issued for `query`. Raises ValueError with a user-facing message."""
+    token = cursor.strip()
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        valid = (state["k"] == kind and state["q"] == _query_tag(query)
+                 and isinstance(state["g"], int)
+                 and isinstance(state["a"], str if kind in _NAMED_CURSORS else int)
+                 and all(isinstance(state[f], int) for f in _CURSOR_COUNTS[kind]))
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise ValueError("Invalid cursor for this query. Pass next_cursor back with the same "
+                         "parameters, or repeat the query without a cursor.")
+    if kind not in _NAMED_CURSORS and state["g"] < idx.stable_since:
+        raise ValueError("Cursor expired: a domain was unloaded since it was issued. "
+                         "Repeat the query without a cursor.")
+    return state
 
 
 def _query(entity: str | None = None, predicate: str | None = None,
            microtheory: str | None = None, primitive: str | None = None,
-           attribute: str | None = None, limit: int = 50) -> str:
+           attribute: str | None = None, limit: int = 50, cursor: str | None = None,
+           inherit: bool | None = None, where: str | None = None, search_text: str | None = None) -> str:
     """Execute a query against the KRF index. Returns formatted text.
 
     Filters are intersected: if both predicate and microtheory are given,
-    only facts matching BOTH are returned.
+    only facts matching BOTH are returned. A microtheory also admits the
+    microtheories it inherits through genlMt when `inherit` is on; by default
+    only when combined with another filter, so a plain listing of a
+    microtheory shows its own facts rather than pages of inherited kernel ones.
+    `where` is a numeric range filter over entities instead; `search_text`
+    ranks the facts that pass the other filters by full-text relevance.
+    Listings that do not fit in `limit` end with a next_cursor line;
+    passing it back as `cursor` resumes after the last result shown.
     """
     if _index is None:
         return "Error: KRF index not initialized. Server may still be starting."
@@ -781,6 +3202,8 @@ def _query(entity: str | None = None, predicate: str | None = None,
                 hint = f"\nTip: try loading a domain first: {', '.join(unloaded)}"
             return f"No entity matching '{entity}' found.{hint}"
 
+        for m in matches[:5]:
+            _touch_tiers(idx.tiers_of(idx.by_entity.get(m, ())))
         if len(matches) == 1:
             return _format_entity_profile(matches[0], idx, attr_filter=attribute, limit=limit)
 
@@ -798,71 +3221,146 @@ def _query(entity: str | None = None, predicate: str | None = None,
     # Primitive query — compact listing
     if primitive:
         prim_upper = primitive.upper()
-        if prim_upper not in ("NODE", "EDGE", "METRIC", "SIGNAL", "PROTOCOL"):
+        if prim_upper not in _PRIMITIVE_RANK:
             return f"Invalid primitive '{primitive}'. Must be one of: NODE, EDGE, METRIC, SIGNAL, PROTOCOL"
-        return _format_primitive_listing(prim_upper, idx, limit=limit)
+        try:
+            after = _read_cursor(cursor, "p", prim_upper, idx)["a"] if cursor else ""
+        except ValueError as e:
+            return str(e)
+        return _format_primitive_listing(prim_upper, idx, limit=limit, after=after)
+
+    # Numeric range query — matching entities and per-collection aggregates
+    if where:
+        where = " ".join(where.split())
+        try:
+            after = _read_cursor(cursor, "w", where, idx)["a"] if cursor else ""
+        except ValueError as e:
+            return str(e)
+        return _format_numeric_query(where, idx, limit=limit, after=after)
 
     # ── Combined filter queries (predicate, microtheory, attribute intersect) ──
 
-    # Start with the broadest set, then narrow
-    facts = None
+    filters = []
     label_parts = []
+    # The same filters over facts derived by rules, shown on the first page
+    derived = _rules.derived if _rules is not None else None
+    derived_filters = []
 
     if microtheory:
         mt_name, mt_facts = _resolve_microtheory(microtheory, idx)
         if not mt_facts:
-            return f"No facts in microtheory '{microtheory}'. Use list_microtheories to see available scopes."
-        facts = mt_facts
-        label_parts.append(f"mt:{mt_name}")
+            return (f"No facts in microtheory '{microtheory}'."
+                    f"{_did_you_mean(microtheory, idx.microtheory_names)}"
+                    " Use list_microtheories to see available scopes.")
+        visible = [mt_name]
+        if inherit is None:
+            inherit = bool(predicate or attribute or search_text)
+        if inherit:
+            visible = [m for m in _mt_scopes_for(idx).visible_from(mt_name) if m in idx.by_microtheory]
+        if len(visible) > 1:
+            # Each fact has one microtheory, so the lists are disjoint
+            mt_facts = _MergedPostings([idx.by_microtheory[m] for m in visible])
+            label_parts.append(f"mt:{mt_name} + {len(visible) - 1} inherited")
+        else:
+            label_parts.append(f"mt:{mt_name}")
+        filters.append((mt_facts, idx.fact_mt, {idx.symbols.ids[m] for m in visible}))
+        if derived is not None:
+            derived_filters.append((_MergedPostings([derived.by_microtheory.get(m, ()) for m in visible]),
+                                    derived.fact_mt, {derived.symbols.ids.get(m) for m in visible}))
 
     if predicate:
         pred_name, pred_facts = _resolve_predicate(predicate, idx)
-        if not pred_facts:
-            return f"No facts with predicate '{predicate}' found."
-        if facts is not None:
-            # Intersect: keep only facts that match both
-            pred_set = set(id(f) for f in pred_facts)
-            facts = [f for f in facts if id(f) in pred_set]
-        else:
-            facts = pred_facts
+        derived_facts = ()
+        if derived is not None:
+            if not pred_facts:
+                pred_name, derived_facts = _resolve_predicate(predicate, derived)
+            else:
+                derived_facts = derived.by_predicate.get(pred_name, ())
+        if not pred_facts and not derived_facts:
+            return (f"No facts with predicate '{predicate}' found."
+                    f"{_did_you_mean(predicate, idx.predicate_names)}")
+        filters.append((pred_facts, idx.fact_pred, {idx.symbols.ids.get(pred_name)}))
         label_parts.append(f"pred:{pred_name}")
+        if derived is not None:
+            derived_filters.append((derived_facts, derived.fact_pred, {derived.symbols.ids.get(pred_name)}))
 
     if attribute:
-        attr_lower = attribute.lower()
-        if facts is not None:
-            # Filter existing facts to those with matching attribute
-            facts = [f for f in facts if f.predicate == "hasAttribute"
-                     and len(f.args) >= 2 and isinstance(f.args[1], str)
-                     and attr_lower in f.args[1].lower()]
+        # hasAttribute facts with a matching attribute name
+        attr_facts = _resolve_attribute(attribute, idx)
+        if filters or search_text:
+            filters.append((attr_facts, None, attr_facts))
+            if derived is not None:
+                derived_postings = _resolve_attribute(attribute, derived)
+                derived_filters.append((derived_postings, None, derived_postings))
         else:
-            # Attribute-only query across all entities
+            # Attribute-only query across all entities, in fact order
+            query = f"attr:{attribute}"
+            try:
+                state = _read_cursor(cursor, "a", query, idx) if cursor else {"a": -1, "n": 0}
+            except ValueError as e:
+                return str(e)
             lines = [f"=== Entities with attribute matching '{attribute}' ==="]
-            count = 0
-            for ent, attrs in idx.attributes.items():
-                for k, vals in attrs.items():
-                    if attr_lower in k.lower():
-                        for v in vals:
-                            lines.append(f"  {ent} {k}: {v}")
-                            count += 1
-                            if count >= limit:
-                                break
-                    if count >= limit:
-                        break
-                if count >= limit:
+            shown = state["n"]
+            last = None
+            for fid in _postings_after(attr_facts, state["a"]):
+                triple = _attribute_triple(idx.fact_args[fid])
+                if not (triple and triple[0] and triple[1]):
+                    continue
+                if shown - state["n"] >= limit:
                     lines.append(f"  ... (truncated at {limit})")
+                    lines.append(_cursor_line(idx, "a", query, a=last, n=shown))
                     break
-            if count == 0:
+                lines.append(f"  {triple[0]} {triple[1]}: {triple[2]}")
+                shown += 1
+                last = fid
+            if shown == 0:
                 return f"No attributes matching '{attribute}' found."
             return "\n".join(lines)
         label_parts.append(f"attr:{attribute}")
 
-    if facts is not None:
-        if not facts:
-            return f"No facts matching {' + '.join(label_parts)}."
+    if search_text:
+        query = " ".join(search_text.split())
+        label = " + ".join([f"text:'{query}'"] + label_parts)
+        offset = 0
+        if cursor:
+            try:
+                state = _read_cursor(cursor, "t", label, idx)
+            except ValueError as e:
+                return str(e)
+            if state["g"] != idx.generation:
+                return "Cursor expired: the index changed since it was issued. Repeat the query without a cursor."
+            offset = state["a"]
+        return _format_text_search(query, idx, filters, label, limit=limit, offset=offset)
+
+    if filters:
         label = " + ".join(label_parts)
-        return _format_fact_list(facts, label, limit=limit)
+        if cursor:
+            try:
+                state = _read_cursor(cursor, "f", label, idx)
+            except ValueError as e:
+                return str(e)
+            total = state["t"]
+            if state["g"] != idx.generation:
+                total = len(_run_filters(filters))  # tiers merged since; count again
+            page = list(islice(_scan_filters(filters, state["a"]), limit))
+            _touch_tiers(idx.tiers_of(page))
+            return _format_fact_list(page, idx, label, limit=limit, total=total, offset=state["n"],
+                                     scope=mt_name if microtheory else None)
+        facts = _run_filters(filters)
+        _touch_tiers(idx.tiers_of(facts))
+        extra = _run_filters(derived_filters) if derived_filters else ()
+        if not facts and not extra:
+            return f"No facts matching {' + '.join(label_parts)}."
+        parts = []
+        if facts:
+            parts.append(_format_fact_list(facts, idx, label, limit=limit,
+                                           scope=mt_name if microtheory else None))
+        if extra:
+            parts.append(_format_derived_list(extra, derived, label, limit=limit))
+        return "\n\n".join(parts)
 
-    return "Please provide at least one query parameter: entity, predicate, microtheory, primitive, or attribute."
+    return ("Please provide at least one query parameter: "
+            "entity, predicate, microtheory, primitive, attribute, where, or search_text.")
 
 
 def _list_microtheories() -> str:
@@ -873,9 +3371,12 @@ def _list_microtheories() -> str:
     idx = _index
     lines = ["=== Microtheories ==="]
 
+    scopes = _mt_scopes_for(idx)
     mts = sorted(idx.by_microtheory.items(), key=lambda x: -len(x[1]))
     for mt, facts in mts:
-        lines.append(f"  {mt}: {len(facts)} facts")
+        parents = scopes.parents.get(mt)
+        inherits = f" (inherits {', '.join(sorted(parents))})" if parents else ""
+        lines.append(f"  {mt}: {len(facts)} facts{inherits}")
 
     lines.append("")
     lines.append(f"Loaded tiers: {', '.join(sorted(idx.loaded_tiers))}")
@@ -883,12 +3384,299 @@ def _list_microtheories() -> str:
     if available:
         lines.append(f"Available (not loaded): {', '.join(available)}")
     lines.append(f"Total: {idx.total_facts} facts across {idx.total_files} files")
+    if _rules is not None:
+        lines.append(f"Derived by rules: {len(_rules.derived.fact_args)} facts from {len(_rules.rules)} rules")
 
     return "\n".join(lines)
 
 
+class _QueryCache:
+    """Bounded LRU of query_krf results, valid for one index generation.
+
+    Entries remember which tiers the query used, so a cached answer still
+    counts as a use for eviction.
+    """
+
+    def __init__(self):
+        self.entries: OrderedDict[tuple, tuple[str, frozenset[str]]] = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def query(self, idx: KRFIndex, **kwargs) -> str:
+        global _recorded_uses
+        size = Config.KRF_QUERY_CACHE_SIZE
+        if size <= 0:
+            return _query(**kwargs)
+        if idx.generation != self.generation:
+            self.entries.clear()
+            self.generation = idx.generation
+
+        key = tuple(sorted((k, v.strip() if isinstance(v, str) else v)
+                           for k, v in kwargs.items() if v is not None))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            _touch_tiers(entry[1])
+            return entry[0]
+
+        self.misses += 1
+        _recorded_uses = set()
+        try:
+            text = _query(**dict(key))
+            used = frozenset(_recorded_uses)
+        finally:
+            _recorded_uses = None
+        self.entries[key] = (text, used)
+        while len(self.entries) > size:
+            self.entries.popitem(last=False)
+        return text
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+_query_cache = _QueryCache()
+
+
+def query_cache_stats() -> dict:
+    return _query_cache.stats()
+
+
+# ── Graph traversal ──
+# traverse_krf walks the edge facts as a graph: one edge per (fact,
+# target), from the fact's first arg to each entity target. The
+# adjacency is rebuilt from edges_to whenever the index generation
+# changes, so multi-hop questions cost one tool call. Literals -- numeric
+# atoms (years, counts, revenue), :keyword register atoms and quoted
+# strings -- are shown as leaves but never walked through, or every entity
+# founded in 2018 (or tagged :domain) would be two hops apart.
+
+_TRAVERSE_MAX_HOPS = 4         # neighborhood depth cap
+_TRAVERSE_MAX_PATH_HOPS = 8    # shortest-path depth cap
+_TRAVERSE_MAX_FANOUT = 50      # edges expanded per entity
+_TRAVERSE_MAX_EDGES = 150      # edge lines per response
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?%?')
+
+
+def _is_graph_literal(name: str) -> bool:
+    return name.startswith((":", '"')) or _NUMBER_RE.fullmatch(name) is not None
+
+
+class _Graph:
+    """Entity adjacency in CSR form over integer node IDs.
+
+    Node i's outgoing edges are out_node/out_fact[out_start[i]:out_start[i + 1]]
+    (target node, edge fact ID), in fact order; incoming edges likewise.
+    `literal[i]` marks literals (numbers, :keywords, strings), which
+    traversal does not expand.
+    """
+
+    __slots__ = ("generation", "ids", "names", "literal", "out_start", "out_node", "out_fact",
+                 "in_start", "in_node", "in_fact")
+
+    def __init__(self, idx: KRFIndex):
+        self.generation = idx.generation
+        self.names = list(dict.fromkeys(chain(idx.edges_to, idx.edges_from)))
+        self.ids = ids = {name: i for i, name in enumerate(self.names)}
+        self.literal = bytes(_is_graph_literal(name) for name in self.names)
+        self.in_start, self.in_node, self.in_fact = array("I", [0]), array("I"), array("I")
+        edges = []  # (source, fact, target)
+        fact_args = idx.fact_args
+        # edges_to keys lead `names`, so in-edges arrive grouped by node ID
+        for target, fids in idx.edges_to.items():
+            t = ids[target]
+            for fid in fids:
+                s = ids[fact_args[fid][0]]
+                self.in_node.append(s)
+                self.in_fact.append(fid)
+                edges.append((s, fid, t))
+            self.in_start.append(len(self.in_node))
+        self.in_start.extend([len(self.in_node)] * (len(self.names) + 1 - len(self.in_start)))
+
+        edges.sort()  # by source, then fact
+        self.out_node = array("I", [t for _, _, t in edges])
+        self.out_fact = array("I", [fid for _, fid, _ in edges])
+        self.out_start = array("I", [0])
+        i = 0
+        for node in range(len(self.names)):
+            while i < len(edges) and edges[i][0] == node:
+                i += 1
+            self.out_start.append(i)
+
+    def adjacent(self, node: int, direction: str) -> Iterator[tuple[int, int, bool]]:
+        """(neighbor, fact ID, forward) for each edge at `node`; forward means node is the subject."""
+        if direction != "in":
+            for i in range(self.out_start[node], self.out_start[node + 1]):
+                yield self.out_node[i], self.out_fact[i], True
+        if direction != "out":
+            for i in range(self.in_start[node], self.in_start[node + 1]):
+                yield self.in_node[i], self.in_fact[i], False
+
+
+_graph: _Graph | None = None
+
+
+def _graph_for(idx: KRFIndex) -> _Graph:
+    global _graph
+    if _graph is None or _graph.generation != idx.generation:
+        _graph = _Graph(idx)
+    return _graph
+
+
+def _edge_line(graph: _Graph, idx: KRFIndex, a: int, b: int, fid: int, forward: bool) -> str:
+    """An edge reached from a to b, written subject first."""
+    src, dst = (a, b) if forward else (b, a)
+    return f"{graph.names[src]} -{idx.predicate(fid)}-> {graph.names[dst]}"
+
+
+def _neighborhood(graph: _Graph, idx: KRFIndex, start: int, hops: int, direction: str,
+                  preds: set[int] | None, fanout: int) -> tuple[list[str], int, list[int]]:
+    """BFS out to `hops`, at most `fanout` edges per entity.
+
+    Returns (lines, entities reached, fact IDs shown).
+    """
+    lines = []
+    seen = {start}
+    shown: set[tuple[int, int, int]] = set()  # (predicate, subject, object)
+    fids = set()
+    frontier = [start]
+    truncated = False
+    for hop in range(1, hops + 1):
+        level, nxt = [], []
+        for node in frontier:
+            taken = 0
+            hidden = set()
+            for nbr, fid, forward in graph.adjacent(node, direction):
+                pred = idx.fact_pred[fid]
+                if preds is not None and pred not in preds:
+                    continue
+                key = (pred, node, nbr) if forward else (pred, nbr, node)
+                if key in shown:
+                    continue
+                if taken >= fanout:
+                    hidden.add(key)
+                    continue
+                if len(shown) >= _TRAVERSE_MAX_EDGES:
+                    truncated = True
+                    break
+                shown.add(key)
+                fids.add(fid)
+                taken += 1
+                level.append(f"    {_edge_line(graph, idx, node, nbr, fid, forward)}")
+                if nbr not in seen:
+                    seen.add(nbr)
+                    if not graph.literal[nbr]:
+                        nxt.append(nbr)
+            if hidden:
+                level.append(f"    ... ({len(hidden)} more at {graph.names[node]})")
+            if truncated:
+                level.append(f"  ... (truncated at {_TRAVERSE_MAX_EDGES} relationships)")
+                nxt = []
+                break
+        if level:
+            lines.append(f"  Hop {hop}:")
+            lines.extend(level)
+        if not nxt:
+            break
+        frontier = nxt
+    return lines, len(seen) - 1, sorted(fids)
+
+
+def _shortest_path(graph: _Graph, idx: KRFIndex, start: int, goal: int, max_hops: int,
+                   direction: str, preds: set[int] | None) -> list[tuple[int, int, int, bool]] | None:
+    """Fewest-hop path as (from, to, fact ID, forward) steps, or None within `max_hops`."""
+    parent: dict[int, tuple[int, int, bool] | None] = {start: None}
+    frontier = [start]
+    for _ in range(max_hops):
+        nxt = []
+        for node in frontier:
+            for nbr, fid, forward in graph.adjacent(node, direction):
+                if nbr in parent or (preds is not None and idx.fact_pred[fid] not in preds):
+                    continue
+                if graph.literal[nbr] and nbr != goal:
+                    continue
+                parent[nbr] = (node, fid, forward)
+                if nbr == goal:
+                    steps = []
+                    while (step := parent[nbr]) is not None:
+                        steps.append((step[0], nbr, step[1], step[2]))
+                        nbr = step[0]
+                    return steps[::-1]
+                nxt.append(nbr)
+        if not nxt:
+            break
+        frontier = nxt
+    return None
+
+
+def _traverse(entity: str, target: str | None = None, predicates: list[str] | None = None,
+              direction: str = "both", hops: int = 2, fanout: int = 10) -> str:
+    """k-hop neighborhood of an entity, or the shortest path to `target`."""
+    if _index is None:
+        return "Error: KRF index not initialized. Server may still be starting."
+    idx = _index
+    if direction not in ("out", "in", "both"):
+        return f"Invalid direction '{direction}'. Must be one of: out, in, both"
+
+    ends = []
+    for name in (entity, target) if target else (entity,):
+        matches = idx.search_entity(name)
+        if not matches:
+            return f"No entity matching '{name}' found."
+        ends.append(matches[0])
+
+    preds = None
+    pred_names = []
+    if predicates:
+        preds = set()
+        for predicate in predicates:
+            pred_name, pred_facts = _resolve_predicate(predicate, idx)
+            if not pred_facts:
+                return (f"No facts with predicate '{predicate}' found."
+                        f"{_did_you_mean(predicate, idx.predicate_names)}")
+            preds.add(idx.symbols.ids[pred_name])
+            pred_names.append(pred_name)
+    via = f", via {', '.join(pred_names)}" if pred_names else ""
+
+    graph = _graph_for(idx)
+    start = graph.ids.get(ends[0])
+    if start is None:
+        return f"{ends[0]} has no relationships."
+
+    if target:
+        hops = max(1, min(hops, _TRAVERSE_MAX_PATH_HOPS))
+        goal = graph.ids.get(ends[1])
+        path = None if goal is None else _shortest_path(graph, idx, start, goal, hops, direction, preds)
+        if path is None:
+            return f"No path from {ends[0]} to {ends[1]} within {hops} hops ({direction}{via})."
+        _touch_tiers(idx.tiers_of(sorted(fid for _, _, fid, _ in path)))
+        lines = [f"=== Path {ends[0]} to {ends[1]} ({len(path)} hops, {direction}{via}) ==="]
+        for a, b, fid, forward in path:
+            pred = idx.predicate(fid)
+            arrow = f"-{pred}->" if forward else f"<-{pred}-"
+            lines.append(f"  {graph.names[a]} {arrow} {graph.names[b]}")
+        return "\n".join(lines)
+
+    hops = max(1, min(hops, _TRAVERSE_MAX_HOPS))
+    fanout = max(1, min(fanout, _TRAVERSE_MAX_FANOUT))
+    lines, reached, fids = _neighborhood(graph, idx, start, hops, direction, preds, fanout)
+    if not lines:
+        return f"{ends[0]} has no {direction} relationships{via}."
+    _touch_tiers(idx.tiers_of(fids))
+    header = f"=== {ends[0]}: {hops}-hop neighborhood ({direction}{via}), {reached} entities ==="
+    return "\n".join([header] + lines)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
-# 6. TOOL DEFINITIONS
+# 8. TOOL DEFINITIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
 TOOLS = [
@@ -898,7 +3686,9 @@ TOOLS = [
             "Query Charlotte's knowledge graph (KRF substrate). "
             "Returns structured entity profiles, primitive type listings, or fact lists. "
             "Use for looking up people, products, relationships, attributes, and domain facts "
-            "without reading raw KRF files. Provide at least one parameter."
+            "without reading raw KRF files. Provide at least one parameter. "
+            "Long listings end with next_cursor; pass it as cursor to continue. "
+            "Facts implied by the substrate's rules are listed as derived, with the rule's source."
         ),
         "input_schema": {
             "type": "object",
@@ -915,6 +3705,11 @@ TOOLS = [
                     "type": "string",
                     "description": "Filter by microtheory scope (e.g. 'ISGPersonnelMt', 'CharlotteKernelMt')",
                 },
+                "inherit": {
+                    "type": "boolean",
+                    "description": ("Include facts from microtheories the scope inherits via genlMt "
+                                    "(default: only when combined with predicate, attribute or search_text)"),
+                },
                 "primitive": {
                     "type": "string",
                     "description": "List entities of a primitive type",
@@ -924,11 +3719,72 @@ TOOLS = [
                     "type": "string",
                     "description": "Filter by attribute name (e.g. '::EMAIL', '::PHONE', '::ROLE')",
                 },
+                "where": {
+                    "type": "string",
+                    "description": (
+                        "Numeric range filter over entities, clauses joined by 'and' "
+                        "(e.g. 'hasCFM between 15 and 20 and hasListPrice < 3000'). "
+                        "Returns matching entities with min/avg/max per collection"
+                    ),
+                },
+                "search_text": {
+                    "type": "string",
+                    "description": (
+                        "Full-text search over comments and quoted values (names, descriptions, "
+                        "attribute values), best matches first with snippets, e.g. 'oil-free scroll'. "
+                        "Narrow with microtheory, predicate or attribute"
+                    ),
+                },
                 "limit": {
                     "type": "integer",
                     "description": "Max results (default 50, max 200)",
                 },
+                "cursor": {
+                    "type": "string",
+                    "description": "next_cursor from a previous result, to fetch its next page (repeat the same parameters)",
+                },
+            },
+        },
+    },
+    {
+        "name": "traverse_krf",
+        "description": (
+            "Walk relationships in Charlotte's knowledge graph in one call: the k-hop "
+            "neighborhood of an entity, or the shortest path between two entities. "
+            "Use for multi-hop questions (reporting chains, brand -> product -> OEM) "
+            "instead of chaining query_krf calls."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "entity": {
+                    "type": "string",
+                    "description": "Start entity (fuzzy matching, as in query_krf)",
+                },
+                "target": {
+                    "type": "string",
+                    "description": "End entity. When given, returns the shortest path instead of a neighborhood",
+                },
+                "predicates": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only follow these predicates (e.g. ['reportsTo'])",
+                },
+                "direction": {
+                    "type": "string",
+                    "description": "out: subject to object, in: object to subject, both (default)",
+                    "enum": ["out", "in", "both"],
+                },
+                "hops": {
+                    "type": "integer",
+                    "description": f"Max hops (default 2; max {_TRAVERSE_MAX_HOPS}, or {_TRAVERSE_MAX_PATH_HOPS} for paths)",
+                },
+                "fanout": {
+                    "type": "integer",
+                    "description": f"Max relationships expanded per entity (default 10, max {_TRAVERSE_MAX_FANOUT})",
+                },
             },
+            "required": ["entity"],
         },
     },
     {
@@ -944,7 +3800,8 @@ TOOLS = [
         "description": (
             "Load additional KRF knowledge into the index on demand. "
             "Core and knowledge tiers load automatically at startup. "
-            "Use this to load domain-specific data (ISG products, spine, reference, etc.) "
+            "Use this to load domain-specific data (ISG products, compressor specs and prices, "
+            "spine, reference, etc.) "
             "when a query needs it."
         ),
         "input_schema": {
@@ -953,7 +3810,7 @@ TOOLS = [
                 "domain": {
                     "type": "string",
                     "description": "Domain to load",
-                    "enum": ["isg", "spine", "reference", "someai", "demos"],
+                    "enum": ["isg", "spine", "reference", "someai", "demos", "compressors"],
                 },
             },
             "required": ["domain"],
@@ -970,14 +3827,46 @@ async def handle(name: str, args: dict) -> str:
         microtheory = args.get("microtheory")
         primitive = args.get("primitive")
         attribute = args.get("attribute")
-        limit = min(args.get("limit", 50), 200)
-
-        if not any([entity, predicate, microtheory, primitive, attribute]):
-            return "Please provide at least one query parameter: entity, predicate, microtheory, primitive, or attribute."
+        where = args.get("where")
+        search_text = args.get("search_text")
+        limit = max(1, min(args.get("limit", 50), 200))
+        cursor = args.get("cursor")
+        inherit = args.get("inherit")
+        if inherit is not None:
+            inherit = inherit is not False
+
+        if _prefetcher:
+            asked = " ".join(a for a in (entity, predicate, microtheory, attribute, where, search_text) if a)
+            _prefetcher.note_request(_prefetcher.tiers_for(asked))
+
+        if not any([entity, predicate, microtheory, primitive, attribute, where, search_text]):
+            return ("Please provide at least one query parameter: "
+                    "entity, predicate, microtheory, primitive, attribute, where, or search_text.")
+
+        if _index is None:
+            return _query()
+        return _query_cache.query(
+            _index, entity=entity, predicate=predicate, microtheory=microtheory,
+            primitive=primitive, attribute=attribute, limit=limit, cursor=cursor,
+            inherit=inherit, where=where, search_text=search_text,
+        )
 
-        return _query(
-            entity=entity, predicate=predicate, microtheory=microtheory,
-            primitive=primitive, attribute=attribute, limit=limit,
+    elif name == "traverse_krf":
+        entity = args["entity"]
+        target = args.get("target")
+        predicates = args.get("predicates") or None
+        if isinstance(predicates, str):
+            predicates = [predicates]
+
+        if _prefetcher:
+            asked = " ".join([entity, target or ""] + (predicates or []))
+            _prefetcher.note_request(_prefetcher.tiers_for(asked))
+
+        return _traverse(
+            entity, target=target, predicates=predicates,
+            direction=args.get("direction", "both"),
+            hops=args.get("hops", 2 if not target else _TRAVERSE_MAX_PATH_HOPS),
+            fanout=args.get("fanout", 10),
         )
 
     elif name == "list_microtheories":
@@ -985,6 +3874,8 @@ async def handle(name: str, args: dict) -> str:
 
     elif name == "load_domain":
         domain = args["domain"]
+        if _prefetcher:
+            _prefetcher.note_request([domain], blocking=True)
         return await load_domain(domain)
 
     return f"Unknown tool: {name}"
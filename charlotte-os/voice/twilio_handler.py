@@ -99,15 +99,14 @@ async def handle_voice_webhook(request: web.Request) -> web.Response:
     try:
         from tools.krf import _index
         if _index:
-            # Search for phone number across all entities
-            for entity, attrs in _index.attributes.items():
-                phones = attrs.get("::PHONE", [])
-                if caller in phones:
-                    label = attrs.get("::LABEL", [None])[0]
-                    if label:
-                        greeting = f"Hey {label.split()[0]}, connecting you now."
-                        log.info("Caller recognized: %s -> %s", caller, entity)
-                    break
+            # E.164-normalized reverse lookup of ::PHONE attributes
+            matches = _index.find_contact(caller)
+            if matches:
+                entity = matches[0]
+                label = _index.attributes.get(entity, {}).get("::LABEL", [None])[0]
+                if label:
+                    greeting = f"Hey {label.split()[0]}, connecting you now."
+                    log.info("Caller recognized: %s -> %s", caller, entity)
     except Exception:
         pass  # Fall back to generic greeting
 